@@ -0,0 +1,234 @@
+"""time stages of the compiler on examples, std and generated modules, numbers in commit messages are made with it.
+	python3 bench/stages.py [--root DIR] [--repeat N] [bench ...]
+--root is the compiler to time (this one by default), e.g. `git worktree add /tmp/before <commit>`, to compare with an older one.
+Generated sources are the same on every run, they are written to a temporary directory. Every time is the best of --repeat runs"""
+import contextlib
+import glob
+import inspect
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Iterator
+__all__ = [
+	"BENCHES",
+	"main",
+]
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def best_of(repeat:int, run:Callable[[], object]) -> float:
+	best = float('inf')
+	for _ in range(repeat):
+		start = time.perf_counter()
+		run()
+		best = min(best, time.perf_counter()-start)
+	return best
+def config(file:str, **options:Any) -> Any:
+	"""config with defaults for the file, options, that the compiler does not have yet, are dropped"""
+	from compiler.primitives import Config, ErrorBin
+	known = inspect.signature(Config.use_defaults).parameters
+	return Config.use_defaults(ErrorBin(silent=True), file, **{name:value for name, value in options.items() if name in known})
+def session(config:Any) -> Any:
+	return config.session if hasattr(config, 'session') else contextlib.nullcontext()
+def forget(config:Any) -> None:
+	"""forget modules, that were checked and generated, so they are checked and generated again"""
+	from compiler import type_checker, llvm_generator
+	if hasattr(config, 'session'):
+		config.session.forget()
+	else:# modules were remembered by globals
+		type_checker.imported_modules.clear()
+		llvm_generator.imported_modules.clear()
+def write(directory:str, name:str, text:str) -> str:
+	path = os.path.join(directory, name)
+	with open(path, 'w', encoding='utf-8') as file:
+		file.write(text)
+	return path
+def read(file:str) -> str:
+	from compiler.primitives import extract_file_text_from_file_path
+	return extract_file_text_from_file_path(file)
+
+def mixed_source(functions:int = 5000) -> str:
+	"""functions with comments, strings, templates and operators, 1.1 MB for 5000 functions"""
+	text = 'from std.builtin import putn\nconst BASE 3\n'
+	for idx in range(functions):
+		text += f"""\
+# function number {idx}
+fun f{idx}(a: int, b: int) -> int {{
+	/* compute something */
+	set c = a * {idx} + b // 3 - (a % 7) >> 1
+	s = "value \\n {idx}"
+	if c > 10 and a < b {{
+		return c + BASE
+	}}
+	put`f{idx} {{c}} {{a}}`
+	return a - b * 2
+}}
+"""
+	return text+'fun main() {\n\tput`{f1(1, 2)}`\n}\n'
+
+def nested_source(functions:int = 400, depth:int = 60) -> str:
+	"""every function returns an expression, nested depth times like `((x + 0) * y + 1) * y`"""
+	text = ''
+	for idx in range(functions):
+		expression = f"x + {idx}"
+		for level in range(depth):
+			expression = f"({expression}) * y + {level}"
+		text += f"fun g{idx}(x:int, y:int) -> int {{\n\treturn {expression}\n}}\n"
+	return text+'fun main() {}\n'
+def random_source(functions:int = 400, depth:int = 7) -> str:
+	"""every function returns a random expression of binary, unary and parenthesized operations up to depth"""
+	import random
+	rng = random.Random(6)
+	operators = ('+', '-', '*', '//', '%', '<<', '>>', '<', '>', '<=', '>=', '==', '!=', 'and', 'or')
+	def expression(level:int) -> str:
+		if level == 0 or rng.random() < 0.2:
+			return rng.choice(('x', 'y', '1', '2', '(x)'))
+		if rng.random() < 0.1:
+			return f"({expression(level-1)})"
+		return f"{expression(level-1)} {rng.choice(operators)} {expression(level-1)}"
+	text = ''.join(f"fun f{idx}(x:int, y:int) -> int {{\n\treturn {expression(depth)}\n}}\n" for idx in range(functions))
+	return text+'fun main() {}\n'
+def consts_source(consts:int = 4000, arrays:int = 500) -> str:
+	"""chain of consts, each is evaluated from the previous one, and arrays, sizes of which are evaluated from them"""
+	text = 'const C0 1\n'+''.join(f"const C{idx} C{idx-1}+{idx%7}*2\n" for idx in range(1, consts))
+	return text+'fun main() {\n'+''.join(f"\t[C{idx*7%consts}*C{idx*3%consts}//3]a{idx}:int\n" for idx in range(arrays))+'}\n'
+def functions_source(functions:int) -> str:
+	"""small functions, that codegen time of is linear in their number"""
+	text = ''.join(f"fun f{idx}(x:int) -> int {{\n\ty = x*{idx}+1\n\tif @y > 10 {{\n\t\treturn @y-{idx}\n\t}}\n\treturn @y\n}}\n" for idx in range(functions))
+	return text+'fun main() {\n\tput`{f0(1)}`\n}\n'
+def tokens(text:str, file:str) -> Any:
+	"""tokens of the text, as the parser of the root takes them"""
+	from compiler import lexer
+	from compiler.parser import Parser
+	if 'TokenStore' in str(inspect.signature(Parser).parameters['tokens'].annotation):
+		return lexer.lex_store(text, config(file, jobs=1), file)
+	return lexer.lex(text, config(file, jobs=1), file)
+
+def bench_lex(directory:str, repeat:int) -> Iterator[str]:
+	"""lexing of every example and std file together, and of a large generated module"""
+	from compiler.lexer import lex
+	files = sorted(glob.glob(os.path.join('examples', '*.ja'))) + sorted(glob.glob(os.path.join('std', '*.ja')))
+	texts = [(file, read(file)) for file in files]
+	count = sum(len(lex(text, config(file, jobs=1), file)) for file, text in texts)
+	yield f"lex examples and std ({count} tokens): {best_of(repeat, lambda:[lex(text, config(file, jobs=1), file) for file, text in texts]):.3f}s"
+	file = write(directory, 'mixed.ja', mixed_source())
+	text = read(file)
+	yield f"lex mixed module ({len(text)/1e6:.1f} MB, {len(lex(text, config(file, jobs=1), file))} tokens): {best_of(repeat, lambda:lex(text, config(file, jobs=1), file)):.3f}s"
+
+def bench_parse(directory:str, repeat:int) -> Iterator[str]:
+	"""parsing of already lexed generated modules: random expressions, deeply nested expressions and the mixed module.
+	Since the parser reads the token store, it makes tokens, that the lexer made before, so only 'lex and parse' compares with older versions"""
+	from compiler.parser import Parser
+	for name, text in (('random expressions', random_source()), ('nested expressions', nested_source()), ('mixed module', mixed_source())):
+		file = write(directory, 'parse.ja', text)
+		parse_config = config(file, jobs=1, use_cache=False)
+		with session(parse_config):
+			parsed = tokens(text, file)
+			Parser(parsed, parse_config, 'bench').parse()# std.builtin is parsed once
+			yield f"parse {name} ({len(parsed)} tokens): {best_of(repeat, lambda:Parser(parsed, parse_config, 'bench').parse()):.3f}s"
+	with session(parse_config):# tokens are made by the lexer or by the parser, depending on the version, so both are timed together too
+		yield f"lex and parse mixed module: {best_of(repeat, lambda:Parser(tokens(text, file), parse_config, 'bench').parse()):.3f}s"
+
+def bench_consts(directory:str, repeat:int) -> Iterator[str]:
+	"""parsing of a module with thousands of consts, used in compile time evaluation of array sizes"""
+	from compiler.parser import Parser
+	text = consts_source()
+	file = write(directory, 'consts.ja', text)
+	parse_config = config(file, jobs=1, use_cache=False)
+	with session(parse_config):
+		parsed = tokens(text, file)
+		Parser(parsed, parse_config, 'bench').parse()
+		yield f"parse consts ({len(parsed)} tokens): {best_of(repeat, lambda:Parser(parsed, parse_config, 'bench').parse()):.3f}s"
+
+def bench_passes(directory:str, repeat:int) -> Iterator[str]:
+	"""type checking and code generation of every example, modules are parsed once, checked and generated from scratch every run"""
+	from compiler import type_checker, llvm_generator
+	from compiler.utils import extract_module_from_file_path
+	programs = []
+	for file in sorted(glob.glob(os.path.join('examples', '*.ja'))):
+		program_config = config(file, jobs=1, use_cache=False)
+		with session(program_config):
+			programs.append((extract_module_from_file_path(file, program_config), program_config))
+	def check_and_generate() -> None:
+		for module, program_config in programs:
+			forget(program_config)
+			with session(program_config):
+				table = type_checker.TypeChecker(module, program_config).go_check()
+				llvm_generator.GenerateAssembly(module, program_config, *([] if table is None else [table]))
+	yield f"check and generate {len(programs)} examples: {best_of(repeat*10, check_and_generate)*1000:.1f}ms"
+	yield from dispatch_costs(repeat)
+def dispatch_costs(repeat:int) -> Iterator[str]:
+	"""cost of TypeChecker.check alone (handlers do nothing), for node types at the start and at the end of the chain of ifs, it used to be"""
+	import timeit
+	from compiler import type_checker
+	from compiler.primitives import nodes
+	checker_class = type_checker.TypeChecker
+	table = getattr(type_checker, 'CHECK', {})
+	saved_table, saved_methods = dict(table), {name:value for name, value in vars(checker_class).items() if name.startswith('check_')}
+	def nothing(self:Any, node:Any) -> None:
+		pass
+	try:
+		for name in saved_methods:
+			setattr(checker_class, name, nothing)
+		table.update({typ:nothing for typ in table})
+		checker = object.__new__(checker_class)
+		for node_class in (nodes.Assignment, nodes.Int, nodes.While, nodes.Assert):
+			node = object.__new__(node_class)
+			cost = min(timeit.repeat(lambda:checker.check(node), number=100000, repeat=repeat))/100000
+			yield f"dispatch of {node_class.__name__}: {cost*1e9:.0f}ns"
+	finally:
+		for name, value in saved_methods.items():
+			setattr(checker_class, name, value)
+		table.update(saved_table)
+
+def bench_codegen(directory:str, repeat:int) -> Iterator[str]:
+	"""code generation of modules with more and more functions, time per function should stay the same"""
+	from compiler import type_checker, llvm_generator
+	from compiler.utils import extract_module_from_file_path
+	for functions in (1000, 5000, 10000):
+		file = write(directory, f"functions{functions}.ja", functions_source(functions))
+		program_config = config(file, jobs=1, use_cache=False)
+		forget(program_config)
+		with session(program_config):
+			module = extract_module_from_file_path(file, program_config)
+			table = type_checker.TypeChecker(module, program_config).go_check()
+			def generate() -> None:
+				if hasattr(program_config, 'session'):
+					program_config.session.generators.clear()
+				else:
+					llvm_generator.imported_modules.clear()
+				str(llvm_generator.GenerateAssembly(module, program_config, *([] if table is None else [table])).text)
+			cost = best_of(repeat, generate)
+		yield f"generate {functions} functions: {cost:.3f}s, {cost/functions*1e6:.0f}us per function"
+
+BENCHES:dict[str, Callable[[str, int], Iterator[str]]] = {
+	'lex':bench_lex,
+	'parse':bench_parse,
+	'consts':bench_consts,
+	'passes':bench_passes,
+	'codegen':bench_codegen,
+}
+
+def main() -> None:
+	import argparse
+	arguments = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	arguments.add_argument('--root', default=ROOT, help="tree of the compiler to time")
+	arguments.add_argument('--repeat', type=int, default=3, help="runs of every stage, the best one is reported")
+	arguments.add_argument('benches', nargs='*', help=f"benches to run (all by default): {', '.join(BENCHES)}")
+	args = arguments.parse_args()
+	for name in args.benches:
+		if name not in BENCHES:
+			arguments.error(f"unknown bench '{name}'")
+	root = os.path.abspath(args.root)
+	os.environ['JARARACA_PATH'] = root
+	sys.path.insert(0, root)
+	os.chdir(root)# examples and std of the root are timed
+	sys.setrecursionlimit(100000)
+	import compiler# packs std of the root
+	print(f"timing '{root}'", flush=True)
+	with tempfile.TemporaryDirectory(prefix='jararaca-bench-') as directory:
+		for name in args.benches or BENCHES:
+			for line in BENCHES[name](directory, args.repeat):
+				print(f"{name:8} {line}", flush=True)
+if __name__ == '__main__':
+	main()
@@ -1,40 +1,107 @@
-from os import path
+import os
+import time
 from sys import argv
-from typing import NoReturn
+from typing import Callable, NoReturn
 
 
-from .primitives import JARARACA_PATH, process_cmd_args, run_assembler, replace_self, pack_directory, id_counter, ErrorBin
+from .primitives import process_cmd_args, run_toolchain, run_separately, replace_self, Config, ErrorBin, nodes, types
 from .parser import Parser
 from .type_checker import TypeChecker
 from .llvm_generator import GenerateAssembly
 from .utils import  extract_module_from_file_path, dump_module
+from . import cache
 
-pack_directory(path.join(JARARACA_PATH, 'std'))
-def main() -> NoReturn:
-	eb = ErrorBin()
-	config = process_cmd_args(eb, argv)
-	eb.show_errors()
-
+def check_program(config:Config) -> tuple[nodes.Module, types.TypeTable]:
+	"""extract and type check the program in the session of the config (session should be active)"""
+	eb = config.errors
+	config.session.begin()
+	start = time.perf_counter()
 	module = extract_module_from_file_path(config.file,config)
 	if module is None: eb.crash_with_errors()
 	if config.verbose:
 		eb.show_errors()
-		print(f"INFO: Conversion to ast step completed with id counter state '{id_counter}'")
+		print(f"INFO: Conversion to ast step completed in {time.perf_counter()-start:.3f}s with id counter state '{config.session.ids}'")
 	dump_module(module, config)
-	TypeChecker(module, config).go_check()
+	start = time.perf_counter()
+	tc = TypeChecker(module, config)
+	table = tc.go_check()
 	eb.show_errors()
+	if config.verbose:
+		print(f"INFO: Type checking step completed in {time.perf_counter()-start:.3f}s, {types.resolution_stats([tc.type_names, *(tc.type_names for tc in config.session.checkers.values())])}")
+	return module, table
 
-	txt = GenerateAssembly(module,config).text
-	eb.show_errors()
+def generate_code(module:nodes.Module, config:Config, table:types.TypeTable, write:Callable[[str], object]|None = None) -> GenerateAssembly:
+	start = time.perf_counter()
+	gen = GenerateAssembly(module,config,table,write)
+	config.errors.show_errors()
+	if config.verbose:
+		print(f"INFO: Code generation step completed in {time.perf_counter()-start:.3f}s")
+	return gen
 
-	run_assembler(config,txt)
-	eb.show_errors()
+def generate(config:Config) -> str:
+	"""extract, type check and generate the program in the session of the config. Returns llvm ir"""
+	try:
+		with config.session:
+			module, table = check_program(config)
+			return str(generate_code(module,config,table).text)
+	finally:
+		config.session.graph = None# next compilation scans files again
+
+def build(config:Config) -> list[str]|None:
+	"""compile the program with the toolchain of the config. Returns command to hand execution to, if program should be run.
+	Toolchain is started before generation, llvm ir is written to it, as it's generated. With --separate each module is compiled on it's own.
+	Built files are cached by hash of files of every imported module, flags, compiler and llvm tools, so unchanged program is not compiled again"""
+	try:
+		return build_program(config)
+	finally:
+		config.session.graph = None# next compilation scans files again
+def build_program(config:Config) -> list[str]|None:
+	start = time.perf_counter()
+	key = cache.build_key(config) if config.use_cache and not config.dump else None
+	if key is not None and cache.load_build(config, key):
+		if config.verbose:
+			print(f"INFO: Build of '{config.file}' is reused from cache in {time.perf_counter()-start:.3f}s")
+		return run_command_of(config)
+	with config.session:
+		module, table = check_program(config)
+		if config.separate:
+			main = generate_code(module,config,table)
+			modules = [(gen.module.path, str(gen.text)) for gen in (*config.session.generators.values(), main)]
+		else:
+			with run_toolchain(config) as ir_input:
+				generate_code(module,config,table,ir_input.write)
+	if config.separate:
+		run_separately(config, modules)
+	config.errors.show_errors()
+	if key is not None and cache.build_key(config) == key:# files did not change during compilation
+		cache.store_build(config, key)
+	if config.verbose:
+		print(f"INFO: Compilation completed in {time.perf_counter()-start:.3f}s")
+	return run_command_of(config)
 
-	if config.interpret:
-		replace_self(["lli",config.optimization, '-load', 'libgc.so', '--fake-argv0',f"{config.file}",f'{config.output_file}.bc',*config.argv],config)
+def run_command_of(config:Config) -> list[str]|None:
+	if config.interpret or config.run_file and config.toolchain == 'lli':
+		return ["lli",config.optimization, '-load', 'libgc.so', '--fake-argv0',f"{config.file}",f"{config.output_file}.{'ll' if config.toolchain == 'lli' else 'bc'}",*config.argv]
 	if config.run_file:
-		replace_self([f"{config.output_file}.out"]+config.argv, config)
+		return [os.path.join(os.path.dirname(config.output_file) or os.curdir, f"{os.path.basename(config.output_file)}.out")]+config.argv# path with a directory, so it is not looked up in PATH
+	return None
 
+def main() -> NoReturn:
+	if argv[1:] == ['--serve']:
+		from .server import serve
+		serve()
+	eb = ErrorBin()
+	config = process_cmd_args(eb, argv)
+	eb.show_errors()
+	if config.watch:
+		from .watch import watch
+		watch(config)
+	if len(config.batch) != 0:
+		from .batch import compile_batch
+		compile_batch(config)
+	command = build(config)
+	if command is not None:
+		replace_self(command, config)
 	eb.exit_properly(0)
 if __name__ == '__main__':
 	main()
@@ -0,0 +1,112 @@
+import sys
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import replace
+from typing import NoReturn
+
+from .primitives import Config, ErrorBin, ErrorExit, pool_context, run_assembler
+from . import generate
+__all__ = [
+	"compile_batch",
+]
+Generated = tuple[str|None, list[str], int]# llvm ir (None if program has errors), diagnostics and exit code
+Compiled = tuple[list[str], int]# diagnostics and exit code
+
+def exit_code(stop:SystemExit) -> int:
+	return stop.code if isinstance(stop.code, int) else 1
+
+def program_config(config:Config, file:str) -> Config:
+	"""config of one program of the batch, with it's own errors"""
+	return replace(config, file=file, output_file=file[:file.rfind('.')], batch=[], errors=ErrorBin(silent=True))
+
+def generate_program(config:Config) -> Generated:
+	"""llvm ir of the program. Internal error of the compiler fails only this program, it is reported with the traceback"""
+	try:
+		return generate(config), [], 0
+	except ErrorExit as stop:
+		return None, [str(error) for error in config.errors.errors], exit_code(stop)
+	except Exception as crash:
+		return None, [*(str(error) for error in config.errors.errors), f"ERROR: compilation of '{config.file}' crashed: {crash!r}", traceback.format_exc().rstrip()], 1
+
+def assemble_program(config:Config, text:str) -> Compiled:
+	"""run opt and clang (in a thread, they are separate processes)"""
+	try:
+		run_assembler(config, text)
+		config.errors.show_errors()
+	except ErrorExit as stop:
+		return [str(error) for error in config.errors.errors], exit_code(stop)
+	return [], 0
+
+worker_config:Config|None = None
+def init_batch_worker(config:Config) -> None:
+	global worker_config
+	worker_config = replace(config, verbose=False, jobs=1)
+def generate_in_worker(file:str) -> Generated:
+	assert worker_config is not None, "worker was not initialized"
+	return generate_program(program_config(worker_config, file))
+
+def compile_batch(config:Config) -> NoReturn:
+	"""compile every program of the batch in the session of the config, so modules they share (like std) are parsed, checked and generated once.
+	First program is generated by this process, the rest on a process pool, that inherits the session (when it can fork).
+	Meanwhile opt and clang of generated programs run, at most `jobs` at a time.
+	Diagnostics and exit code of each program are shown together, in order of the batch. Exits with 1, if any program failed"""
+	files = config.batch
+	configs = [program_config(config, file) for file in files]
+	results:list[Compiled|None] = [None]*len(files)
+	shown = 0
+	def show_compiled() -> None:
+		nonlocal shown
+		while shown < len(files) and (result := results[shown]) is not None:
+			diagnostics, code = result
+			for line in diagnostics:
+				print(line, file=sys.stderr, flush=True)
+			if code != 0:
+				print(f"ERROR: '{files[shown]}' failed with exit code {code}", file=sys.stderr, flush=True)
+			elif config.verbose:
+				print(f"INFO: '{files[shown]}' is compiled")
+			shown += 1
+	first = generate_program(configs[0])
+	generating:dict[Future[Generated], int] = {}
+	pool = None
+	if config.jobs > 1 and len(files) > 1:
+		pool = ProcessPoolExecutor(max_workers=min(config.jobs, len(files)-1), mp_context=pool_context(), initializer=init_batch_worker, initargs=(config,))
+		for idx in range(1, len(files)):# all workers are forked before any thread is started
+			generating[pool.submit(generate_in_worker, files[idx])] = idx
+	toolchain = ThreadPoolExecutor(max_workers=config.jobs)
+	assembling:dict[Future[Compiled], int] = {}
+	def generated(idx:int, result:Generated) -> None:
+		text, diagnostics, code = result
+		if text is None:
+			results[idx] = diagnostics, code
+		else:
+			assembling[toolchain.submit(assemble_program, configs[idx], text)] = idx
+	try:
+		generated(0, first)
+		if pool is None:
+			for idx in range(1, len(files)):
+				generated(idx, generate_program(configs[idx]))
+				show_compiled()
+		while len(generating) != 0 or len(assembling) != 0:
+			wait([*generating, *assembling], return_when=FIRST_COMPLETED)
+			for generation in [future for future in generating if future.done()]:
+				idx = generating.pop(generation)
+				if generation.exception() is None:
+					generated(idx, generation.result())
+				else:
+					results[idx] = [f"ERROR: compilation of '{files[idx]}' crashed: {generation.exception()!r}"], 1
+			for assembly in [future for future in assembling if future.done()]:
+				idx = assembling.pop(assembly)
+				if assembly.exception() is None:
+					results[idx] = assembly.result()
+				else:
+					results[idx] = [f"ERROR: compilation of '{files[idx]}' crashed: {assembly.exception()!r}"], 1
+			show_compiled()
+	finally:
+		toolchain.shutdown(cancel_futures=True)
+		if pool is not None:
+			pool.shutdown(cancel_futures=True)
+	failed = sum(result is not None and result[1] != 0 for result in results)
+	if failed != 0:
+		print(f"ERROR: {failed} of {len(files)} programs failed", file=sys.stderr, flush=True)
+		sys.exit(1)
+	sys.exit(0)
@@ -0,0 +1,289 @@
+import gc
+import hashlib
+import io
+import os
+import pickle
+import shutil
+import sys
+from operator import attrgetter
+from typing import Any, Callable
+
+from .primitives import nodes, Node, Token, Place, Loc, Config, packets, tool_stamp
+__all__ = [
+	"compiler_fingerprint",
+	"file_hash",
+	"has_entry",
+	"load_module",
+	"store_module",
+	"build_key",
+	"load_build",
+	"store_build",
+]
+CACHE_FORMAT = 2
+BUILD_CACHE_SIZE = 256*1024*1024# bytes of cached builds (and of cached objects), least recently used are removed over it
+
+def compiler_fingerprint(config:Config) -> str:
+	"""hash of the compiler sources, registered packets and python version: any change makes every cached entry stale.
+	Session of the config remembers it, until packet index changes"""
+	packets.check()
+	registered = packets.fingerprint()
+	if config.session.fingerprint is None or config.session.fingerprint[0] != registered:
+		hasher = hashlib.sha256(f"{CACHE_FORMAT} {sys.version}".encode())
+		compiler_dir = os.path.dirname(os.path.abspath(__file__))
+		hasher.update(registered.encode())
+		for directory in (compiler_dir, os.path.join(compiler_dir, 'primitives')):
+			for name in sorted(os.listdir(directory)):
+				if name.endswith('.py'):
+					hasher.update(name.encode())
+					with open(os.path.join(directory, name), 'rb') as file:
+						hasher.update(file.read())
+		config.session.fingerprint = registered, hasher.hexdigest()
+	return config.session.fingerprint[1]
+
+def file_hash(config:Config, file_path:str) -> str|None:
+	"""content hash of a file, session of the config remembers it, while it's mtime and size stay the same"""
+	try:
+		stat = os.stat(file_path)
+	except OSError:
+		return None
+	file_hashes = config.session.file_hashes
+	known = file_hashes.use(file_path)
+	if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+		return known[2]
+	with open(file_path, 'rb') as file:
+		digest = hashlib.sha256(file.read()).hexdigest()
+	file_hashes[file_path] = stat.st_mtime_ns, stat.st_size, digest
+	return digest
+
+Dependency = tuple[str, str, str]# module path, file path, content hash
+
+def entry_path(config:Config, file_path:str, module_path:str, text:str) -> str:
+	key = hashlib.sha256(f"{compiler_fingerprint(config)}\0{module_path}\0{os.path.abspath(file_path)}\0{text}".encode()).hexdigest()
+	return os.path.join(config.cache_dir, 'ast', key[:2], key[2:]+'.pickle')
+
+def field_getter(cls:type) -> Callable[[Any], tuple[Any, ...]]:
+	names = tuple(name for name in cls.__slots__ if name != 'uid')
+	if len(names) == 1:
+		return lambda obj:(getattr(obj, names[0]),)
+	return attrgetter(*names)
+NODE_FIELDS = {cls:field_getter(cls) for cls in (*(cls for cls in vars(nodes).values() if isinstance(cls, type) and issubclass(cls, Node) and cls is not Node), nodes.Module)}
+VALUE_FIELDS = {cls:field_getter(cls) for cls in (Token, Loc)}
+assert all(cls.__slots__[-1] == 'uid' for cls in NODE_FIELDS), "uid is passed as the last argument, when nodes are rebuilt"
+def rebuild_place(file_path:str, start:int, end:int) -> Place:
+	return Place(Loc(file_path, start), Loc(file_path, end))
+def rebuild_node(cls:type, uid:int, *fields:Any) -> Any:
+	assert False, "replaced by ModuleUnpickler.find_class"
+def load_module_reference(module_path:str, file_path:str) -> nodes.Module:
+	assert False, "replaced by ModuleUnpickler.find_class"
+
+class ModulePickler(pickle.Pickler):
+	"""imported modules are stored as references, they are cached on their own.
+	Dataclasses are stored as their fields (much faster than default __getstate__/__setstate__)"""
+	def __init__(self, file:io.BytesIO, root:nodes.Module, config:Config) -> None:
+		super().__init__(file, pickle.HIGHEST_PROTOCOL)
+		self.root = root
+		self.config = config
+		self.module_files = config.session.module_files
+		self.dependencies:dict[str, Dependency] = {}
+		self.uids:list[int] = []
+	def reducer_override(self, obj:Any) -> Any:
+		cls = type(obj)
+		if cls is Place:
+			return rebuild_place, (obj.start.file_path, obj.start.idx, obj.end.idx)
+		getter = VALUE_FIELDS.get(cls)
+		if getter is not None:
+			return cls, getter(obj)
+		getter = NODE_FIELDS.get(cls)
+		if getter is None:
+			return NotImplemented
+		if cls is nodes.Module and obj is not self.root:
+			file_path = self.module_files[obj.path]
+			self.dependencies[obj.path] = obj.path, file_path, file_hash(self.config, file_path)
+			return load_module_reference, (obj.path, file_path)
+		self.uids.append(obj.uid)
+		return rebuild_node, (cls, obj.uid, *getter(obj))
+
+class ModuleUnpickler(pickle.Unpickler):
+	"""nodes get fresh uids: the range of uids, that module had, is moved to a newly reserved range, order is kept"""
+	def __init__(self, file:io.BytesIO, config:Config, min_uid:int, max_uid:int) -> None:
+		super().__init__(file)
+		self.config = config
+		ids = config.session.ids
+		self.uid_offset = next(ids)-min_uid
+		for _ in zip(range(max_uid-min_uid), ids):
+			pass
+	def find_class(self, module_name:str, name:str) -> Any:
+		if module_name == __name__ and name == 'rebuild_node':
+			return self.rebuild_node
+		if module_name == __name__ and name == 'load_module_reference':
+			return self.load_module_reference
+		return super().find_class(module_name, name)
+	def rebuild_node(self, cls:type, uid:int, *fields:Any) -> Any:
+		return cls(*fields, uid=uid+self.uid_offset)
+	def load_module_reference(self, module_path:str, file_path:str) -> nodes.Module:
+		from .utils import extract_module_from_file_path
+		module = extract_module_from_file_path(file_path, self.config, module_path)
+		if module is None:
+			raise pickle.UnpicklingError(f"module '{module_path}' could not be extracted")
+		return module
+
+Remembered = tuple[str, tuple[Dependency, ...], nodes.Module]# entry path, dependencies and module, that was stored or loaded in the session. Session remembers them by (module path, file path)
+def store_module(module:nodes.Module, config:Config, file_path:str, text:str) -> None:
+	session = config.session
+	module_dependencies = session.module_dependencies
+	session.module_files[module.path] = file_path
+	if not config.use_cache:
+		return
+	buffer = io.BytesIO()
+	pickler = ModulePickler(buffer, module, config)
+	pickler.dump(module)
+	dependencies:dict[str, Dependency] = {}
+	for dependency in pickler.dependencies.values():
+		dependencies[dependency[0]] = dependency
+		for indirect in module_dependencies.get(dependency[0], ()):
+			dependencies.setdefault(indirect[0], indirect)
+	module_dependencies[module.path] = tuple(dependencies.values())
+	direct = sorted(pickler.dependencies, key=lambda path:path != 'std.builtin')# builtin module is extracted before any import
+	path = entry_path(config, file_path, module.path, text)
+	session.remembered_modules[module.path, file_path] = path, module_dependencies[module.path], module
+	try:
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		with open(path+'.tmp', 'wb') as file:
+			pickle.dump((module_dependencies[module.path], direct, min(pickler.uids), max(pickler.uids), buffer.getvalue()), file, pickle.HIGHEST_PROTOCOL)
+		os.replace(path+'.tmp', path)
+	except OSError:
+		pass# cache is an optimization, not being able to write it is fine
+
+def has_entry(config:Config, file_path:str, module_path:str, text:str) -> bool:
+	return config.use_cache and os.path.exists(entry_path(config, file_path, module_path, text))
+
+def load_module(config:Config, file_path:str, module_path:str, text:str) -> nodes.Module|None:
+	"""cached module for this text, if it and everything it depends on did not change"""
+	if not config.use_cache:
+		return None
+	path = entry_path(config, file_path, module_path, text)
+	session = config.session
+	remembered:Remembered|None = session.remembered_modules.use((module_path, file_path))
+	if remembered is not None and remembered[0] == path:
+		module = reuse_module(config, remembered[1], remembered[2])
+		if module is not None:
+			return module
+	try:
+		with open(path, 'rb') as file:
+			dependencies, direct, min_uid, max_uid, data = pickle.load(file)
+	except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+		return None
+	files:dict[str, str] = {}
+	for dependency_path, dependency_file, digest in dependencies:
+		if file_hash(config, dependency_file) != digest:
+			return None
+		files[dependency_path] = dependency_file
+	from .utils import extract_module_from_file_path
+	for dependency_path in direct:# dependencies are extracted first, so they get lower uids than this module, like when it is parsed
+		if extract_module_from_file_path(files[dependency_path], config, dependency_path) is None:
+			return None
+	collecting = gc.isenabled()
+	gc.disable()# unpickling creates lots of objects and no cycles, collections only slow it down
+	try:
+		module = ModuleUnpickler(io.BytesIO(data), config, min_uid, max_uid).load()
+	except (pickle.UnpicklingError, AttributeError, ImportError, TypeError):
+		return None
+	finally:
+		if collecting:
+			gc.enable()
+	session.module_dependencies[module_path] = tuple(dependencies)
+	session.module_files[module_path] = file_path
+	session.remembered_modules[module_path, file_path] = path, session.module_dependencies[module_path], module
+	return module
+
+def reuse_module(config:Config, dependencies:tuple[Dependency, ...], module:nodes.Module) -> nodes.Module|None:
+	"""same module object, that was stored or loaded before, if nothing it depends on changed.
+	Modules it imports have to be extracted as the same objects, that it refers to"""
+	if any(file_hash(config, dependency_file) != digest for _, dependency_file, digest in dependencies):
+		return None
+	from .utils import extract_module_from_file_path
+	for imported in module.imports:
+		if extract_module_from_file_path(config.session.module_files[imported.path], config, imported.path) is not imported:
+			return None
+	config.session.module_dependencies[module.path] = dependencies
+	return module
+
+def build_outputs(config:Config) -> list[str]:
+	"""extensions of files, that compilation makes"""
+	if config.toolchain == 'lli' and not config.separate:
+		return ['ll']
+	return ['out', *(['bc'] if config.toolchain == 'opt' and not config.separate else []), *(['ll'] if config.emit_llvm else [])]
+
+def build_key(config:Config) -> str|None:
+	"""hash of everything the built program depends on: files of every module it imports, flags, compiler and llvm tools.
+	None, if files can not be read"""
+	from .utils import program_graph
+	try:
+		graph = program_graph(config)
+	except OSError:
+		return None
+	hasher = hashlib.sha256(f"{compiler_fingerprint(config)}\0{config.optimization}\0{config.assume_assert}\0{config.toolchain}\0{config.separate}\0{config.emit_llvm}".encode())
+	for tool in ('opt', 'clang', 'llvm-dis'):
+		hasher.update(f"\0{tool_stamp(tool)}".encode())
+	for module_path in sorted(graph):
+		file_path = graph[module_path][0]
+		digest = file_hash(config, file_path)
+		if digest is None:
+			return None
+		hasher.update(f"\0{module_path}\0{os.path.abspath(file_path)}\0{digest}".encode())
+	return hasher.hexdigest()
+
+def build_path(config:Config, key:str) -> str:
+	return os.path.join(config.cache_dir, 'builds', key[:2], key[2:])
+
+def load_build(config:Config, key:str) -> bool:
+	"""copy files of the cached build to the output files. Returns, if there was one"""
+	path = build_path(config, key)
+	try:
+		for extension in build_outputs(config):
+			output_file = f"{config.output_file}.{extension}"
+			shutil.copy(os.path.join(path, extension), output_file+'.tmp')
+			os.replace(output_file+'.tmp', output_file)# running program is not overwritten
+		os.utime(path)# recently used
+	except OSError:
+		return False
+	return True
+
+def store_build(config:Config, key:str) -> None:
+	path = build_path(config, key)
+	tmp_path = f"{path}.{os.getpid()}.tmp"
+	try:
+		os.makedirs(tmp_path)
+		for extension in build_outputs(config):
+			shutil.copy(f"{config.output_file}.{extension}", os.path.join(tmp_path, extension))
+		os.rename(tmp_path, path)
+	except OSError:
+		shutil.rmtree(tmp_path, ignore_errors=True)
+		return# cache is an optimization, not being able to write it is fine
+	for directory in ('builds', 'objects'):
+		trim_cache(os.path.join(config.cache_dir, directory), BUILD_CACHE_SIZE)
+
+def trim_cache(directory:str, limit:int) -> None:
+	"""remove least recently used entries (files or directories of files), until they take at most `limit` bytes"""
+	entries:list[tuple[int, int, str]] = []
+	try:
+		for shard in os.scandir(directory):
+			for entry in os.scandir(shard.path):
+				if entry.name.endswith('.tmp'):
+					continue
+				size = sum(file.stat().st_size for file in os.scandir(entry.path)) if entry.is_dir() else entry.stat().st_size
+				entries.append((entry.stat().st_mtime_ns, size, entry.path))
+	except OSError:
+		return
+	total = sum(size for _, size, _ in entries)
+	for _, size, path in sorted(entries):
+		if total <= limit:
+			break
+		if os.path.isdir(path):
+			shutil.rmtree(path, ignore_errors=True)
+		else:
+			try:
+				os.remove(path)
+			except OSError:
+				pass
+		total -= size
@@ -1,236 +1,322 @@
-from .primitives import Place, TT, Token, ET, DIGITS_BIN, DIGITS_HEX, DIGITS_OCTAL, DIGITS, KEYWORDS, WHITESPACE, WORD_FIRST_CHAR_ALPHABET, WORD_ALPHABET, Config, ESCAPE_TO_CHARS
-from .primitives.token import draft_loc
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+from .primitives import Place, TT, Token, TokenStore, ET, DIGITS_BIN, DIGITS_HEX, DIGITS_OCTAL, DIGITS, KEYWORDS, WHITESPACE, WORD_FIRST_CHAR_ALPHABET, WORD_ALPHABET, Config, ESCAPE_TO_CHARS, Loc, NEWLINE, index_lines, ErrorBin, Error, pool_context
+__all__ = [
+	"Lexer",
+	"lex",
+	"lex_store",
+	"lex_store_parallel",
+	"stream",
+]
+SYMBOLS = {
+	'{':TT.LEFT_CURLY_BRACKET,
+	'}':TT.RIGHT_CURLY_BRACKET,
+	'[':TT.LEFT_SQUARE_BRACKET,
+	']':TT.RIGHT_SQUARE_BRACKET,
+	'(':TT.LEFT_PARENTHESIS,
+	')':TT.RIGHT_PARENTHESIS,
+	'+':TT.PLUS,
+	'%':TT.PERCENT,
+	'$':TT.DOLLAR,
+	'@':TT.AT,
+	',':TT.COMMA,
+	'.':TT.DOT,
+	':':TT.COLON,
+	'*':TT.ASTERISK,
+}
+KEYWORDS_SET = frozenset(KEYWORDS)
+STREAM_BATCH = 256# tokens lexed ahead of the parser
+def chars_pattern(chars:str) -> 're.Pattern[str]':
+	return re.compile(f"[{re.escape(chars)}]*")
+WORD_PATTERN       = re.compile(f"[{re.escape(WORD_FIRST_CHAR_ALPHABET)}][{re.escape(WORD_ALPHABET)}]*")
+SPACES_PATTERN     = chars_pattern(WHITESPACE.replace(NEWLINE, ''))
+COMMENT_PATTERN    = re.compile(r"[^\n]*")
+STRING_PATTERNS    = {quote:re.compile(f"[^{re.escape(quote)}\\\\]*") for quote in "'\""}
+NUMBER_PATTERNS    = {
+	10:chars_pattern(DIGITS+'_'),
+	16:chars_pattern(DIGITS_HEX+'_'),
+	2 :chars_pattern(DIGITS_BIN+'_'),
+	8 :chars_pattern(DIGITS_OCTAL+'_'),
+}
 class Lexer:
-	__slots__ = ('text', 'config', 'file_name', 'loc')
+	__slots__ = ('text', 'config', 'file_name', 'idx', 'end', 'store')
 	def __init__(self, text:str, config:Config, file_name:str):
 		self.text = text
 		self.config = config
 		self.file_name = file_name
-		self.loc = draft_loc(file_name, text, config)
+		self.idx = 0
+		self.end = len(text)# text is treated as if it ended with a newline, that is never lexed
+		self.store = TokenStore(file_name)
+		index_lines(file_name, text)
+	def loc(self, idx:int) -> Loc:
+		return Loc(self.file_name, idx)
+	def place(self, start:int) -> Place:
+		return Place(self.loc(start), self.loc(self.idx))
+	@property
+	def char(self) -> str:
+		return self.text[self.idx] if self.idx < self.end else NEWLINE
+	def advance(self, number:int = 1) -> None:
+		if self.idx+number > self.end:
+			loc = self.loc(self.idx)
+			self.config.errors.add_error(ET.EOF, Place(loc,loc), "unexpected end of file while lexing")
+			number = self.end-self.idx
+		self.idx += number
 	def lex(self) -> list[Token]:
-		program:list[Token] = []
-		while self.loc:
-			program += self.lex_token()
-		program.append(Token(Place(self.loc.to_loc(),self.loc.to_loc()), TT.EOF))
-		return program
-	def lex_token(self) -> list[Token]:
-		char = self.loc.char
-		start_loc = self.loc.to_loc()
-		if char in '][}{()+%:,.$@*':
-			self.loc+=1
-			return [Token(Place(start_loc,self.loc.to_loc()),
-			{
-				'{':TT.LEFT_CURLY_BRACKET,
-				'}':TT.RIGHT_CURLY_BRACKET,
-				'[':TT.LEFT_SQUARE_BRACKET,
-				']':TT.RIGHT_SQUARE_BRACKET,
-				'(':TT.LEFT_PARENTHESIS,
-				')':TT.RIGHT_PARENTHESIS,
-				'+':TT.PLUS,
-				'%':TT.PERCENT,
-				'$':TT.DOLLAR,
-				'@':TT.AT,
-				',':TT.COMMA,
-				'.':TT.DOT,
-				':':TT.COLON,
-				'*':TT.ASTERISK,
-			}[char])]
-		elif char in WHITESPACE:
-			self.loc +=1
-			if char == '\n':
-				return [Token(Place(start_loc,self.loc.to_loc()), TT.NEWLINE)]
-			return []
-		elif char in DIGITS:
-			return [self.lex_digits()]
-		elif char in WORD_FIRST_CHAR_ALPHABET:
-			word = char
-			self.loc+=1
-			while self.loc.char in WORD_ALPHABET and self.loc:
-				word+=self.loc.char
-				self.loc+=1
-			return [Token(Place(start_loc,self.loc.to_loc()),
-			TT.KEYWORD if word in KEYWORDS else TT.WORD,
-			word)]
-		elif char in "'\"":#strings
-			self.loc+=1
-			word = ''
-			while self.loc.char != char and self.loc:
-				if self.loc.char == '\\':
-					l=self.loc
-					self.loc+=1
-					if self.loc.char == 'x':#any char
-						self.loc+=1
-						escape = self.loc.char
-						self.loc+=1
-						escape += self.loc.char
-						self.loc+=1
-						if escape[0] not in DIGITS_HEX or escape[1] not in DIGITS_HEX:
-							self.config.errors.add_error(ET.STR_ANY_CHAR, Place(l.to_loc(),self.loc.to_loc()), "expected 2 hex digits after \'\\x\' to create char with that ascii code")
-							escape = '00'
-						word+=chr(int(escape,16))
-						continue
-					word+=ESCAPE_TO_CHARS.get(self.loc.char, '')
-					self.loc+=1
-					continue
-				word+=self.loc.char
-				self.loc+=1
-			self.loc+=1
-			if self.loc.char == 'c':
-				self.loc+=1
-				if len(word) != 1:
-					self.config.errors.add_error(ET.CHARACTER,Place(start_loc,self.loc.to_loc()),f"expected a string of length 1 because of 'c' prefix, actual length is {len(word)}")
-				if len(word) < 1:
-					word = chr(0)
-				return [Token(Place(start_loc,self.loc.to_loc()), TT.CHAR_STR, word[0])]
-			return [Token(Place(start_loc,self.loc.to_loc()), TT.STR, word)]
-		elif char == '`':#template strings
-			return self.lex_template_strings()
-		elif char == '/':
-			self.loc+=1
-			if self.loc.char == '/':
-				self.loc+=1
-			elif self.loc.char == '*':
-				previous = self.loc.char
-				self.loc +=1
-				while previous != '*' or self.loc.char != '/':
-					previous = self.loc.char
-					self.loc +=1
-				self.loc += 1
-				return []
-			else:
-				self.config.errors.add_error(ET.DIVISION, Place(start_loc,self.loc.to_loc()), "accurate division '/' is not supported yet")
-			token = Token(Place(start_loc,self.loc.to_loc()), TT.DOUBLE_SLASH)
-			return [token]
-		elif char == '=':
-			self.loc+=1
-			token = Token(Place(start_loc,self.loc.to_loc()), TT.EQUALS)
-			if self.loc.char == '=':
-				self.loc+=1
-				token = Token(Place(start_loc,self.loc.to_loc()), TT.DOUBLE_EQUALS)
-			return [token]
-		elif char == '!':
-			self.loc+=1
-			token = Token(Place(start_loc,self.loc.to_loc()), TT.NOT)
-			if self.loc.char == '=':
-				self.loc+=1
-				token = Token(Place(start_loc,self.loc.to_loc()), TT.NOT_EQUALS)
-			return [token]
-		elif char == '>':
-			self.loc+=1
-			token = Token(Place(start_loc,self.loc.to_loc()), TT.GREATER)
-			if self.loc.char == '=':
-				self.loc+=1
-				token = Token(Place(start_loc,self.loc.to_loc()), TT.GREATER_OR_EQUAL)
-			elif self.loc.char == '>':
-				self.loc+=1
-				token = Token(Place(start_loc,self.loc.to_loc()), TT.DOUBLE_GREATER)
-			return [token]
-		elif char == '<':
-			self.loc+=1
-			token = Token(Place(start_loc,self.loc.to_loc()), TT.LESS)
-			if self.loc.char == '=':
-				self.loc+=1
-				token = Token(Place(start_loc,self.loc.to_loc()), TT.LESS_OR_EQUAL)
-			elif self.loc.char == '<':
-				self.loc+=1
-				token = Token(Place(start_loc,self.loc.to_loc()), TT.DOUBLE_LESS)
-			return [token]
-		elif char == '-':
-			token = Token(Place(start_loc,self.loc.to_loc()), TT.MINUS)
-			self.loc+=1
-			if self.loc.char == '>':
-				self.loc+=1
-				token = Token(Place(start_loc,self.loc.to_loc()), TT.ARROW)
-			return [token]
-		elif char == '#':
-			while self.loc.char != '\n' and self.loc:
-				self.loc+=1
-			return []
-		else:
-			self.loc+=1
-			self.config.errors.add_error(ET.ILLEGAL_CHAR, Place(start_loc,self.loc.to_loc()), f"illegal character '{char}'")
-			return []
-		assert False, "Unreachable"
-	def lex_digits(self) -> Token:
-		start_loc = self.loc.to_loc()
-		char = self.loc.char
-		self.loc += 1
+		return list(self.lex_store())
+	def lex_store(self) -> TokenStore:
+		"""lex the whole text into compact token store"""
+		while self.idx < self.end:
+			self.lex_token()
+		self.store.append(TT.EOF, self.idx, self.idx)
+		return self.store
+	def stream(self) -> TokenStore:
+		"""store, that is lexed into by batches, as the parser reaches its end"""
+		self.store.lex_more = self.lex_batch
+		self.lex_batch()
+		return self.store
+	def lex_batch(self) -> None:
+		store = self.store
+		length = len(store)+STREAM_BATCH
+		while len(store) < length and self.idx < self.end:
+			self.lex_token()
+		if self.idx >= self.end:
+			store.append(TT.EOF, self.idx, self.idx)
+			store.lex_more = None
+	def lex_token(self) -> None:
+		char = self.text[self.idx] if self.idx < self.end else NEWLINE
+		LEXING_TABLE.get(char, Lexer.lex_illegal)(self, char)
+	def lex_symbol(self, char:str) -> None:
+		self.idx += 1
+		self.store.append(SYMBOLS[char], self.idx-1, self.idx)
+	def lex_newline(self, char:str) -> None:
+		start = self.idx
+		self.advance()
+		self.store.append(TT.NEWLINE, start, self.idx)
+	def lex_spaces(self, char:str) -> None:
+		self.idx = SPACES_PATTERN.match(self.text, self.idx, self.end).end()
+	def lex_comment(self, char:str) -> None:
+		self.idx = COMMENT_PATTERN.match(self.text, self.idx, self.end).end()
+	def lex_word(self, char:str) -> None:
+		start = self.idx
+		match = WORD_PATTERN.match(self.text, start, self.end)
+		assert match is not None, "Unreachable, dispatched on the first character of a word"
+		self.idx = match.end()
+		word = match.group()
+		self.store.append(TT.KEYWORD if word in KEYWORDS_SET else TT.WORD, start, self.idx, word)
+	def lex_digits(self, char:str) -> None:
+		start = self.idx
+		self.idx += 1
 		word = char
-		digs = DIGITS
 		base = 10
-		if word == '0' and self.loc.char in 'xbo':
+		if word == '0' and self.char in 'xbo':
 			word = ''
-			if self.loc.char == 'x':#hex
-				digs,base = DIGITS_HEX,16
-			elif self.loc.char == 'b':#binary
-				digs,base = DIGITS_BIN,2
-			elif self.loc.char == 'o':#octal
-				digs,base = DIGITS_OCTAL,8
-			else:
-				assert False, "Unreachable"
-			self.loc+=1
-		while self.loc.char in digs+'_' and self.loc:
-			if self.loc.char != '_':
-				word+=self.loc.char
-			self.loc+=1
+			base = {'x':16, 'b':2, 'o':8}[self.char]
+			self.idx += 1
+		match = NUMBER_PATTERNS[base].match(self.text, self.idx, self.end)
+		assert match is not None, "Unreachable, pattern matches empty string"
+		self.idx = match.end()
+		word += match.group().replace('_', '')
 		if len(word) == 0:
-			self.config.errors.add_error(ET.ILLEGAL_NUMBER, Place(start_loc,self.loc.to_loc()), "expected a number, but got nothing")
+			self.config.errors.add_error(ET.ILLEGAL_NUMBER, self.place(start), "expected a number, but got nothing")
 			word = '0'
 		word = str(int(word,base=base))
-		if self.loc.char == 'c':#char
-			self.loc+=1
-			return Token(Place(start_loc,self.loc.to_loc()), TT.CHAR_NUM, word)
-		if self.loc.char == 's':#char
-			self.loc+=1
-			return Token(Place(start_loc,self.loc.to_loc()), TT.SHORT, word)
-		return Token(Place(start_loc,self.loc.to_loc()), TT.INT, word)
-	def lex_template_strings(self) -> list[Token]:
-		start_loc = self.loc.to_loc()
-		self.loc += 1 # `
+		typ = TT.INT
+		if self.char == 'c':#char
+			self.idx += 1
+			typ = TT.CHAR_NUM
+		elif self.char == 's':#short
+			self.idx += 1
+			typ = TT.SHORT
+		self.store.append(typ, start, self.idx, word)
+	def lex_escape(self, error:ET) -> str:
+		"""lex escape sequence, starting at '\\', return the character it makes"""
+		start = self.idx
+		self.advance()
+		if self.char == 'x':#any char
+			self.advance()
+			escape = self.char
+			self.advance()
+			escape += self.char
+			self.advance()
+			if escape[0] not in DIGITS_HEX or escape[1] not in DIGITS_HEX:
+				self.config.errors.add_error(error, self.place(start), "expected 2 hex digits after \'\\x\' to create char with that ascii code")
+				escape = '00'
+			return chr(int(escape,16))
+		escaped = ESCAPE_TO_CHARS.get(self.char, '')
+		self.advance()
+		return escaped
+	def lex_string(self, quote:str) -> None:
+		start = self.idx
+		self.idx += 1
+		pattern = STRING_PATTERNS[quote]
 		word = ''
-		tokens:list[Token] = []
-		while self.loc.char != '`' and self.loc:
-			if self.loc.char == '{':
-				self.loc+=1
-				if self.loc.char != '{':
-					tokens.append(Token(Place(start_loc,self.loc.to_loc()), TT.TEMPLATE_MIDDLE if len(tokens) != 0 else TT.TEMPLATE_HEAD, word))
-					tok = self.lex_token()
-					while ((tok[0].typ != TT.RIGHT_CURLY_BRACKET) if len(tok) == 1 else True) and self.loc:
-						tokens+=tok
-						tok = self.lex_token()
+		while self.char != quote and self.idx < self.end:
+			if self.char == '\\':
+				word += self.lex_escape(ET.STR_ANY_CHAR)
+				continue
+			match = pattern.match(self.text, self.idx, self.end)
+			assert match is not None, "Unreachable, pattern matches empty string"
+			self.idx = match.end()
+			word += match.group()
+		self.advance()
+		if self.char == 'c':
+			self.advance()
+			if len(word) != 1:
+				self.config.errors.add_error(ET.CHARACTER,self.place(start),f"expected a string of length 1 because of 'c' prefix, actual length is {len(word)}")
+			if len(word) < 1:
+				word = chr(0)
+			self.store.append(TT.CHAR_STR, start, self.idx, word[0])
+			return
+		self.store.append(TT.STR, start, self.idx, word)
+	def lex_slash(self, char:str) -> None:
+		start = self.idx
+		self.idx += 1
+		if self.char == '/':
+			self.idx += 1
+		elif self.char == '*':
+			comment_end = self.text.find('*/', self.idx, self.end)
+			if comment_end == -1:
+				self.advance(self.end-self.idx+1)
+				return
+			self.idx = comment_end+2
+			return
+		else:
+			self.config.errors.add_error(ET.DIVISION, self.place(start), "accurate division '/' is not supported yet")
+		self.store.append(TT.DOUBLE_SLASH, start, self.idx)
+	def lex_operator(self, char:str) -> None:
+		start = self.idx
+		self.idx += 1
+		typ, combinations = OPERATORS[char]
+		second = combinations.get(self.char)
+		if second is not None:
+			self.idx += 1
+			typ = second
+		self.store.append(typ, start, self.idx)
+	def lex_minus(self, char:str) -> None:
+		start = self.idx
+		self.idx += 1
+		if self.char == '>':
+			self.idx += 1
+			self.store.append(TT.ARROW, start, self.idx)
+			return
+		self.store.append(TT.MINUS, start, start)
+	def lex_illegal(self, char:str) -> None:
+		start = self.idx
+		self.idx += 1
+		self.config.errors.add_error(ET.ILLEGAL_CHAR, self.place(start), f"illegal character '{char}'")
+	def lex_template_strings(self, char:str) -> None:
+		store = self.store
+		first = len(store)
+		part_start = self.idx
+		self.advance() # `
+		word = ''
+		while self.char != '`' and self.idx < self.end:
+			if self.char == '{':
+				self.advance()
+				if self.char != '{':
+					store.append(TT.TEMPLATE_MIDDLE if len(store) != first else TT.TEMPLATE_HEAD, part_start, self.idx, word)
+					length = len(store)
+					self.lex_token()
+					while not (len(store) == length+1 and store.kinds[length] == TT.RIGHT_CURLY_BRACKET.value) and self.idx < self.end:
+						length = len(store)
+						self.lex_token()
+					part_start = store.starts[length] if len(store) > length else self.idx
+					store.truncate(length)# drop '}' (or whatever hit the end of file)
 					word = ''
-					start_loc = tok[0].place.start
-					continue
-			if self.loc.char == '}':
-				l = self.loc.to_loc()
-				if (self.loc+1).char != '}':
-					self.config.errors.add_error(ET.TEMPLATE_DR_CURLY, Place(l,self.loc.to_loc()), "single '}' are not allowed in template strings, use '}}' instead")
-				else:
-					self.loc+=1
-			if self.loc.char == '\\':
-				if self.loc.char == '\\':
-					l=self.loc.to_loc()
-					self.loc+=1
-					if self.loc.char == 'x':#any char
-						self.loc+=1
-						escape = self.loc.char
-						self.loc+=1
-						escape += self.loc.char
-						self.loc+=1
-						if escape[0] not in DIGITS_HEX or escape[1] not in DIGITS_HEX:
-							self.config.errors.add_error(ET.TEMPLATE_ANY_CHAR, Place(l,self.loc.to_loc()), "expected 2 hex digits after \'\\x\' to create char with that ascii code")
-							escape = '00'
-						word+=chr(int(escape,16))
-						continue
-					word+=ESCAPE_TO_CHARS.get(self.loc.char, '')
-					self.loc+=1
 					continue
-			word += self.loc.char
-			self.loc += 1
-		self.loc+=1
-		tokens.append(Token(Place(start_loc,self.loc.to_loc()), TT.TEMPLATE_TAIL if len(tokens) != 0 else TT.NO_MIDDLE_TEMPLATE, word))
-		return tokens
+			if self.char == '}':
+				start = self.idx
+				self.advance()
+				if self.char != '}':
+					self.idx = start
+					self.config.errors.add_error(ET.TEMPLATE_DR_CURLY, self.place(start), "single '}' are not allowed in template strings, use '}}' instead")
+			if self.char == '\\':
+				word += self.lex_escape(ET.TEMPLATE_ANY_CHAR)
+				continue
+			word += self.char
+			self.advance()
+		self.advance()
+		store.append(TT.TEMPLATE_TAIL if len(store) != first else TT.NO_MIDDLE_TEMPLATE, part_start, self.idx, word)
+OPERATORS:dict[str, tuple[TT, dict[str, TT]]] = {
+	'=':(TT.EQUALS,  {'=':TT.DOUBLE_EQUALS}),
+	'!':(TT.NOT,     {'=':TT.NOT_EQUALS}),
+	'>':(TT.GREATER, {'=':TT.GREATER_OR_EQUAL, '>':TT.DOUBLE_GREATER}),
+	'<':(TT.LESS,    {'=':TT.LESS_OR_EQUAL,    '<':TT.DOUBLE_LESS}),
+}
+LEXING_TABLE:dict[str, Callable[[Lexer, str], None]] = {
+	**{char:Lexer.lex_symbol for char in SYMBOLS},
+	**{char:Lexer.lex_spaces for char in WHITESPACE},
+	**{char:Lexer.lex_digits for char in DIGITS},
+	**{char:Lexer.lex_word for char in WORD_FIRST_CHAR_ALPHABET},
+	**{char:Lexer.lex_operator for char in OPERATORS},
+	NEWLINE:Lexer.lex_newline,
+	"'":Lexer.lex_string,
+	'"':Lexer.lex_string,
+	'`':Lexer.lex_template_strings,
+	'/':Lexer.lex_slash,
+	'-':Lexer.lex_minus,
+	'#':Lexer.lex_comment,
+}
 
 def lex(text:str, config:Config, file_name:str) -> 'list[Token]':
 	return Lexer(text, config, file_name).lex()
+def lex_store(text:str, config:Config, file_name:str) -> 'TokenStore':
+	return Lexer(text, config, file_name).lex_store()
+def stream(text:str, config:Config, file_name:str) -> 'TokenStore':
+	if config.jobs > 1 and len(text) >= config.parallel_lex_size:
+		return lex_store_parallel(text, config, file_name)
+	return Lexer(text, config, file_name).stream()
 
+TOP_START_PATTERN = re.compile(f"{NEWLINE}(?=[{re.escape(WORD_FIRST_CHAR_ALPHABET)}])")
+def split_points(text:str, parts:int) -> list[int]:
+	"""offsets to split text at, each is right after a newline, that is followed by a word (probably a top)"""
+	points = [0]
+	for part in range(1, parts):
+		match = TOP_START_PATTERN.search(text, max(len(text)*part//parts, points[-1]))
+		if match is None:
+			break
+		points.append(match.end())
+	points.append(len(text))
+	return points
+chunk_source:tuple[str, str] = ('', '')
+def init_chunk_worker(text:str, file_name:str) -> None:
+	global chunk_source
+	chunk_source = text, file_name
+def lex_chunk(bounds:tuple[int, int]) -> tuple[TokenStore, list[Error]]:
+	text, file_name = chunk_source
+	config = Config.use_defaults(ErrorBin(silent=True), file_name)
+	lexer = Lexer(text, config, file_name)
+	lexer.idx, lexer.end = bounds
+	while lexer.idx < lexer.end:
+		lexer.lex_token()
+	return lexer.store, config.errors.errors
+def lex_store_parallel(text:str, config:Config, file_name:str) -> 'TokenStore':
+	"""lex text in chunks on a process pool, the result is the same as of the serial lexer.
+	Lexer has no state between tokens, so a chunk boundary is valid if the lexer of the previous chunk stops right at it.
+	Otherwise that lexer ran into the end of its chunk (inside of a string, template or comment),
+	then lexing continues serially from the start of that chunk until it stops right at some later boundary"""
+	points = split_points(text, config.jobs)
+	with ProcessPoolExecutor(max_workers=config.jobs, mp_context=pool_context(), initializer=init_chunk_worker, initargs=(text, file_name)) as pool:
+		chunks = list(pool.map(lex_chunk, zip(points, points[1:])))
+	lexer = Lexer(text, config, file_name)
+	store = lexer.store
+	idx = 0
+	while idx < len(chunks):
+		chunk, errors = chunks[idx]
+		if idx == len(chunks)-1 or all(error.typ != ET.EOF for error in errors):
+			store.extend(chunk)
+			for error in errors:
+				config.errors.add_error(error.typ, error.place, error.msg)
+			idx += 1
+			continue
+		lexer.idx = points[idx]
+		idx += 1
+		while lexer.idx < lexer.end:
+			lexer.lex_token()
+			while points[idx] < lexer.idx and idx < len(chunks):
+				idx += 1
+			if lexer.idx == points[idx]:
+				break
+	store.append(TT.EOF, len(text), len(text))
+	return store
@@ -1,7 +1,7 @@
 import math
-from typing import Callable
+from typing import Callable, Iterator
 
-from .primitives import Node, nodes, TT, Config, Type, types, DEFAULT_TEMPLATE_STRING_FORMATTER, INT_TO_STR_CONVERTER, CHAR_TO_STR_CONVERTER, MAIN_MODULE_PATH, BUILTIN_WORDS, STRING_MULTIPLICATION, BOOL_TO_STR_CONVERTER, ASSERT_FAILURE_HANDLER,STRING_ADDITION
+from .primitives import Node, nodes, TT, Config, Type, types, DEFAULT_TEMPLATE_STRING_FORMATTER, INT_TO_STR_CONVERTER, CHAR_TO_STR_CONVERTER, MAIN_MODULE_PATH, BUILTIN_WORDS, STRING_MULTIPLICATION, BOOL_TO_STR_CONVERTER, ASSERT_FAILURE_HANDLER,STRING_ADDITION, Scope
 from dataclasses import dataclass
 
 @dataclass(slots=True, frozen=True)
@@ -20,13 +20,52 @@ class TV:#typed value
 			return f"{self.typ.llvm} 0"
 		return f"{self.typ.llvm} {self.val}"
 
-imported_modules:'dict[str,GenerateAssembly]' = {}
+@dataclass(slots=True, frozen=True)
+class Generated:
+	"""generated module with what it's text depends on: modules, generated before it, checkers and config.
+	Text has modules, that were first imported by it, so they are remembered too. Session retains them by module path, later compilations reuse their text"""
+	module:nodes.Module
+	before:frozenset[str]
+	generated:'dict[str,GenerateAssembly]'
+	checkers:'tuple[object, ...]'
+	assume_assert:bool
+	separate:bool
+class IR:
+	"""llvm ir, built from chunks: text of a chunk, or other ir (of a function, of an imported module) with it's own chunks.
+	Appending is `ir += chunk`, it does not copy text, generated before. Text is joined once, when it's needed.
+	Ir with `write` does not keep chunks, they are written, when they are appended (they should be complete by then)"""
+	__slots__ = ('chunks', 'write')
+	def __init__(self, write:Callable[[str], object]|None = None) -> None:
+		self.chunks:list[str|IR] = []
+		self.write = write
+	def __iadd__(self, chunk:'str|IR') -> 'IR':
+		if self.write is None:
+			self.chunks.append(chunk)
+		elif isinstance(chunk, IR):
+			for text in chunk:
+				self.write(text)
+		else:
+			self.write(chunk)
+		return self
+	def __iter__(self) -> Iterator[str]:
+		"""text chunks in order, for writing ir to a file without joining it"""
+		stack = [iter(self.chunks)]
+		while len(stack) != 0:
+			for chunk in stack[-1]:
+				if isinstance(chunk, IR):
+					stack.append(iter(chunk.chunks))
+					break
+				yield chunk
+			else:
+				stack.pop()
+	def __str__(self) -> str:
+		return ''.join(self)
 GLOBAL = object()
 LOCAL = object()
 @dataclass(slots=True)
 class Names:
-	global_names:dict[str,TV]
-	local_names:dict[str,TV]
+	global_names:Scope[str,TV]
+	local_names:Scope[str,TV]
 	def get(self,obj:str,default:None|TV=None) -> TV|None:
 		lr = self.local_names.get(obj,None)
 		if lr is not None:return self.local_names[obj]
@@ -43,32 +82,36 @@ class Names:
 			self.local_names[name[0]] = value
 		else:
 			assert False
-	def copy(self) -> 'Names':
-		return Names(self.global_names.copy(),self.local_names.copy())
+	def push(self) -> None:
+		self.global_names.push()
+		self.local_names.push()
+	def pop(self) -> None:
+		self.global_names.pop()
+		self.local_names.pop()
 
 class GenerateAssembly:
-	__slots__ = ('text','module','config', 'funs', 'modules', 'type_names', 'insert_before_text', 'text_in_setup', 'names')
-	def __init__(self, module:nodes.Module, config:Config) -> None:
+	__slots__ = ('text','module','config', 'table', 'funs', 'modules', 'insert_before_text', 'text_in_setup', 'names', 'linkage', 'interface')
+	def __init__(self, module:nodes.Module, config:Config, table:types.TypeTable, write:Callable[[str], object]|None = None) -> None:
+		"""with `write` text is written, as it's generated (functions, imported modules), and not kept.
+		With --separate text is a llvm module of it's own: imported modules are not in it, their interfaces are,
+		definitions are visible to other modules, and interface has declarations of them"""
 		self.config             :Config                    = config
 		self.module             :nodes.Module              = module
-		self.text               :str                       = ''
-		self.text_in_setup      :str                       = ''
-		self.insert_before_text :str                       = ''
-		self.names              :Names                     = Names({},{})
+		self.table              :types.TypeTable           = table
+		self.text               :IR                        = IR()
+		self.text_in_setup      :IR                        = IR()
+		self.insert_before_text :IR                        = IR(write)
+		self.interface          :IR                        = IR()
+		self.linkage            :str                       = 'hidden' if config.separate else 'private'
+		self.names              :Names                     = Names(Scope(),Scope())
 		self.modules            :dict[int,GenerateAssembly]= {}
-		self.type_names         :dict[str,Type]            = {}
 		self.generate_assembly()
 	def visit_from_import(self,node:nodes.FromImport) -> TV:
 		gen = self.import_module(node.module)
 		for nam in node.imported_names:
-			name = nam.operand
-			type_definition = gen.type_names.get(name)
-			definition = gen.names.get(name)
-			assert type_definition is not None or None is not definition, "type checker broke"
-			if definition is not None:
-				self.names[name,GLOBAL] = definition
-			if type_definition is not None:
-				self.type_names[name] = type_definition
+			definition = gen.names.get(nam.operand)
+			if definition is not None:#types are in the table
+				self.names[nam.operand,GLOBAL] = definition
 		return TV()
 	def visit_import(self, node:nodes.Import) -> TV:
 		self.import_module(node.module)
@@ -81,9 +124,9 @@ class GenerateAssembly:
 			insert_bound_args = list(self.names.local_names.values())
 			fun = node.typ(self.check,bound_args,[i.typ for i in insert_bound_args])
 			self.names[node.name.operand,GLOBAL] = self.bound_a_fun(fun,node.llvmid,insert_bound_args,f"function_definition.{node.uid}")
-		old = self.names.copy()
+		self.names.push()
 		old_text = self.text
-		self.text = ''
+		self.text = IR()
 
 		for arg in node.arg_types:
 			self.names[arg.name.operand,LOCAL] = TV(self.check(arg.typ),f'%argument{arg.uid}')
@@ -99,10 +142,11 @@ define i64 @main(i32 %0, i8** %1){{;entry point
 	store {types.Ptr(types.Array(types.Ptr(types.Array(types.CHAR)))).llvm} %4, {types.Ptr(types.Ptr(types.Array(types.Ptr(types.Array(types.CHAR))))).llvm} @ARGV
 """
 		else:
-			self.text += f"\ndefine private {ot.llvm} {node.llvmid} ({types.PTR.llvm} %bound_args_untyped"
+			self.text += f"\ndefine {self.linkage} {ot.llvm} {node.llvmid} ({types.PTR.llvm} %bound_args_untyped"
 			for arg in node.arg_types[bound_args:]:
 				self.text+=f', {self.check(arg.typ).llvm} %argument{arg.uid}'
 			self.text+=") {\n"
+			self.declare(f"declare {ot.llvm} {node.llvmid}({', '.join([types.PTR.llvm, *(self.check(arg.typ).llvm for arg in node.arg_types[bound_args:])])})\n")
 			bound_args_typ = node.bound_arg_type(bound_args,self.check,[i.typ for i in insert_bound_args])
 			self.text+=f"""\
 %bound_args_arg = bitcast {types.PTR.llvm} %bound_args_untyped to {bound_args_typ}*
@@ -131,19 +175,18 @@ return:
 	ret {ot.llvm} %retval''' if ot != types.VOID else 'ret void'}
 }}
 """
-		self.names = old
+		self.names.pop()
 		self.insert_before_text += self.text
 		self.text = old_text
 		return TV()
 	def visit_code(self, node:nodes.Code) -> TV:
-		name_before = self.names.copy()
+		self.names.push()
 		for statement in node.statements:
 			self.visit(statement)
-		self.names = name_before
+		self.names.pop()
 		return TV()
-	def call_helper(self, func:TV, args:list[TV], uid:str) -> TV:
-		actual_types = [arg.typ for arg in args]
-		def get_fun_out_of_called(called:TV) -> tuple[types.Fun, TV]:
+	def call_helper(self, func:TV, args:list[TV], uid:str, overload:tuple[int, ...] = ()) -> TV:
+		def get_fun_out_of_called(called:TV, overload:tuple[int, ...]) -> tuple[types.Fun, TV]:
 			if isinstance(called.typ, types.Fun):
 				return called.typ,called
 			if isinstance(called.typ, types.StructKind):
@@ -156,20 +199,11 @@ return:
 					types.Ptr(called.typ.struct)
 				), called
 			if isinstance(called.typ, types.Mix):
-				for idx,ref in enumerate(called.typ.funs):
-					self.text+=f'\t%mix_fun.{idx}.call.{uid} = extractvalue {called}, {idx}'
-					fun,tv = get_fun_out_of_called(TV(ref,f"%mix_fun.{idx}.call.{uid}"))
-					if len(actual_types) != len(fun.arg_types):
-						continue#continue searching
-					for actual_arg,arg in zip(actual_types,fun.arg_types,strict=True):
-						if actual_arg != arg:
-							break#break this loop to continue larger one
-					else:
-						return fun,tv#found fun
-					continue
-				assert False
+				idx = overload[0]
+				self.text+=f'\t%mix_fun.{idx}.call.{uid} = extractvalue {called}, {idx}'
+				return get_fun_out_of_called(TV(called.typ.funs[idx],f"%mix_fun.{idx}.call.{uid}"), overload[1:])
 			assert False, f"called is {called}"
-		fun_equiv,callable = get_fun_out_of_called(func)
+		fun_equiv,callable = get_fun_out_of_called(func, overload)
 		assert isinstance(callable.typ,types.Fun|types.StructKind)
 		return_tv:None|TV = None
 		if isinstance(callable.typ,types.StructKind): # this is syntax-sugar for allocating an object and running __init__ on it. It allocates and that's why it is a special case here
@@ -198,7 +232,7 @@ return:
 		return return_tv
 	def visit_call(self, node:nodes.Call) -> TV:
 		args = [self.visit(arg) for arg in node.args]
-		return self.call_helper(self.visit(node.func), args, f"actual_call_node.{node.uid}")
+		return self.call_helper(self.visit(node.func), args, f"actual_call_node.{node.uid}", self.table.overloads.get(node.uid, ()))
 	def visit_str(self, node:nodes.Str) -> TV:
 		return self.create_string(node.token.operand,f"actual.{node.uid}")
 	def create_string(self, s:str, uid:str) -> TV:
@@ -340,7 +374,7 @@ TT.DOUBLE_EQUALS: f"icmp eq",
 TT.NOT_EQUALS:    f"icmp ne",
 }[node.operation.typ] } {left.typ.llvm_item_id} %binary_operation.enum_left.{node.uid}, %binary_operation.enum_right.{node.uid}
 """
-		return TV(node.typ(left.typ, right.typ, self.config), f"%binary_operation.{node.uid}") # return if not already
+		return TV(self.table.types[node.uid], f"%binary_operation.{node.uid}") # return if not already
 	def visit_expr_state(self, node:nodes.ExprStatement) -> TV:
 		self.visit(node.value)
 		return TV()
@@ -460,37 +494,35 @@ while_exit_branch.{node.uid}:
 			assert isinstance(l,types.Ptr), f"{node} {op.place} {val}"
 			if l.pointed == types.VOID:
 				return TV(types.VOID)
-			i = f'load {node.typ(l, self.config).llvm}, {val}'
+			i = f'load {self.table.types[node.uid].llvm}, {val}'
 		else:
 			assert False, f"Unreachable, {op = } and {l = }"
 		self.text+=f"""\
 	%unary_operation.{node.uid} = {i}
 """
-		return TV(node.typ(l, self.config),f"%unary_operation.{node.uid}")
+		return TV(self.table.types[node.uid],f"%unary_operation.{node.uid}")
 	def visit_var(self, node:nodes.Var) -> TV:
 		self.names[node.name.operand,GLOBAL] = TV(types.Ptr(self.check(node.typ)),f'@{node.name.operand}')
-		self.insert_before_text += f"@{node.name.operand} = private global {self.check(node.typ).llvm} undef\n"
+		self.insert_before_text += f"@{node.name.operand} = {self.linkage} global {self.check(node.typ).llvm} undef\n"
+		self.declare(f"@{node.name.operand} = external global {self.check(node.typ).llvm}\n")
 		return TV()
 	def visit_const(self, node:nodes.Const) -> TV:
 		self.names[node.name.operand,GLOBAL] = TV(types.INT,f"{node.value}")
 		return TV()
 	def visit_struct(self, node:nodes.Struct) -> TV:
-		struct = types.Struct('',(),0,())
-		self.type_names[node.name.operand] = struct
-		actual_s_type = node.to_struct(self.check)
-		struct.__dict__ = actual_s_type.__dict__#FIXME
-		del actual_s_type
-
-		sk = node.to_struct_kind(self.check)
+		sk = self.table.types[node.uid]
+		assert isinstance(sk, types.StructKind)
+		struct = sk.struct
 		self.names[node.name.operand,GLOBAL] = TV(sk, sk.llvmid)
-		self.insert_before_text += f"""\
+		types_text = f"""\
 	{struct.llvm} = type {{{', '.join(self.check(var.typ).llvm for var in node.variables)}}}
 	{sk.llvm} = type {{{', '.join(i.llvm for _,i in sk.statics)}}}
-	{sk.llvmid} = private global {sk.llvm} undef
 """
+		self.insert_before_text += f"{types_text}\t{sk.llvmid} = {self.linkage} global {sk.llvm} undef\n"
+		self.declare(f"{types_text}\t{sk.llvmid} = external global {sk.llvm}\n")
 		u = f"{node.uid}"
 		old = self.text
-		self.text = ''
+		self.text = IR()
 		for idx,i in enumerate(node.static_variables):
 			value=self.visit(i.value)
 			self.text+=f'''\
@@ -516,11 +548,12 @@ while_exit_branch.{node.uid}:
 		fun = types.Fun(tuple(self.check(arg) for arg in node.arg_types),0,rt)
 		self.insert_before_text+=f"""\
 declare {rt.llvm} @{node.name}({', '.join(arg.llvm for arg in fun.all_arg_types)})
-define private {rt.llvm} @use_adapter.{node.name}.{node.uid} ({types.PTR.llvm} %bound_args{''.join(f', {arg.llvm} %arg{idx}' for idx,arg in enumerate(fun.all_arg_types))}) {{
+define {self.linkage} {rt.llvm} @use_adapter.{node.name}.{node.uid} ({types.PTR.llvm} %bound_args{''.join(f', {arg.llvm} %arg{idx}' for idx,arg in enumerate(fun.all_arg_types))}) {{
 	{f'%ret = ' if rt!=types.VOID else ''}call {rt.llvm} @{node.name}({', '.join(f"{arg.llvm} %arg{idx}" for idx,arg in enumerate(fun.all_arg_types))})
 	ret {f'{rt.llvm} %ret' if rt != types.VOID else 'void'}
 }}	
 """
+		self.declare(f"declare {rt.llvm} @use_adapter.{node.name}.{node.uid}({', '.join([types.PTR.llvm, *(arg.llvm for arg in fun.all_arg_types)])})\n")
 		self.names[node.as_name.operand,GLOBAL] = TV(fun,f"{{ {fun.fun_llvm} @use_adapter.{node.name}.{node.uid}, {types.PTR.llvm} null }}")
 		return TV()
 	def visit_set(self,node:nodes.Set) -> TV:
@@ -542,22 +575,23 @@ define private {rt.llvm} @use_adapter.{node.name}.{node.uid} ({types.PTR.llvm} %
 			assert v is not None
 			return v
 		if isinstance(origin.typ,types.StructKind):
-			sk = node.lookup_struct_kind(origin.typ, self.config)
-			idx,typ = sk
+			idx,typ = self.table.members[node.uid]
+			assert isinstance(idx, int)
 			self.text += f"""\
 	%struct_kind_dot_ptr.{node.uid} = getelementptr {origin.typ.llvm}, {TV(types.Ptr(origin.typ),origin.val)}, i32 0, i32 {idx}
 	%struct_kind_dot_result.{node.uid} = load {typ.llvm}, {types.Ptr(typ).llvm} %struct_kind_dot_ptr.{node.uid}
 """
 			return TV(typ,f'%struct_kind_dot_result.{node.uid}')
 		if isinstance(origin.typ, types.EnumKind):
-			idx, typ = node.lookup_enum_kind(origin.typ, self.config)
+			idx, typ = self.table.members[node.uid]
+			assert isinstance(idx, int)
 			if isinstance(typ, types.Fun):
 				return TV(typ, origin.typ.llvmid_of_type_function(idx))
 			return TV(typ, f"{{{origin.typ.enum.llvm_item_id} {idx}, {origin.typ.enum.llvm_max_item} undef}}")
 		assert isinstance(origin.typ,types.Ptr), f'dot lookup is not supported for {origin.typ} yet'
 		pointed = origin.typ.pointed
 		if isinstance(pointed, types.Struct):
-			r = node.lookup_struct(pointed, self.config)
+			r = self.table.members[node.uid]
 			if isinstance(r[0],int):
 				idx,result = r
 				self.text += f"""\
@@ -567,7 +601,8 @@ define private {rt.llvm} @use_adapter.{node.name}.{node.uid} ({types.PTR.llvm} %
 			fun,llvmid = r
 			return self.bound_a_fun(fun,llvmid,[origin], f"dot.struct.{node.uid}")
 		if isinstance(pointed, types.Enum):
-			fun,llvmid = node.lookup_enum(pointed, self.config)
+			fun,llvmid = self.table.members[node.uid]
+			assert isinstance(fun, types.Fun) and isinstance(llvmid, str)
 			return self.bound_a_fun(fun,llvmid,[origin], f"dot.enum.{node.uid}")
 		else:
 			assert False, f'unreachable, unknown {type(origin.typ.pointed) = }'
@@ -659,25 +694,25 @@ define private {rt.llvm} @use_adapter.{node.name}.{node.uid} ({types.PTR.llvm} %
 """
 		return TV(nt,f'%cast_result.{node.uid}')
 	def visit_enum(self, node:nodes.Enum) -> TV:
-		enum = types.Enum('',(),(),(),0)
-		self.type_names[node.name.operand] = enum
-		actual_enum_type = node.to_enum(self.check)
-		enum.__dict__ = actual_enum_type.__dict__#FIXME
-		del actual_enum_type
-		ek = node.to_enum_kind(self.check)
+		ek = self.table.types[node.uid]
+		assert isinstance(ek, types.EnumKind)
+		enum = ek.enum
 		self.names[node.name.operand,GLOBAL] = TV(ek)
 		
 		length = len(enum.items)+len(enum.typed_items)
 		bits = math.ceil(math.log2(length)) if length != 0 else 1
-		self.insert_before_text += f"""\
+		types_text = f"""\
 	{enum.llvm_item_id} = type i{bits}
 	;FIXME: find a typ that is maximum of the size and use it as 2nd typ (instead of struct of all types)
 	{enum.llvm_max_item} = type {{{', '.join(typ.llvm for name,typ in enum.typed_items)}}} 
 	{enum.llvm} = type {{{enum.llvm_item_id}, {enum.llvm_max_item}}}
 """
+		self.insert_before_text += types_text
+		self.declare(types_text)
 		for idx, (name, ty) in enumerate(enum.typed_items):
+			self.declare(f"declare {enum.llvm} {ek.llvmid_of_type_function(idx)}({ty.llvm})\n")
 			self.insert_before_text += f"""\
-define private {enum.llvm} {ek.llvmid_of_type_function(idx)}({ty.llvm} %0) {{
+define {self.linkage} {enum.llvm} {ek.llvmid_of_type_function(idx)}({ty.llvm} %0) {{
 	%2 = alloca {enum.llvm_max_item}
 	store {enum.llvm_max_item} zeroinitializer, {enum.llvm_max_item}* %2
 	%3 = bitcast {enum.llvm_max_item}* %2 to {ty.llvm}*
@@ -691,38 +726,13 @@ define private {enum.llvm} {ek.llvmid_of_type_function(idx)}({ty.llvm} %0) {{
 		for fun in node.funs:
 			self.visit_fun(fun,1,False)
 		return TV()
-	def check_type_pointer(self, node:nodes.TypePointer) -> Type:
-		pointed = self.check(node.pointed)
-		return types.Ptr(pointed)
-	def check_type_array(self, node:nodes.TypeArray) -> Type:
-		element = self.check(node.typ)
-		return types.Array(element, node.size)
-	def check_type_fun(self, node:nodes.TypeFun) -> Type:
-		args = tuple(self.check(arg) for arg in node.args)
-		return_type:Type = types.VOID
-		if node.return_type is not None:
-			return_type = self.check(node.return_type)
-		return types.Fun(args,0, return_type)
-	def check_type_reference(self, node:nodes.TypeReference) -> Type:
-		name = node.ref.operand
-		if name == 'bool': return types.BOOL
-		if name == 'char': return types.CHAR
-		if name == 'int': return types.INT
-		if name == 'short': return types.SHORT
-		if name == 'str': return types.STR
-		if name == 'void': return types.VOID
-		assert len(types.Primitive) == 6, "Exhaustive check of Primitives, (implement next primitive type here)"
-		typ = self.type_names.get(name)
-		assert typ is not None
-		return typ
 	def check(self, node:Node) -> Type:
-		if type(node) == nodes.TypeArray        : return self.check_type_array     (node)
-		if type(node) == nodes.TypeFun          : return self.check_type_fun       (node)
-		if type(node) == nodes.TypePointer      : return self.check_type_pointer   (node)
-		if type(node) == nodes.TypeReference    : return self.check_type_reference (node)
-		assert False, f"Unreachable, unknown type {type(node)=}"
+		return self.table.types[node.uid]
+	def declare(self, text:str) -> None:
+		"""add declaration of a definition, visible to other modules, to the interface (with --separate)"""
+		if self.config.separate:
+			self.interface += text
 	def visit_type_definition(self, node:nodes.TypeDefinition) -> TV:
-		self.type_names[node.name.operand] = self.check(node.typ)
 		return TV()
 	def visit_assert(self, node:nodes.Assert) -> TV:
 		value = self.visit(node.value)
@@ -750,11 +760,11 @@ assert_true.{node.uid}:
 			self.text+=f"""\
 	%match.switched.value = extractvalue {value}, 0
 	switch {value.typ.llvm_item_id} %match.switched.value, label %match_default_branch.{node.uid} [{' '.join(
-		f'{value.typ.llvm_item_id} {node.lookup_enum(value.typ, case, self.config)[0]}, label %match_branch_{case.uid}.{node.uid}' for case in node.cases)}]
+		f'{value.typ.llvm_item_id} {self.table.members[case.uid][0]}, label %match_branch_{case.uid}.{node.uid}' for case in node.cases)}]
 """
 			for case in node.cases:
-				names_before = self.names.copy()
-				_, typ = node.lookup_enum(value.typ, case, self.config)
+				self.names.push()
+				_, typ = self.table.members[case.uid]
 				self.text+=f"""\
 match_branch_{case.uid}.{node.uid}:
 	%match.enum.0.{case.uid}.{node.uid} = alloca {value.typ.llvm_max_item}
@@ -765,7 +775,7 @@ match_branch_{case.uid}.{node.uid}:
 """
 				self.names[node.match_as.operand,LOCAL] = TV(typ, f"%match.enum.value.{case.uid}.{node.uid}")
 				self.visit(case.body)
-				self.names = names_before
+				self.names.pop()
 				self.text+=f"""\
 	br label %match_exit_branch.{node.uid}
 """
@@ -782,86 +792,122 @@ match_exit_branch.{node.uid}:
 			assert False, f"match type {value.typ} is no implemented"
 		return TV()
 	def visit(self, node:Node) -> TV:
-		if type(node) == nodes.Assignment       : return self.visit_assignment      (node)
-		if type(node) == nodes.BinaryOperation  : return self.visit_bin_exp         (node)
-		if type(node) == nodes.Call             : return self.visit_call            (node)
-		if type(node) == nodes.Cast             : return self.visit_cast            (node)
-		if type(node) == nodes.CharNum          : return self.visit_char_num        (node)
-		if type(node) == nodes.CharStr          : return self.visit_char_str        (node)
-		if type(node) == nodes.Code             : return self.visit_code            (node)
-		if type(node) == nodes.Const            : return self.visit_const           (node)
-		if type(node) == nodes.Constant         : return self.visit_constant        (node)
-		if type(node) == nodes.Declaration      : return self.visit_declaration     (node)
-		if type(node) == nodes.Dot              : return self.visit_dot             (node)
-		if type(node) == nodes.Enum             : return self.visit_enum            (node)
-		if type(node) == nodes.ExprStatement    : return self.visit_expr_state      (node)
-		if type(node) == nodes.FromImport       : return self.visit_from_import     (node)
-		if type(node) == nodes.Fun              : return self.visit_fun             (node)
-		if type(node) == nodes.If               : return self.visit_if              (node)
-		if type(node) == nodes.Import           : return self.visit_import          (node)
-		if type(node) == nodes.Int              : return self.visit_int             (node)
-		if type(node) == nodes.Match            : return self.visit_match           (node)
-		if type(node) == nodes.Mix              : return self.visit_mix             (node)
-		if type(node) == nodes.ReferTo          : return self.visit_refer           (node)
-		if type(node) == nodes.Return           : return self.visit_return          (node)
-		if type(node) == nodes.Save             : return self.visit_save            (node)
-		if type(node) == nodes.Set              : return self.visit_set             (node)
-		if type(node) == nodes.Short            : return self.visit_short           (node)
-		if type(node) == nodes.Str              : return self.visit_str             (node)
-		if type(node) == nodes.StrCast          : return self.visit_string_cast     (node)
-		if type(node) == nodes.Struct           : return self.visit_struct          (node)
-		if type(node) == nodes.Subscript        : return self.visit_subscript       (node)
-		if type(node) == nodes.Template         : return self.visit_template        (node)
-		if type(node) == nodes.TypeDefinition   : return self.visit_type_definition (node)
-		if type(node) == nodes.UnaryExpression  : return self.visit_unary_exp       (node)
-		if type(node) == nodes.Use              : return self.visit_use             (node)
-		if type(node) == nodes.Var              : return self.visit_var             (node)
-		if type(node) == nodes.VariableSave     : return self.visit_variable_save   (node)
-		if type(node) == nodes.While            : return self.visit_while           (node)
-		if type(node) == nodes.Assert           : return self.visit_assert          (node)
-		assert False, f'Unreachable, unknown {type(node)=}'
+		return VISIT[type(node)](self, node)
+	def header(self) -> str:
+		"""declarations, that every module uses. Main module defines arguments of the program"""
+		defined = self.module.path == MAIN_MODULE_PATH
+		return f"""\
+; Assembly generated by jararaca compiler github.com/izumrudik/jararaca
+@ARGV = {f'{self.linkage} global' if defined else 'external global'} {types.Ptr(types.Array(types.Ptr(types.Array(types.CHAR)))).llvm}{' undef' if defined else ''}
+@ARGC = {f'{self.linkage} global' if defined else 'external global'} {types.INT.llvm}{' undef' if defined else ''}
+declare void @GC_init()
+declare noalias {types.PTR.llvm} @GC_malloc(i64 noundef)
+declare void @llvm.assume(i1)
+{types.STR.llvm} = type <{{ i64, [0 x i8]* }}>
+"""
 	def generate_assembly(self) -> None:
+		if self.module.path == MAIN_MODULE_PATH and not self.config.separate:
+			self.insert_before_text += self.header()
 		if self.module.builtin_module is not None: # import built-ins
 			gen = self.import_module(self.module.builtin_module)
 			for name in BUILTIN_WORDS:
-				typ = gen.names.get(name)
-				type_definition = gen.type_names.get(name)
 				definition = gen.names.get(name)
-				assert type_definition is not None or None is not definition, f"Unreachable, builtin does not have word '{name}' defined, but it must"
-				if definition is not None:
+				if definition is not None:#types are in the table
 					self.names[name,GLOBAL] = definition
-				if type_definition is not None:
-					self.type_names[name] = type_definition
 
 		for top in self.module.tops:
 			self.visit(top)
 
-		self.insert_before_text += f"""\
-define private void {self.module.llvmid}() {{
-{self.text_in_setup}
-	ret void
-}}
-"""
-		if self.module.path == MAIN_MODULE_PATH:
-			self.insert_before_text = f"""\
-; Assembly generated by jararaca compiler github.com/izumrudik/jararaca
-@ARGV = private global {types.Ptr(types.Array(types.Ptr(types.Array(types.CHAR)))).llvm} undef
-@ARGC = private global {types.INT.llvm} undef
-declare void @GC_init()
-declare noalias {types.PTR.llvm} @GC_malloc(i64 noundef)
-declare void @llvm.assume(i1)
-{types.STR.llvm} = type <{{ i64, [0 x i8]* }}>
-""" + self.insert_before_text
-		self.text = self.insert_before_text+self.text
+		self.insert_before_text += f"define {self.linkage} void {self.module.llvmid}() {{\n"
+		self.insert_before_text += self.text_in_setup
+		self.insert_before_text += "\n\tret void\n}\n"
+		self.insert_before_text += self.text
+		self.declare(f"declare void {self.module.llvmid}()\n")
+		if self.config.separate:# types should be defined before they are used
+			text = IR()
+			text += self.header()
+			for gen in imported_generators(self):
+				text += gen.interface
+			text += self.insert_before_text
+			self.insert_before_text = text
+		self.text = self.insert_before_text
 
 
 	def import_module(self,module:'nodes.Module') -> 'GenerateAssembly':
-		if module.path not in imported_modules:
+		session = self.config.session
+		generators = session.generators
+		gen = generators.get(module.path)
+		if gen is None:
 			self.text_in_setup+= f"\tcall void {module.llvmid}()\n"
-			gen = GenerateAssembly(module,self.config)
-			self.insert_before_text+=gen.text
-			imported_modules[module.path] = gen
-		else:
-			gen = imported_modules[module.path]
+			gen = reuse_generated_module(module, self.config)
+			if gen is None:
+				before = frozenset(generators)
+				gen = GenerateAssembly(module,self.config,self.table)
+				generators[module.path] = gen
+				generated = {path:generators[path] for path in generators if path not in before}
+				session.generated_modules[module.path] = Generated(module, before, generated, checkers(generated, self.config), self.config.assume_assert, self.config.separate)
+			if not self.config.separate:
+				self.insert_before_text+=gen.text
 		self.modules[module.uid] = gen
 		return gen
+def imported_generators(gen:'GenerateAssembly') -> 'list[GenerateAssembly]':
+	"""generators of modules, that the module imports (directly or not), each once"""
+	seen:dict[int, GenerateAssembly] = {}
+	stack = list(gen.modules.values())
+	while len(stack) != 0:
+		imported = stack.pop()
+		if id(imported) not in seen:
+			seen[id(imported)] = imported
+			stack.extend(imported.modules.values())
+	return list(seen.values())
+def checkers(generated:'dict[str,GenerateAssembly]', config:Config) -> tuple[object, ...]:
+	return tuple(config.session.checkers.get(path) for path in generated)
+def reuse_generated_module(module:'nodes.Module', config:Config) -> 'GenerateAssembly|None':
+	"""generator of the same module from an earlier compilation, if it would generate the same text now"""
+	retained:Generated|None = config.session.generated_modules.use(module.path)
+	if retained is None or retained.module is not module or retained.assume_assert != config.assume_assert or retained.separate != config.separate:
+		return None
+	generators = config.session.generators
+	if retained.before != generators.keys() or any(new is not old for new, old in zip(checkers(retained.generated, config), retained.checkers)):
+		return None
+	generators.update(retained.generated)
+	return retained.generated[module.path]
+VISIT:'nodes.Dispatch[GenerateAssembly, TV]' = nodes.Dispatch('GenerateAssembly.visit', {
+	nodes.Assignment      : GenerateAssembly.visit_assignment,
+	nodes.BinaryOperation : GenerateAssembly.visit_bin_exp,
+	nodes.Call            : GenerateAssembly.visit_call,
+	nodes.Cast            : GenerateAssembly.visit_cast,
+	nodes.CharNum         : GenerateAssembly.visit_char_num,
+	nodes.CharStr         : GenerateAssembly.visit_char_str,
+	nodes.Code            : GenerateAssembly.visit_code,
+	nodes.Const           : GenerateAssembly.visit_const,
+	nodes.Constant        : GenerateAssembly.visit_constant,
+	nodes.Declaration     : GenerateAssembly.visit_declaration,
+	nodes.Dot             : GenerateAssembly.visit_dot,
+	nodes.Enum            : GenerateAssembly.visit_enum,
+	nodes.ExprStatement   : GenerateAssembly.visit_expr_state,
+	nodes.FromImport      : GenerateAssembly.visit_from_import,
+	nodes.Fun             : GenerateAssembly.visit_fun,
+	nodes.If              : GenerateAssembly.visit_if,
+	nodes.Import          : GenerateAssembly.visit_import,
+	nodes.Int             : GenerateAssembly.visit_int,
+	nodes.Match           : GenerateAssembly.visit_match,
+	nodes.Mix             : GenerateAssembly.visit_mix,
+	nodes.ReferTo         : GenerateAssembly.visit_refer,
+	nodes.Return          : GenerateAssembly.visit_return,
+	nodes.Save            : GenerateAssembly.visit_save,
+	nodes.Set             : GenerateAssembly.visit_set,
+	nodes.Short           : GenerateAssembly.visit_short,
+	nodes.Str             : GenerateAssembly.visit_str,
+	nodes.StrCast         : GenerateAssembly.visit_string_cast,
+	nodes.Struct          : GenerateAssembly.visit_struct,
+	nodes.Subscript       : GenerateAssembly.visit_subscript,
+	nodes.Template        : GenerateAssembly.visit_template,
+	nodes.TypeDefinition  : GenerateAssembly.visit_type_definition,
+	nodes.UnaryExpression : GenerateAssembly.visit_unary_exp,
+	nodes.Use             : GenerateAssembly.visit_use,
+	nodes.Var             : GenerateAssembly.visit_var,
+	nodes.VariableSave    : GenerateAssembly.visit_variable_save,
+	nodes.While           : GenerateAssembly.visit_while,
+	nodes.Assert          : GenerateAssembly.visit_assert,
+})
@@ -2,133 +2,191 @@ import os
 import sys
 from typing import Callable, TypeVar
 
-from .primitives import nodes, Node, TT, Token, Config, Type, types, JARARACA_PATH, BUILTIN_WORDS, ET, Place, MAIN_MODULE_PATH
+from .primitives import nodes, Node, TT, TT_BY_CODE, Token, TokenStore, Config, Type, types, JARARACA_PATH, BUILTIN_WORDS, ET, Place, MAIN_MODULE_PATH, packets
 from .utils import extract_module_from_file_path
+BINDING_POWERS:dict[TT, int] = {
+	TT.LESS            :2,
+	TT.GREATER         :2,
+	TT.DOUBLE_EQUALS   :2,
+	TT.NOT_EQUALS      :2,
+	TT.LESS_OR_EQUAL   :2,
+	TT.GREATER_OR_EQUAL:2,
+
+	TT.PLUS            :3,
+	TT.MINUS           :3,
+
+	TT.DOUBLE_SLASH    :4,
+	TT.ASTERISK        :4,
+
+	TT.DOUBLE_GREATER  :5,
+	TT.DOUBLE_LESS     :5,
+	TT.PERCENT         :5,
+}
+KEYWORD_BINDING_POWERS:dict[str, int] = {
+	'or' :1,
+	'xor':1,
+	'and':1,
+}
 class Parser:
-	__slots__ = ('tokens', 'config', 'idx', 'parsed_tops', 'module_path', 'builtin_module')
-	def __init__(self, tokens:list[Token], config:Config, module_path:str|None = None) -> None:
-		self.tokens     :list[Token] = tokens
-		self.config     :Config      = config
-		self.idx        :int         = 0
-		self.parsed_tops:list[Node]  = []
-		self.module_path:str         = MAIN_MODULE_PATH if module_path is None else module_path
-		self.builtin_module          = extract_module_from_file_path(os.path.join(JARARACA_PATH,'std','builtin.ja'),self.config,'std.builtin', None) if self.module_path != 'std.builtin' else None
+	__slots__ = ('store', 'idx', 'config', 'parsed_tops', 'constants', 'module_path', 'builtin_module')
+	def __init__(self, tokens:TokenStore, config:Config, module_path:str|None = None) -> None:
+		self.store      :TokenStore      = tokens
+		self.idx        :int             = 0# index of the current token in the store (window of the file, while it is lexed)
+		self.config     :Config          = config
+		self.parsed_tops:list[Node]      = []
+		self.constants  :dict[str, int|None] = {}
+		self.module_path:str             = MAIN_MODULE_PATH if module_path is None else module_path
+		self.builtin_module              = extract_module_from_file_path(os.path.join(JARARACA_PATH,'std','builtin.ja'),self.config,'std.builtin', None) if self.module_path != 'std.builtin' else None
+		while len(self.store) < 2 and self.store.lex_more is not None:# current and next tokens
+			self.store.lex_more()
 	def adv(self) -> Token:
 		"""advance current word, and return what was current"""
 		ret = self.current
-		self.idx+=1
+		self.skip()
+		return ret
+	def adv_place(self) -> Place:
+		"""advance current word, and return place of what was current, the token itself is not made"""
+		ret = self.place
+		self.skip()
 		return ret
+	def skip(self) -> None:
+		"""advance current word"""
+		store = self.store
+		if self.idx+1 < len(store.kinds):# EOF stays current forever
+			self.idx += 1
+			if self.idx+1 == len(store.kinds) and store.lex_more is not None:
+				store.drop(self.idx)# tokens before the current one are never read again
+				self.idx = 0
+				store.lex_more()
 	@property
 	def current(self) -> Token:
-		if self.idx >= len(self.tokens):
-			return self.tokens[-1]
-		return self.tokens[self.idx]
+		return self.store.token(self.idx)
+	@property
+	def place(self) -> Place:
+		return self.store.place(self.idx)
+	@property
+	def typ(self) -> TT:
+		"""kind of the current token, read without making the token"""
+		return TT_BY_CODE[self.store.kinds[self.idx]]# type: ignore[return-value]
+	@property
+	def operand(self) -> str:
+		return self.store.operand(self.idx)
+	def equals(self, typ:TT, operand:str) -> bool:
+		return self.typ is typ and self.operand == operand
 	def parse(self) -> nodes.Module:
-		while self.current == TT.NEWLINE:self.adv() # skip newlines
-		while self.current.typ != TT.EOF:
-			while self.current == TT.NEWLINE:self.adv() # skip newlines
+		while self.typ is TT.NEWLINE:self.skip() # skip newlines
+		while self.typ is not TT.EOF:
+			while self.typ is TT.NEWLINE:self.skip() # skip newlines
 			top = self.parse_top()
 			if top is None:
 				continue
-			if self.current != TT.NEWLINE:
-				self.config.errors.add_error(ET.TOP_NEWLINE, self.current.place, f"there should be newline after every top")
+			if self.typ is not TT.NEWLINE:
+				self.config.errors.add_error(ET.TOP_NEWLINE, self.place, f"there should be newline after every top")
 			self.parsed_tops.append(top)
-			while self.current == TT.NEWLINE:self.adv() # skip newlines
-		return nodes.Module(tuple(self.parsed_tops),self.module_path, self.builtin_module)
+			self.index_constants(top)
+			while self.typ is TT.NEWLINE:self.skip() # skip newlines
+		return nodes.Module(tuple(self.parsed_tops),self.module_path, self.builtin_module, self.constants)
+	def index_constants(self, top:Node) -> None:
+		"""remember consts, that top makes visible for compile-time-evaluation, first one with a name wins"""
+		if isinstance(top, nodes.Const):
+			self.constants.setdefault(top.name.operand, top.value)
+		elif isinstance(top, nodes.FromImport):
+			for name in top.imported_names:
+				self.constants.setdefault(name.operand, top.module.constants.get(name.operand))
 	def parse_top(self) -> 'Node|None':
-		if self.current.equals(TT.KEYWORD, 'fun'):
+		if self.equals(TT.KEYWORD, 'fun'):
 			return self.parse_fun(True)
-		elif self.current.equals(TT.KEYWORD, 'use'):
-			start_loc = self.adv().place.start
-			if self.current.typ != TT.WORD:
-				self.config.errors.add_error(ET.USE_NAME, self.current.place, "expected a name of a function to use")
+		elif self.equals(TT.KEYWORD, 'use'):
+			start_loc = self.adv_place().start
+			if self.typ is not TT.WORD:
+				self.config.errors.add_error(ET.USE_NAME, self.place, "expected a name of a function to use")
 				return None
 			name = self.adv()
 			#name(type, type) -> type
-			if self.current.typ != TT.LEFT_PARENTHESIS:
-				self.config.errors.add_error(ET.USE_PAREN, self.current.place, "expected '(' after 'use' keyword and a function name")
+			if self.typ is not TT.LEFT_PARENTHESIS:
+				self.config.errors.add_error(ET.USE_PAREN, self.place, "expected '(' after 'use' keyword and a function name")
 			else:
-				self.adv()
+				self.skip()
 			input_types:list[Node] = []
-			while self.current != TT.RIGHT_PARENTHESIS and self.next is not None:
+			while self.typ is not TT.RIGHT_PARENTHESIS and self.next_typ is not None:
 				ty = self.parse_type()
 				if ty is None:
 					return None
 				input_types.append(ty)
-				if self.current == TT.RIGHT_PARENTHESIS:
+				if self.typ is TT.RIGHT_PARENTHESIS:
 					break
-				if self.current != TT.COMMA:
-					self.config.errors.add_error(ET.USE_COMMA, self.current.place, "expected ',' or ')'")
+				if self.typ is not TT.COMMA:
+					self.config.errors.add_error(ET.USE_COMMA, self.place, "expected ',' or ')'")
 				else:
-					self.adv()
-			self.adv()
-			if self.current.typ != TT.ARROW: # provided any output types
-				self.config.errors.add_error(ET.USE_ARROW, self.current.place, "expected '->'")
+					self.skip()
+			self.skip()
+			if self.typ is not TT.ARROW: # provided any output types
+				self.config.errors.add_error(ET.USE_ARROW, self.place, "expected '->'")
 			else:
-				self.adv()
+				self.skip()
 			ty = self.parse_type()
 			if ty is None: return None
 			as_name = name
-			if self.current.equals(TT.KEYWORD, 'as'):
-				self.adv()
-				if self.current.typ != TT.WORD:
-					self.config.errors.add_error(ET.USE_AS_NAME, self.current.place, "expected a name after keyword as")
+			if self.equals(TT.KEYWORD, 'as'):
+				self.skip()
+				if self.typ is not TT.WORD:
+					self.config.errors.add_error(ET.USE_AS_NAME, self.place, "expected a name after keyword as")
 					return None
 				else:
 					as_name = self.adv()
 			return nodes.Use(tuple(input_types), ty, as_name, name, Place(start_loc, ty.place.end))
-		elif self.current.equals(TT.KEYWORD, 'var'):
-			start_loc = self.adv().place.start
-			if self.current.typ != TT.WORD:
-				self.config.errors.add_error(ET.VAR_NAME,self.current.place, "expected name of var after keyword 'var'")
+		elif self.equals(TT.KEYWORD, 'var'):
+			start_loc = self.adv_place().start
+			if self.typ is not TT.WORD:
+				self.config.errors.add_error(ET.VAR_NAME,self.place, "expected name of var after keyword 'var'")
 				return None
 			name = self.adv()
 			ty = self.parse_type()
 			if ty is None: return None
 			return nodes.Var(name, ty, Place(start_loc, ty.place.end))
-		elif self.current.equals(TT.KEYWORD, 'const'):
-			start_loc = self.adv().place.start
-			if self.current.typ != TT.WORD:
-				self.config.errors.add_error(ET.CONST_NAME, self.current.place, "expected name of constant after keyword 'const'")
+		elif self.equals(TT.KEYWORD, 'const'):
+			start_loc = self.adv_place().start
+			if self.typ is not TT.WORD:
+				self.config.errors.add_error(ET.CONST_NAME, self.place, "expected name of constant after keyword 'const'")
 				return None
 			name = self.adv()
 			cte = self.parse_CTE()
 			if cte is None: return None
 			value, place = cte
 			return nodes.Const(name, value, Place(start_loc, place.end))
-		elif self.current.equals(TT.KEYWORD, 'import'):
-			start_loc = self.adv().place.start
+		elif self.equals(TT.KEYWORD, 'import'):
+			start_loc = self.adv_place().start
 			mp = self.parse_module_path()
 			if mp is None: return None
 			path,nam,module,place = mp
 			return nodes.Import(path,place,nam,module, Place(start_loc, place.end))
-		elif self.current.equals(TT.KEYWORD, 'from'):
-			start_loc = self.adv().place.start
+		elif self.equals(TT.KEYWORD, 'from'):
+			start_loc = self.adv_place().start
 			mp = self.parse_module_path()
 			if mp is None: return None
 			path,_,module,path_place = mp
-			if not self.current.equals(TT.KEYWORD, 'import'):
-				self.config.errors.add_error(ET.FROM_IMPORT, self.current.place, "expected keyword 'import' after path in 'from ... import ...' top")
+			if not self.equals(TT.KEYWORD, 'import'):
+				self.config.errors.add_error(ET.FROM_IMPORT, self.place, "expected keyword 'import' after path in 'from ... import ...' top")
 			else:
-				self.adv()
-			if self.current != TT.WORD:
-				self.config.errors.add_error(ET.FROM_NAME, self.current.place, "expected word, to import after keyword 'import' in 'from ... import ...' top")
+				self.skip()
+			if self.typ is not TT.WORD:
+				self.config.errors.add_error(ET.FROM_NAME, self.place, "expected word, to import after keyword 'import' in 'from ... import ...' top")
 				return None
 
 			name = self.adv()
 			names = [name]
-			while self.current == TT.COMMA and self.next is not None:
-				self.adv()
-				if self.current != TT.WORD:
-					self.config.errors.add_error(ET.FROM_2NAME, self.current.place, "expected word, to import after comma in 'from ... import ...' top")
+			while self.typ is TT.COMMA and self.next_typ is not None:
+				self.skip()
+				if self.typ is not TT.WORD:
+					self.config.errors.add_error(ET.FROM_2NAME, self.place, "expected word, to import after comma in 'from ... import ...' top")
 					return None
 				name = self.adv()
 				names.append(name)
 			return nodes.FromImport(path,path_place,module,tuple(names),Place(start_loc,name.place.end))
-		elif self.current.equals(TT.KEYWORD, 'struct'):
-			start_loc = self.adv().place.start
-			if self.current.typ != TT.WORD:
-				self.config.errors.add_error(ET.STRUCT_NAME, self.current.place, "expected name of a structure after keyword 'struct'")
+		elif self.equals(TT.KEYWORD, 'struct'):
+			start_loc = self.adv_place().start
+			if self.typ is not TT.WORD:
+				self.config.errors.add_error(ET.STRUCT_NAME, self.place, "expected name of a structure after keyword 'struct'")
 				return None
 			name = self.adv()
 			static:list[nodes.Assignment] = []
@@ -145,32 +203,32 @@ class Parser:
 				else:
 					assert False, "unreachable"
 			return nodes.Struct(name, tuple(vars), tuple(static), tuple(functions), Place(start_loc, place.end))
-		elif self.current.equals(TT.KEYWORD, 'mix'):
-			start_loc = self.adv().place.start
-			if self.current.typ != TT.WORD:
-				self.config.errors.add_error(ET.MIX_NAME, self.current.place, "expected name of mix after keyword 'mix'")
+		elif self.equals(TT.KEYWORD, 'mix'):
+			start_loc = self.adv_place().start
+			if self.typ is not TT.WORD:
+				self.config.errors.add_error(ET.MIX_NAME, self.place, "expected name of mix after keyword 'mix'")
 				return None
 			name = self.adv()
 			funs,place = self.block_parse_helper(self.parse_mix_statement)
 			return nodes.Mix(name,tuple(funs), Place(start_loc, place.end))
-		elif self.current.equals(TT.KEYWORD, 'typedef'):
-			start_loc = self.adv().place.start
-			if self.current.typ != TT.WORD:
-				self.config.errors.add_error(ET.TYPEDEF_NAME, self.current.place, "expected name of typedef after keyword 'typedef'")
+		elif self.equals(TT.KEYWORD, 'typedef'):
+			start_loc = self.adv_place().start
+			if self.typ is not TT.WORD:
+				self.config.errors.add_error(ET.TYPEDEF_NAME, self.place, "expected name of typedef after keyword 'typedef'")
 				return None
 			name = self.adv()
 			#expect =
-			if self.current != TT.EQUALS:
-				self.config.errors.add_error(ET.TYPEDEF_EQUALS, self.current.place, "expected '=' after typedef name")
+			if self.typ is not TT.EQUALS:
+				self.config.errors.add_error(ET.TYPEDEF_EQUALS, self.place, "expected '=' after typedef name")
 			else:
-				self.adv()
+				self.skip()
 			ty = self.parse_type()
 			if ty is None: return None
 			return nodes.TypeDefinition(name, ty, Place(start_loc, ty.place.end))
-		elif self.current.equals(TT.KEYWORD, 'enum'):
-			start_loc = self.adv().place.start
-			if self.current.typ != TT.WORD:
-				self.config.errors.add_error(ET.ENUM_NAME, self.adv().place, "expected name of enum after keyword 'enum'")
+		elif self.equals(TT.KEYWORD, 'enum'):
+			start_loc = self.adv_place().start
+			if self.typ is not TT.WORD:
+				self.config.errors.add_error(ET.ENUM_NAME, self.adv_place(), "expected name of enum after keyword 'enum'")
 				return None
 			name = self.adv()
 			items:list[Token] = []
@@ -188,84 +246,78 @@ class Parser:
 					assert False, "unreachable"
 			return nodes.Enum(name, tuple(typed_items), tuple(items), tuple(funcs), Place(start_loc, place.end))
 		else:
-			self.config.errors.add_error(ET.TOP, self.adv().place, "unrecognized top-level entity while parsing")
+			self.config.errors.add_error(ET.TOP, self.adv_place(), "unrecognized top-level entity while parsing")
 			return None
 	def parse_mix_statement(self) -> 'nodes.ReferTo|None':
-		if self.current == TT.WORD:
+		if self.typ is TT.WORD:
 			return self.parse_reference()
-		self.config.errors.add_error(ET.MIX_MIXED_NAME, self.adv().place, "unrecognized mix statement")
+		self.config.errors.add_error(ET.MIX_MIXED_NAME, self.adv_place(), "unrecognized mix statement")
 		return None
 	def parse_enum_statement(self) -> 'Token|nodes.TypedVariable|nodes.Fun|None':
-		if self.current.equals(TT.KEYWORD, 'fun'):
+		if self.equals(TT.KEYWORD, 'fun'):
 			return self.parse_fun(False)
-		if self.next is not None:
-			if self.next == TT.COLON:
+		if self.next_typ is not None:
+			if self.next_typ is TT.COLON:
 				return self.parse_typed_variable()
-		if self.current == TT.WORD:
+		if self.typ is TT.WORD:
 			return self.adv()
-		self.config.errors.add_error(ET.ENUM_VALUE, self.adv().place, "unrecognized enum statement")
+		self.config.errors.add_error(ET.ENUM_VALUE, self.adv_place(), "unrecognized enum statement")
 		return None
 	def parse_module_path(self) -> 'tuple[str,str,nodes.Module,Place]|None':
-		if self.current.typ != TT.WORD:
-			self.config.errors.add_error(ET.PACKET_NAME, self.current.place, "expected name of a packet at the start of module path")
+		if self.typ is not TT.WORD:
+			self.config.errors.add_error(ET.PACKET_NAME, self.place, "expected name of a packet at the start of module path")
 			return None
 		next_token = self.adv()
 		path_start = next_token.place.start
 		path:str = next_token.operand
-		link_path = os.path.join(JARARACA_PATH,'packets',path+'.link')
-		if not os.path.exists(link_path):
-			self.config.errors.add_error(ET.PACKET, next_token.place, f"packet '{path}' was not found at '{link_path}'")
+		file_path = packets.directory(path)
+		if file_path is None:
+			self.config.errors.add_error(ET.PACKET, next_token.place, f"packet '{path}' was not found in '{packets.index_path}'")
 			return None
-		with open(link_path,'r') as f:
-			file_path = f.read()
-
-		while self.current == TT.DOT and self.next is not None:
-			if not os.path.isdir(file_path):
+		while self.typ is TT.DOT and self.next_typ is not None:
+			if not packets.is_dir(file_path):
 				self.config.errors.add_error(ET.DIR, next_token.place, f"module '{path}' was not found at '{file_path}'")
 				return None
-			self.adv()
-			if self.current.typ != TT.WORD:
-				self.config.errors.add_error(ET.MODULE_NAME, self.current.place, "expected name of the next module in the hierarchy after dot")
+			self.skip()
+			if self.typ is not TT.WORD:
+				self.config.errors.add_error(ET.MODULE_NAME, self.place, "expected name of the next module in the hierarchy after dot")
 				return None
 			next_token = self.adv()
 			next_level = next_token.operand
 			path += '.' + next_level
 			file_path = os.path.join(file_path,next_level)
-		if not os.path.isdir(file_path):
-			file_path += '.ja'
-		else:
-			file_path = os.path.join(file_path,'__init__.ja')
+		file_path = packets.module_file(file_path)
 		place = Place(path_start, next_token.place.end)
 		module = extract_module_from_file_path(file_path,self.config,path, place)
 		if module is None:return None
 		return path,next_level,module,place
 	def parse_fun(self,can_main:bool) -> nodes.Fun|None:
-		start_loc = self.adv().place.start
+		start_loc = self.adv_place().start
 		name = self.adv()
-		if name != TT.WORD:
-			self.config.errors.add_error(ET.FUN_NAME, self.current.place, "expected name of a function after keyword 'fun'")
+		if name.typ is not TT.WORD:
+			self.config.errors.add_error(ET.FUN_NAME, self.place, "expected name of a function after keyword 'fun'")
 			return None
-		args_place_start = self.current.place.start
-		if self.current != TT.LEFT_PARENTHESIS:
-			self.config.errors.add_error(ET.FUN_PAREN, self.current.place, "expected '(' after function name")
+		args_place_start = self.place.start
+		if self.typ is not TT.LEFT_PARENTHESIS:
+			self.config.errors.add_error(ET.FUN_PAREN, self.place, "expected '(' after function name")
 		else:
-			self.adv()
+			self.skip()
 		input_types:list[nodes.TypedVariable] = []
-		while self.current != TT.RIGHT_PARENTHESIS and self.next is not None:
+		while self.typ is not TT.RIGHT_PARENTHESIS and self.next_typ is not None:
 			tv = self.parse_typed_variable()
 			if tv is not None:
 				input_types.append(tv)
-			if self.current == TT.RIGHT_PARENTHESIS:
+			if self.typ is TT.RIGHT_PARENTHESIS:
 				break
-			if self.current != TT.COMMA:
-				self.config.errors.add_error(ET.FUN_COMMA, self.current.place, "expected ',' or ')'")
+			if self.typ is not TT.COMMA:
+				self.config.errors.add_error(ET.FUN_COMMA, self.place, "expected ',' or ')'")
 				return None
 			else:
-				self.adv()
-		args_place_end = self.adv().place.end
+				self.skip()
+		args_place_end = self.adv_place().end
 		output_type:Node|None = None
-		if self.current.typ == TT.ARROW: # provided any output types
-			self.adv()
+		if self.typ is TT.ARROW: # provided any output types
+			self.skip()
 			ty = self.parse_type()
 			if ty is None: return None
 			output_type = ty
@@ -273,42 +325,33 @@ class Parser:
 		return nodes.Fun(name, tuple(input_types), output_type, code, Place(args_place_start, args_place_end), Place(start_loc, code.place.end), can_main and name.operand == 'main')
 
 	def parse_struct_statement(self) -> 'nodes.TypedVariable|nodes.Assignment|nodes.Fun|None':
-		if self.next is not None:
-			if self.next == TT.COLON:
+		if self.next_typ is not None:
+			if self.next_typ is TT.COLON:
 				var = self.parse_typed_variable()
 				if var is None: return None
-				if self.current == TT.EQUALS:
-					self.adv()
+				if self.typ is TT.EQUALS:
+					self.skip()
 					expr = self.parse_expression()
 					if expr is None: return None
 					return nodes.Assignment(var,expr, Place(var.place.start, expr.place.end))
 				return var
-		if self.current.equals(TT.KEYWORD, 'fun'):
+		if self.equals(TT.KEYWORD, 'fun'):
 			return self.parse_fun(False)
-		self.config.errors.add_error(ET.STRUCT_STATEMENT, self.adv().place, "unrecognized struct statement")
+		self.config.errors.add_error(ET.STRUCT_STATEMENT, self.adv_place(), "unrecognized struct statement")
 		return None
 	def parse_CTE(self) -> tuple[int,Place]|None:
 		def parse_term_int_CTE() -> tuple[int,Place]|None:
-			if self.current == TT.INT:
+			if self.typ is TT.INT:
 				c = self.adv()
 				return int(c.operand), c.place
-			if self.current == TT.WORD:
-				def find_a_const(tops:list[Node]) -> int|None:
-					if self.current.operand in BUILTIN_WORDS and self.builtin_module is not None:
-						return find_a_const(list(self.builtin_module.tops))
-					for top in tops:
-						if isinstance(top, nodes.Const):
-							if top.name == self.current:
-								return top.value
-						if isinstance(top, nodes.FromImport):
-							for name in top.imported_names:
-								if name == self.current:
-									return find_a_const(list(top.module.tops))
-					return None
-				i = find_a_const(self.parsed_tops)
+			if self.typ is TT.WORD:
+				if self.operand in BUILTIN_WORDS and self.builtin_module is not None:
+					i = self.builtin_module.constants.get(self.operand)
+				else:
+					i = self.constants.get(self.operand)
 				if i is not None:
-					return i, self.adv().place
-			self.config.errors.add_error(ET.CTE_TERM, self.adv().place, "unrecognized compile-time-evaluation term")
+					return i, self.adv_place()
+			self.config.errors.add_error(ET.CTE_TERM, self.adv_place(), "unrecognized compile-time-evaluation term")
 			return None
 		operations = (
 			TT.PLUS,
@@ -324,24 +367,24 @@ class Parser:
 		left,place = cte
 		start_loc = place.start
 		end_loc = place.end
-		while self.current.typ in operations and self.next is not None:
-			op_token = self.current.typ
-			self.adv()
+		while self.typ in operations and self.next_typ is not None:
+			op_token = self.typ
+			self.skip()
 			cte = parse_term_int_CTE()
 			if cte is None: return None
 			right,place = cte
 			end_loc = place.end
-			if   op_token == TT.PLUS        : left = left +  right
-			elif op_token == TT.MINUS       : left = left -  right
-			elif op_token == TT.ASTERISK    : left = left *  right
-			elif op_token == TT.DOUBLE_SLASH:
+			if   op_token is TT.PLUS        : left = left +  right
+			elif op_token is TT.MINUS       : left = left -  right
+			elif op_token is TT.ASTERISK    : left = left *  right
+			elif op_token is TT.DOUBLE_SLASH:
 				if right == 0:
-					self.config.errors.add_error(ET.CTE_ZERO_DIV, self.current.place, "division by zero in cte")
+					self.config.errors.add_error(ET.CTE_ZERO_DIV, self.place, "division by zero in cte")
 				else:
 					left = left // right
-			elif op_token == TT.PERCENT:
+			elif op_token is TT.PERCENT:
 				if right == 0:
-					self.config.errors.add_error(ET.CTE_ZERO_MOD, self.current.place, "modulo by zero in cte")
+					self.config.errors.add_error(ET.CTE_ZERO_MOD, self.place, "modulo by zero in cte")
 				else:
 					left = left %  right
 			else:
@@ -351,66 +394,67 @@ class Parser:
 		block,place = self.block_parse_helper(self.parse_statement)
 		return nodes.Code(block,place)
 	@property
-	def next(self) -> 'Token | None':
-		if len(self.tokens)>self.idx+1:
-			return self.tokens[self.idx+1]
+	def next_typ(self) -> 'TT | None':
+		"""kind of the token after the current one, None if the current one is EOF"""
+		if self.idx+1 < len(self.store.kinds):
+			return TT_BY_CODE[self.store.kinds[self.idx+1]]
 		return None
 	def parse_statement(self) -> 'Node|None':
-		if self.next is not None:#variables
-			if self.next == TT.COLON:
+		if self.next_typ is not None:#variables
+			if self.next_typ is TT.COLON:
 				var = self.parse_typed_variable()
 				if var is None: return None
-				if self.current.typ != TT.EQUALS:#var:type
+				if self.typ is not TT.EQUALS:#var:type
 					return nodes.Declaration(var,None,var.place)
 				#var:type = value
-				self.adv()
+				self.skip()
 				value = self.parse_expression()
 				if value is None: return None
 				return nodes.Assignment(var, value, Place(var.place.start, value.place.end))
-			if self.next == TT.EQUALS:
-				if self.current == TT.WORD:
+			if self.next_typ is TT.EQUALS:
+				if self.typ is TT.WORD:
 					variable = self.adv()
-					self.adv()# name = expression
+					self.skip()# name = expression
 					value = self.parse_expression()
 					if value is None: return None
 					return nodes.VariableSave(variable,value, Place(variable.place.start, value.place.end))
-		if self.current == TT.LEFT_SQUARE_BRACKET:
-			start_loc = self.adv().place.start
+		if self.typ is TT.LEFT_SQUARE_BRACKET:
+			start_loc = self.adv_place().start
 			times = self.parse_expression()
-			if self.current != TT.RIGHT_SQUARE_BRACKET:
-				self.config.errors.add_error(ET.DECLARATION_BRACKET, self.current.place, "expected ']'")
+			if self.typ is not TT.RIGHT_SQUARE_BRACKET:
+				self.config.errors.add_error(ET.DECLARATION_BRACKET, self.place, "expected ']'")
 			else:
-				self.adv()
+				self.skip()
 			var = self.parse_typed_variable()
 			if var is None: return None
 			return nodes.Declaration(var,times, Place(start_loc, var.place.end))
-		if self.current.equals(TT.KEYWORD, 'if'):
+		if self.equals(TT.KEYWORD, 'if'):
 			return self.parse_if()
-		if self.current.equals(TT.KEYWORD, 'set'):
-			start_loc = self.adv().place.start
-			if self.current != TT.WORD:
-				self.config.errors.add_error(ET.SET_NAME, self.current.place, "expected name after keyword 'set'")
+		if self.equals(TT.KEYWORD, 'set'):
+			start_loc = self.adv_place().start
+			if self.typ is not TT.WORD:
+				self.config.errors.add_error(ET.SET_NAME, self.place, "expected name after keyword 'set'")
 				return None
 			name = self.adv()
-			if self.current != TT.EQUALS:
-				self.config.errors.add_error(ET.SET_EQUALS, self.current.place, "expected '=' after name and keyword 'set'")
+			if self.typ is not TT.EQUALS:
+				self.config.errors.add_error(ET.SET_EQUALS, self.place, "expected '=' after name and keyword 'set'")
 			else:
-				self.adv()
+				self.skip()
 			expr = self.parse_expression()
 			if expr is None: return None
 			return nodes.Set(name,expr, Place(start_loc, expr.place.end))
-		if self.current.equals(TT.KEYWORD, 'while'):
+		if self.equals(TT.KEYWORD, 'while'):
 			return self.parse_while()
-		if self.current.equals(TT.KEYWORD, 'match'):
-			self.adv()
+		if self.equals(TT.KEYWORD, 'match'):
+			self.skip()
 			value = self.parse_expression()
 			if value is None: return None
-			if not self.current.equals(TT.KEYWORD, 'as'):
-				self.config.errors.add_error(ET.MATCH_AS, self.current.place, "expected 'as' after expression")
+			if not self.equals(TT.KEYWORD, 'as'):
+				self.config.errors.add_error(ET.MATCH_AS, self.place, "expected 'as' after expression")
 			else:
-				self.adv()
-			if self.current != TT.WORD:
-				self.config.errors.add_error(ET.MATCH_NAME, self.current.place, "expected name after 'as'")
+				self.skip()
+			if self.typ is not TT.WORD:
+				self.config.errors.add_error(ET.MATCH_NAME, self.place, "expected name after 'as'")
 				return None
 			name = self.adv()
 			default:None|nodes.Code = None
@@ -426,28 +470,28 @@ class Parser:
 				else:
 					assert False, "unreachable"
 			return nodes.Match(value, name, tuple(cases), default, place)
-		if self.current.equals(TT.KEYWORD, 'return'):
-			start_loc = self.adv().place.start
+		if self.equals(TT.KEYWORD, 'return'):
+			start_loc = self.adv_place().start
 			expr = self.parse_expression()
 			if expr is None: return None
 			return nodes.Return(expr, Place(start_loc, expr.place.end))
-		if self.current.equals(TT.KEYWORD, 'assert'):
-			start_loc = self.adv().place.start
+		if self.equals(TT.KEYWORD, 'assert'):
+			start_loc = self.adv_place().start
 			value = self.parse_expression()
 			if value is None: return None
-			if self.current != TT.COMMA:
-				self.config.errors.add_error(ET.ASSERT_COMMA, self.current.place, "expected ',' after expression in assert statement")
+			if self.typ is not TT.COMMA:
+				self.config.errors.add_error(ET.ASSERT_COMMA, self.place, "expected ',' after expression in assert statement")
 			else:
-				self.adv()
+				self.skip()
 			explanation = self.parse_expression()
 			if explanation is None: return None
 			return nodes.Assert(value, explanation, Place(start_loc, explanation.place.end))
-		if self.current.equals(TT.KEYWORD, 'fun'):
+		if self.equals(TT.KEYWORD, 'fun'):
 			return self.parse_fun(False)
 		expr = self.parse_expression()
 		if expr is None: return None
-		if self.current == TT.EQUALS:
-			self.adv()
+		if self.typ is TT.EQUALS:
+			self.skip()
 			value = self.parse_expression()
 			if value is None: return None
 			return nodes.Save(expr, value, Place(expr.place.start, value.place.end))
@@ -455,324 +499,285 @@ class Parser:
 	def parse_match_statement(self) -> 'nodes.Code|nodes.Case|None':
 		case:None|Token=None
 
-		if self.current.equals(TT.KEYWORD, 'default'):
-			self.adv()
+		if self.equals(TT.KEYWORD, 'default'):
+			self.skip()
 		else:
-			if self.current != TT.WORD:
-				self.config.errors.add_error(ET.MATCH_CASE_NAME, self.adv().place, "expected case name to match")
+			if self.typ is not TT.WORD:
+				self.config.errors.add_error(ET.MATCH_CASE_NAME, self.adv_place(), "expected case name to match")
 				return None
 			case = self.adv()
-		if self.current != TT.ARROW:
-			self.config.errors.add_error(ET.MATCH_ARROW, self.current.place, "expected '->' after case")
+		if self.typ is not TT.ARROW:
+			self.config.errors.add_error(ET.MATCH_ARROW, self.place, "expected '->' after case")
 		else:
-			self.adv()
+			self.skip()
 		code = self.parse_code_block()
 		if case is None:
 			return code
 		return nodes.Case(case, code, Place(case.place.start, code.place.end))
 	def parse_if(self) -> nodes.If|None:
-		start_loc = self.adv().place.start
+		start_loc = self.adv_place().start
 		condition = self.parse_expression()
 		if condition is None: return None
 		if_code = self.parse_code_block()
-		if self.current.equals(TT.KEYWORD, 'elif'):
+		if self.equals(TT.KEYWORD, 'elif'):
 			else_block = self.parse_if()
 			if else_block is None: return None
 			return nodes.If(condition, if_code, else_block, Place(start_loc, else_block.place.end))
-		if self.current.equals(TT.KEYWORD, 'else'):
-			self.adv()
+		if self.equals(TT.KEYWORD, 'else'):
+			self.skip()
 			else_code = self.parse_code_block()
 			return nodes.If(condition, if_code, else_code, Place(start_loc, else_code.place.end))
 		return nodes.If(condition, if_code, None, Place(start_loc, if_code.place.end))
 	def parse_while(self) -> nodes.While|None:
-		start_loc = self.adv().place.start
+		start_loc = self.adv_place().start
 		condition = self.parse_expression()
 		if condition is None: return None
 		code = self.parse_code_block()
 		return nodes.While(condition, code, Place(start_loc, code.place.end))
 	def parse_typed_variable(self) -> nodes.TypedVariable|None:
-		if self.current != TT.WORD:
-			self.config.errors.add_error(ET.TYPED_VAR_NAME, self.current.place, "expected variable name in typed variable")
+		if self.typ is not TT.WORD:
+			self.config.errors.add_error(ET.TYPED_VAR_NAME, self.place, "expected variable name in typed variable")
 			return None
 		name = self.adv()
-		if self.current.typ != TT.COLON:
-			self.config.errors.add_error(ET.COLON, self.current.place, "expected colon ':'")
+		if self.typ is not TT.COLON:
+			self.config.errors.add_error(ET.COLON, self.place, "expected colon ':'")
 		else:
-			self.adv()#type
+			self.skip()#type
 		ty = self.parse_type()
 		if ty is None: return None
 
 		return nodes.TypedVariable(name, ty, Place(name.place.start, ty.place.end))
 	def parse_type(self) -> Node|None:
-		if self.current == TT.WORD:
+		if self.typ is TT.WORD:
 			name = self.adv()
 			return nodes.TypeReference(name, name.place)
-		elif self.current == TT.LEFT_SQUARE_BRACKET:#array
-			start_loc = self.adv().place.start
-			if self.current == TT.RIGHT_SQUARE_BRACKET:
+		elif self.typ is TT.LEFT_SQUARE_BRACKET:#array
+			start_loc = self.adv_place().start
+			if self.typ is TT.RIGHT_SQUARE_BRACKET:
 				size = 0
 			else:
 				cte = self.parse_CTE()
 				if cte is None: return None
 				size,_ = cte
-			if self.current != TT.RIGHT_SQUARE_BRACKET:
-				self.config.errors.add_error(ET.ARRAY_BRACKET, self.current.place, "expected ']', '[' was opened and never closed")
+			if self.typ is not TT.RIGHT_SQUARE_BRACKET:
+				self.config.errors.add_error(ET.ARRAY_BRACKET, self.place, "expected ']', '[' was opened and never closed")
 			else:
-				self.adv()
+				self.skip()
 			typ = self.parse_type()
 			if typ is None: return None
 			return nodes.TypeArray(typ,size,Place(start_loc,typ.place.end))
-		elif self.current.typ == TT.LEFT_PARENTHESIS:
-			start_loc = self.adv().place.start
+		elif self.typ is TT.LEFT_PARENTHESIS:
+			start_loc = self.adv_place().start
 			input_types:list[Node] = []
-			while self.current != TT.RIGHT_PARENTHESIS and self.next is not None:
+			while self.typ is not TT.RIGHT_PARENTHESIS and self.next_typ is not None:
 				typ = self.parse_type()
 				if typ is None:return None
 				input_types.append(typ)
-				if self.current == TT.RIGHT_PARENTHESIS:
+				if self.typ is TT.RIGHT_PARENTHESIS:
 					break
-				if self.current != TT.COMMA:
-					self.config.errors.add_error(ET.FUN_TYP_COMMA, self.current.place, "expected ',' or ')'")
+				if self.typ is not TT.COMMA:
+					self.config.errors.add_error(ET.FUN_TYP_COMMA, self.place, "expected ',' or ')'")
 				else:
-					self.adv()
-			self.adv()
-			if self.current.typ != TT.ARROW: # provided any output types
-				self.config.errors.add_error(ET.FUNCTION_TYPE_ARROW, self.current.place, "expected '->'")
+					self.skip()
+			self.skip()
+			if self.typ is not TT.ARROW: # provided any output types
+				self.config.errors.add_error(ET.FUNCTION_TYPE_ARROW, self.place, "expected '->'")
 			else:
-				self.adv()
+				self.skip()
 			ret_typ = self.parse_type()
 			if ret_typ is None:return None
 			return nodes.TypeFun(tuple(input_types),ret_typ,Place(start_loc,ret_typ.place.end))
-		elif self.current == TT.ASTERISK:
-			start_loc = self.adv().place.start
+		elif self.typ is TT.ASTERISK:
+			start_loc = self.adv_place().start
 			typ = self.parse_type()
 			if typ is None:return None
 			return nodes.TypePointer(typ,Place(start_loc,typ.place.end))
 		else:
-			self.config.errors.add_error(ET.TYPE, self.adv().place, "unrecognized type")
+			self.config.errors.add_error(ET.TYPE, self.adv_place(), "unrecognized type")
 			return None
 
-	def parse_expression(self) -> 'Node|None':
-		return self.parse_exp0()
 	T = TypeVar('T')
 	def block_parse_helper(
 		self,
 		parse_statement:Callable[[], T|None]
 			) -> tuple[tuple[T, ...],Place]:
-		start_loc = self.current.place.start
-		if self.current.typ != TT.LEFT_CURLY_BRACKET:
-			self.config.errors.add_error(ET.BLOCK_START, self.current.place, f"expected block starting with '{{'")
+		start_loc = self.place.start
+		if self.typ is not TT.LEFT_CURLY_BRACKET:
+			self.config.errors.add_error(ET.BLOCK_START, self.place, f"expected block starting with '{{'")
 		else:
-			self.adv()
+			self.skip()
 		statements = []
-		while self.current.typ == TT.NEWLINE and self.next is not None:
-			self.adv()
-		while self.current != TT.RIGHT_CURLY_BRACKET and self.next is not None:
+		while self.typ is TT.NEWLINE and self.next_typ is not None:
+			self.skip()
+		while self.typ is not TT.RIGHT_CURLY_BRACKET and self.next_typ is not None:
 			statement = parse_statement()
 			if statement is not None:
 				statements.append(statement)
-			if self.current == TT.RIGHT_CURLY_BRACKET:
+			if self.typ is TT.RIGHT_CURLY_BRACKET:
 				break
-			if self.current.typ != TT.NEWLINE:
-				self.config.errors.add_error(ET.NEWLINE, self.current.place, f"expected newline or '}}'")
-			while self.current.typ == TT.NEWLINE and self.next is not None:
-				self.adv()
-		end_loc = self.adv().place.end
+			if self.typ is not TT.NEWLINE:
+				self.config.errors.add_error(ET.NEWLINE, self.place, f"expected newline or '}}'")
+			while self.typ is TT.NEWLINE and self.next_typ is not None:
+				self.skip()
+		end_loc = self.adv_place().end
 		return tuple(statements), Place(start_loc, end_loc)
-	def bin_exp_parse_helper(
-		self,
-		next_exp:Callable[[], Node|None],
-		operations:list[TT]
-			) -> Node|None:
-		left = next_exp()
-		if left is None:return None
-		while self.current.typ in operations and self.next is not None:
-			op_token = self.adv()
-			right = next_exp()
-			if right is None:return None
-			left = nodes.BinaryOperation(left, op_token, right, Place(left.place.start, right.place.end))
-		return left
-
-	def parse_exp0(self) -> 'Node|None':
-		next_exp = self.parse_exp1
-		operations = [
-			'or',
-			'xor',
-			'and',
-		]
-		left = next_exp()
-		if left is None:return None
-		while self.current == TT.KEYWORD and self.current.operand in operations and self.next is not None:
-			op_token = self.adv()
-			right = next_exp()
-			if right is None:return None
-			left = nodes.BinaryOperation(left, op_token, right, Place(left.place.start, right.place.end))
-		return left
-
-	def parse_exp1(self) -> 'Node|None':
-		next_exp = self.parse_exp2
-		return self.bin_exp_parse_helper(next_exp, [
-			TT.LESS,
-			TT.GREATER,
-			TT.DOUBLE_EQUALS,
-			TT.NOT_EQUALS,
-			TT.LESS_OR_EQUAL,
-			TT.GREATER_OR_EQUAL,
-		])
-
-	def parse_exp2(self) -> 'Node|None':
-		next_exp = self.parse_exp3
-		return self.bin_exp_parse_helper(next_exp, [
-			TT.PLUS,
-			TT.MINUS,
-		])
-	def parse_exp3(self) -> 'Node|None':
-		next_exp = self.parse_exp4
-		return self.bin_exp_parse_helper(next_exp, [
-			TT.DOUBLE_SLASH,
-			TT.ASTERISK,
-		])
-	def parse_exp4(self) -> 'Node|None':
-		next_exp = self.parse_exp5
-		return self.bin_exp_parse_helper(next_exp, [
-			TT.DOUBLE_GREATER,
-			TT.DOUBLE_LESS,
-			TT.PERCENT,
-		])
-	def parse_exp5(self) -> 'Node|None':
-		self_exp = self.parse_exp5
-		next_exp = self.parse_exp6
-		operations = (
-			TT.NOT,
-			TT.AT,
-		)
-		if self.current.typ in operations:
-			op_token = self.adv()
-			right = self_exp()
-			if right is None: return None
-			return nodes.UnaryExpression(op_token, right, Place(op_token.place.start, right.place.end))
-		return next_exp()
-
-	def parse_exp6(self) -> 'Node|None':
+	def parse_expression(self) -> 'Node|None':
+		"""operator precedence parsing of binary operations with a stack of pending operators"""
+		operand = self.parse_unary()
+		if operand is None: return None
+		operands:list[Node] = [operand]
+		operators:list[tuple[Token,int]] = []
+		while self.next_typ is not None:
+			if self.typ is TT.KEYWORD:
+				binding_power = KEYWORD_BINDING_POWERS.get(self.operand, 0)
+			else:
+				binding_power = BINDING_POWERS.get(self.typ, 0)
+			if binding_power == 0:
+				break
+			while len(operators) != 0 and operators[-1][1] >= binding_power:
+				self.reduce_binary_operation(operands, operators)
+			operators.append((self.adv(), binding_power))
+			operand = self.parse_unary()
+			if operand is None: return None
+			operands.append(operand)
+		while len(operators) != 0:
+			self.reduce_binary_operation(operands, operators)
+		return operands[0]
+	@staticmethod
+	def reduce_binary_operation(operands:list[Node], operators:list[tuple[Token,int]]) -> None:
+		op_token, _ = operators.pop()
+		right = operands.pop()
+		left = operands.pop()
+		operands.append(nodes.BinaryOperation(left, op_token, right, Place(left.place.start, right.place.end)))
+	def parse_unary(self) -> 'Node|None':
+		op_tokens:list[Token] = []
+		while self.typ is TT.NOT or self.typ is TT.AT:
+			op_tokens.append(self.adv())
+		right = self.parse_postfix()
+		if right is None: return None
+		for op_token in reversed(op_tokens):
+			right = nodes.UnaryExpression(op_token, right, Place(op_token.place.start, right.place.end))
+		return right
+	def parse_postfix(self) -> 'Node|None':
 		next_exp = self.parse_term
 		left = next_exp()
 		if left is None: return None
-		while self.current.typ in (TT.DOT,TT.LEFT_SQUARE_BRACKET, TT.LEFT_PARENTHESIS, TT.NO_MIDDLE_TEMPLATE, TT.TEMPLATE_HEAD) and self.next is not None:
-			if self.current == TT.DOT:
-				self.adv()
-				if self.current != TT.WORD:
-					self.config.errors.add_error(ET.FIELD_NAME, self.current.place, "expected word after '.'")
+		while self.typ in (TT.DOT,TT.LEFT_SQUARE_BRACKET, TT.LEFT_PARENTHESIS, TT.NO_MIDDLE_TEMPLATE, TT.TEMPLATE_HEAD) and self.next_typ is not None:
+			if self.typ is TT.DOT:
+				self.skip()
+				if self.typ is not TT.WORD:
+					self.config.errors.add_error(ET.FIELD_NAME, self.place, "expected word after '.'")
 				else:
 					access = self.adv()
 					left = nodes.Dot(left, access, Place(left.place.start, access.place.end))
-			elif self.current == TT.LEFT_SQUARE_BRACKET:
-				start_loc = self.adv().place.start
+			elif self.typ is TT.LEFT_SQUARE_BRACKET:
+				start_loc = self.adv_place().start
 				subscripts:list[Node] = []
-				while self.current.typ != TT.RIGHT_SQUARE_BRACKET and self.next is not None:
+				while self.typ is not TT.RIGHT_SQUARE_BRACKET and self.next_typ is not None:
 					r = self.parse_expression()
 					if r is not None:
 						subscripts.append(r)
-					if self.current.typ == TT.RIGHT_SQUARE_BRACKET:
+					if self.typ is TT.RIGHT_SQUARE_BRACKET:
 						break
-					if self.current.typ != TT.COMMA:
-						self.config.errors.add_error(ET.SUBSCRIPT_COMMA, self.current.place, "expected ',' or ']'")
+					if self.typ is not TT.COMMA:
+						self.config.errors.add_error(ET.SUBSCRIPT_COMMA, self.place, "expected ',' or ']'")
 					else:
-						self.adv()
-				end_loc = self.adv().place.end
+						self.skip()
+				end_loc = self.adv_place().end
 				left = nodes.Subscript(left, tuple(subscripts), Place(start_loc, end_loc), Place(left.place.start, end_loc))
-			elif self.current == TT.LEFT_PARENTHESIS:
-				start_loc = self.adv().place.start
+			elif self.typ is TT.LEFT_PARENTHESIS:
+				start_loc = self.adv_place().start
 				args:list[Node] = []
-				while self.current.typ != TT.RIGHT_PARENTHESIS and self.next is not None:
+				while self.typ is not TT.RIGHT_PARENTHESIS and self.next_typ is not None:
 					r = self.parse_expression()
 					if r is not None:
 						args.append(r)
-					if self.current.typ == TT.RIGHT_PARENTHESIS:
+					if self.typ is TT.RIGHT_PARENTHESIS:
 						break
-					if self.current.typ != TT.COMMA:
-						self.config.errors.add_error(ET.CALL_COMMA, self.current.place, "expected ',' or ')'")
+					if self.typ is not TT.COMMA:
+						self.config.errors.add_error(ET.CALL_COMMA, self.place, "expected ',' or ')'")
 					else:
-						self.adv()
-				end_loc = self.adv().place.end
+						self.skip()
+				end_loc = self.adv_place().end
 				left = nodes.Call(left, tuple(args), Place(start_loc, end_loc), Place(left.place.start, end_loc))
-			elif self.current.typ in (TT.NO_MIDDLE_TEMPLATE, TT.TEMPLATE_HEAD):
+			elif self.typ in (TT.NO_MIDDLE_TEMPLATE, TT.TEMPLATE_HEAD):
 				left = self.parse_template_string_helper(left)
 				if left is None: return None
 		return left
 	def parse_reference(self) -> nodes.ReferTo|None:
-		if self.current != TT.WORD:
-			self.config.errors.add_error(ET.WORD_REF, self.current.place, "expected a word to refer to")
+		if self.typ is not TT.WORD:
+			self.config.errors.add_error(ET.WORD_REF, self.place, "expected a word to refer to")
 			return None
 		name = self.adv()
 		return nodes.ReferTo(name, name.place)
 	def parse_term(self) -> 'Node|None':
-		if self.current == TT.STR:     return nodes.Str     (self.current, self.adv().place)
-		if self.current == TT.INT:     return nodes.Int     (self.current, self.adv().place)
-		if self.current == TT.SHORT:   return nodes.Short   (self.current, self.adv().place)
-		if self.current == TT.CHAR_STR:return nodes.CharStr (self.current, self.adv().place)
-		if self.current == TT.CHAR_NUM:return nodes.CharNum (self.current, self.adv().place)
-		if self.current == TT.KEYWORD and self.current.operand in ('False','True','Null','Argv','Argc','Void'):
-			return nodes.Constant(self.current, self.adv().place)
-		elif self.current.typ == TT.LEFT_PARENTHESIS:
-			self.adv()
+		if self.typ is TT.STR:     return nodes.Str     (self.current, self.adv_place())
+		if self.typ is TT.INT:     return nodes.Int     (self.current, self.adv_place())
+		if self.typ is TT.SHORT:   return nodes.Short   (self.current, self.adv_place())
+		if self.typ is TT.CHAR_STR:return nodes.CharStr (self.current, self.adv_place())
+		if self.typ is TT.CHAR_NUM:return nodes.CharNum (self.current, self.adv_place())
+		if self.typ is TT.KEYWORD and self.operand in ('False','True','Null','Argv','Argc','Void'):
+			return nodes.Constant(self.current, self.adv_place())
+		elif self.typ is TT.LEFT_PARENTHESIS:
+			self.skip()
 			expr = self.parse_expression()
-			if self.current.typ != TT.RIGHT_PARENTHESIS:
-				self.config.errors.add_error(ET.EXPR_PAREN, self.current.place, "expected ')'")
+			if self.typ is not TT.RIGHT_PARENTHESIS:
+				self.config.errors.add_error(ET.EXPR_PAREN, self.place, "expected ')'")
 			else:
-				self.adv()
+				self.skip()
 			return expr
-		elif self.current == TT.WORD: #name
+		elif self.typ is TT.WORD: #name
 			return self.parse_reference()
-		elif self.current == TT.DOLLAR:# cast
-			start_loc = self.adv().place.start
+		elif self.typ is TT.DOLLAR:# cast
+			start_loc = self.adv_place().start
 			def err() -> None:
-				self.config.errors.add_error(ET.CAST_RPAREN, self.current.place, "expected ')' after expression in cast")
+				self.config.errors.add_error(ET.CAST_RPAREN, self.place, "expected ')' after expression in cast")
 
-			if self.current == TT.LEFT_PARENTHESIS:#the sneaky str conversion
-				self.adv()
+			if self.typ is TT.LEFT_PARENTHESIS:#the sneaky str conversion
+				self.skip()
 				length = self.parse_expression()
 				if length is None: return None
-				if self.current != TT.COMMA:
-					self.config.errors.add_error(ET.CAST_COMMA, self.current.place, "expected ',' in str conversion")
+				if self.typ is not TT.COMMA:
+					self.config.errors.add_error(ET.CAST_COMMA, self.place, "expected ',' in str conversion")
 				else:
-					self.adv()
+					self.skip()
 				pointer = self.parse_expression()
 				if pointer is None: return None
-				if self.current == TT.COMMA:self.adv()
-				end_loc = self.current.place.end
-				if self.current != TT.RIGHT_PARENTHESIS:
+				if self.typ is TT.COMMA:self.skip()
+				end_loc = self.place.end
+				if self.typ is not TT.RIGHT_PARENTHESIS:
 					err()
 				else:
-					end_loc = self.adv().place.end
+					end_loc = self.adv_place().end
 				return nodes.StrCast(length,pointer, Place(start_loc, end_loc))
 			ty = self.parse_type()
 			if ty is None:return None
-			if self.current.typ != TT.LEFT_PARENTHESIS:
-				self.config.errors.add_error(ET.CAST_LPAREN, self.current.place, "expected '(' after type in cast")
+			if self.typ is not TT.LEFT_PARENTHESIS:
+				self.config.errors.add_error(ET.CAST_LPAREN, self.place, "expected '(' after type in cast")
 			else:
-				self.adv()
+				self.skip()
 			expr = self.parse_expression()
 			if expr is None: return None
-			end_loc = self.current.place.end
-			if self.current.typ != TT.RIGHT_PARENTHESIS:
+			end_loc = self.place.end
+			if self.typ is not TT.RIGHT_PARENTHESIS:
 				err()
 			else:
-				end_loc = self.adv().place.end
+				end_loc = self.adv_place().end
 			return nodes.Cast(ty,expr, Place(start_loc, end_loc))
-		elif self.current.typ in (TT.NO_MIDDLE_TEMPLATE, TT.TEMPLATE_HEAD):
+		elif self.typ in (TT.NO_MIDDLE_TEMPLATE, TT.TEMPLATE_HEAD):
 			return self.parse_template_string_helper(None)
 		else:
-			self.config.errors.add_error(ET.TERM, self.adv().place, "unrecognized term")
+			self.config.errors.add_error(ET.TERM, self.adv_place(), "unrecognized term")
 			return None
 	def parse_template_string_helper(self, formatter:None|Node) -> nodes.Template|None:
-		if self.current == TT.TEMPLATE_HEAD:
+		if self.typ is TT.TEMPLATE_HEAD:
 			strings = [self.adv()]
 			r = self.parse_expression()
 			if r is None: return None
 			values = [r]
-			while self.current.typ != TT.TEMPLATE_TAIL and self.next is not None:
-				if self.current.typ != TT.TEMPLATE_MIDDLE:
-					self.config.errors.add_error(ET.TEMPLATE_R_CURLY, self.current.place, "expected '}'")
+			while self.typ is not TT.TEMPLATE_TAIL and self.next_typ is not None:
+				if self.typ is not TT.TEMPLATE_MIDDLE:
+					self.config.errors.add_error(ET.TEMPLATE_R_CURLY, self.place, "expected '}'")
 				else:
 					strings.append(self.adv())
 				r = self.parse_expression()
@@ -780,7 +785,7 @@ class Parser:
 				values.append(r)
 			strings.append(self.adv())
 			return nodes.Template(formatter, tuple(strings), tuple(values), Place(strings[0].place.start, strings[-1].place.end))
-		elif self.current == TT.NO_MIDDLE_TEMPLATE:
-			return nodes.Template(formatter, (self.current,), (), self.adv().place)
+		elif self.typ is TT.NO_MIDDLE_TEMPLATE:
+			return nodes.Template(formatter, (self.current,), (), self.adv_place())
 		else:
 			assert False, "function above did not check for existing of template"
@@ -1,10 +1,10 @@
-from .core import ET, Error, ErrorBin, ErrorExit, NEWLINE, Loc, Config, get_id, id_counter, process_cmd_args, extract_file_text_from_file_path, DIGITS, DIGITS_HEX, DIGITS_BIN, DIGITS_OCTAL, JARARACA_PATH, KEYWORDS, WHITESPACE, WORD_FIRST_CHAR_ALPHABET, WORD_ALPHABET, ESCAPE_TO_CHARS, CHARS_TO_ESCAPE, BUILTIN_WORDS, escape, pack_directory, DEFAULT_TEMPLATE_STRING_FORMATTER, CHAR_TO_STR_CONVERTER, INT_TO_STR_CONVERTER, Place, MAIN_MODULE_PATH, STRING_MULTIPLICATION, BOOL_TO_STR_CONVERTER, ASSERT_FAILURE_HANDLER,STRING_ADDITION
-from .token import TT, Token
+from .core import ET, Error, ErrorBin, ErrorExit, NEWLINE, Scope, PacketRegistry, packets, LineIndex, Loc, index_lines, get_line_index, Config, get_id, pool_context, Retained, CompilationSession, RETAINED_MODULES, process_cmd_args, extract_file_text_from_file_path, DIGITS, DIGITS_HEX, DIGITS_BIN, DIGITS_OCTAL, JARARACA_PATH, KEYWORDS, WHITESPACE, WORD_FIRST_CHAR_ALPHABET, WORD_ALPHABET, ESCAPE_TO_CHARS, CHARS_TO_ESCAPE, BUILTIN_WORDS, escape, pack_directory, DEFAULT_TEMPLATE_STRING_FORMATTER, CHAR_TO_STR_CONVERTER, INT_TO_STR_CONVERTER, Place, MAIN_MODULE_PATH, SERVER_SOCKET_PATH, VALUE_FLAGS, STRING_MULTIPLICATION, BOOL_TO_STR_CONVERTER, ASSERT_FAILURE_HANDLER,STRING_ADDITION
+from .token import TT, TT_BY_CODE, Token, TokenStore
 from . import nodes
 from .nodes import Node
 from . import type as types
 from .type import Type
-from .run import run_assembler, run_command, replace_self
+from .run import run_assembler, run_toolchain, run_separately, tool_stamp, ToolchainInput, run_command, replace_self
 __all__ = [
 	#constants
 	"DIGITS",
@@ -24,18 +24,27 @@ __all__ = [
 	"CHAR_TO_STR_CONVERTER",
 	"INT_TO_STR_CONVERTER",
 	"MAIN_MODULE_PATH",
+	"SERVER_SOCKET_PATH",
+	"VALUE_FLAGS",
 	"STRING_MULTIPLICATION",
     "STRING_ADDITION",
 	"BOOL_TO_STR_CONVERTER",
 	"ASSERT_FAILURE_HANDLER",
+	"RETAINED_MODULES",
+	"TT_BY_CODE",
 	#classes
 	"Node",
 	"nodes",
 	"TT",
 	"Token",
+	"TokenStore",
+	"Scope",
+	"PacketRegistry",
 	"Loc",
 	"Place",
 	"Config",
+	"CompilationSession",
+	"Retained",
 	"ET",
 	"Error",
 	"ErrorBin",
@@ -44,12 +53,17 @@ __all__ = [
 	'Type',
 	'types',
 	#id
-	"id_counter",
 	"get_id",
 	#functions
+	"pool_context",
 	"escape",
 	"pack_directory",
+	"packets",
 	"run_assembler",
+	"run_toolchain",
+	"run_separately",
+	"tool_stamp",
+	"ToolchainInput",
 	"run_command",
 	"replace_self",
 	"process_cmd_args",
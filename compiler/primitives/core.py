@@ -1,9 +1,16 @@
+from array import array
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from enum import Enum, auto
 import os
+import re
 import sys
-from typing import Callable, NoReturn
+from typing import TYPE_CHECKING, Any, Callable, Iterator, NoReturn, TypeVar
 import itertools
+import multiprocessing
+import threading
+if TYPE_CHECKING:
+	from .nodes import Module
 __all__ = (
 	#constants
 	"BOOL_TO_STR_CONVERTER",
@@ -25,14 +32,23 @@ __all__ = (
 	"WORD_ALPHABET",
 	"WORD_FIRST_CHAR_ALPHABET",
 	'BUILTIN_WORDS',
-	"id_counter",
+	"RETAINED_MODULES",
 	#functions
 	"get_id",
 	"escape",
 	"process_cmd_args",
 	"extract_file_text_from_file_path",
 	"pack_directory",
+	"index_lines",
+	"packets",
+	"get_line_index",
+	"pool_context",
 	#classes
+	"Scope",
+	"Retained",
+	"CompilationSession",
+	"PacketRegistry",
+	"LineIndex",
 	"Loc",
 	"Config",
 	"ET",
@@ -161,18 +177,168 @@ DIGITS_OCTAL  = "01234567"
 WORD_FIRST_CHAR_ALPHABET = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_"
 WORD_ALPHABET = WORD_FIRST_CHAR_ALPHABET+DIGITS
 
-id_counter = itertools.count()
-get_id:Callable[[], int] = lambda:next(id_counter)
+PARALLEL_LEX_SIZE = 256*1024
+PARALLEL_PARSE_MODULES = 32
+PARALLEL_CHECK_MODULES = 32
+DEFAULT_CACHE_DIR = os.path.join(JARARACA_PATH, 'cache')
+SERVER_SOCKET_PATH = os.path.join(DEFAULT_CACHE_DIR, 'server.sock')# jararaca.py has the same path
+TOOLCHAINS = ('opt', 'clang', 'lli')# first is default
+SEPARATE_TOOLCHAINS = ('clang',)# that compile modules into object files, with --separate first is default
+RETAINED_MODULES = 256
+SESSION_IDS = 1<<40# every session takes a range of uids this big
+session_ids = itertools.count(0, SESSION_IDS)
 
 
+K = TypeVar('K')
+V = TypeVar('V')
+UNSET = object()
+class Scope(dict[K, V]):
+	"""dict of names with nested scopes: names, set after push, are forgotten (or get their outer values back) on pop.
+	Every set inside of a scope remembers the previous value, so push is O(1), pop is O(names set in the scope),
+	and lookups are plain dict lookups, no matter how many names are visible"""
+	__slots__ = ('trail', 'marks')
+	def __init__(self) -> None:
+		super().__init__()
+		self.trail:list[tuple[K, object]] = []
+		self.marks:list[int] = []
+	def __setitem__(self, key:K, value:V) -> None:
+		if len(self.marks) != 0:
+			self.trail.append((key, self.get(key, UNSET)))
+		super().__setitem__(key, value)
+	def push(self) -> None:
+		self.marks.append(len(self.trail))
+	def pop(self) -> None:
+		mark = self.marks.pop()
+		while len(self.trail) > mark:
+			key, value = self.trail.pop()
+			if value is UNSET:
+				super().__delitem__(key)
+			else:
+				super().__setitem__(key, value)# type: ignore[arg-type]
+
+class Retained(dict[K, V]):
+	"""dict, that keeps at most `limit` items: storing more evicts the least recently stored or used one"""
+	__slots__ = ('limit',)
+	def __init__(self, limit:int) -> None:
+		super().__init__()
+		self.limit = limit
+	def __setitem__(self, key:K, value:V) -> None:
+		self.pop(key, None)
+		super().__setitem__(key, value)
+		if len(self) > self.limit:
+			del self[next(iter(self))]
+	def use(self, key:K) -> V|None:
+		value = self.pop(key, None)
+		if value is not None:
+			super().__setitem__(key, value)
+		return value
+
+class CompilationSession:
+	"""state of compilations, that run one after another: modules of the current compilation,
+	and modules, that later compilations reuse if they did not change (at most `retained_modules` of each kind).
+	Sessions share nothing, so compilations can run at the same time in different threads, each in it's own session.
+	Nodes, created while session is active in a thread (`with session:`), get uids from it's own range, locations are looked up in it's line indexes"""
+	__slots__ = ('ids', 'outer', 'retained_modules', 'parsed_modules', 'import_stack', 'checkers', 'generators', 'module_files', 'module_dependencies', 'remembered_modules', 'checked_modules', 'generated_modules', 'line_indexes', 'file_hashes', 'fingerprint', 'graph')
+	def __init__(self, retained_modules:int = RETAINED_MODULES) -> None:
+		self.ids = itertools.count(next(session_ids))
+		self.outer:list[CompilationSession] = []
+		self.retained_modules = retained_modules
+		#current compilation
+		self.parsed_modules:'dict[str, Module]' = {}
+		self.import_stack:list[str] = []
+		self.checkers:dict[str, Any] = {}# module path -> TypeChecker or ModuleInterface
+		self.generators:dict[str, Any] = {}# module path -> GenerateAssembly
+		self.graph:tuple[str, Any]|None = None# main file and it's import graph, scanned once per compilation, see utils.py
+		#later compilations
+		self.module_files:dict[str, str] = {}# module path -> file path, of every extracted module
+		self.module_dependencies:dict[str, tuple[tuple[str, str, str], ...]] = {}# module path -> every module it depends on, directly or not
+		self.remembered_modules:Retained[tuple[str, str], Any] = Retained(retained_modules)# see cache.py
+		self.checked_modules:Retained[str, Any] = Retained(retained_modules)# see type_checker.py
+		self.generated_modules:Retained[str, Any] = Retained(retained_modules)# see llvm_generator.py
+		self.line_indexes:Retained[str, LineIndex] = Retained(retained_modules)# file path -> line index of it's text
+		self.file_hashes:Retained[str, tuple[int, int, str]] = Retained(retained_modules)# file path -> modification time, size and hash of it's content, see cache.py
+		self.fingerprint:tuple[str, str]|None = None# packets and fingerprint of the compiler with them, see cache.py
+	def begin(self) -> None:
+		"""forget modules of the previous compilation, what later compilations reuse is kept"""
+		self.parsed_modules.clear()
+		self.import_stack.clear()
+		self.checkers.clear()
+		self.generators.clear()
+	def forget(self) -> None:
+		"""forget everything, next compilation starts from scratch"""
+		self.begin()
+		self.module_files.clear()
+		self.module_dependencies.clear()
+		self.remembered_modules.clear()
+		self.checked_modules.clear()
+		self.generated_modules.clear()
+		self.line_indexes.clear()
+		self.file_hashes.clear()
+		self.fingerprint = None
+		self.graph = None
+	def __enter__(self) -> 'CompilationSession':
+		self.outer.append(active.session)
+		active.session, active.counter = self, self.ids
+		return self
+	def __exit__(self, *_:object) -> None:
+		outer = self.outer.pop()
+		active.session, active.counter = outer, outer.ids
+	def __reduce__(self) -> tuple[Any, ...]:
+		return CompilationSession, (self.retained_modules,)# other processes start with an empty session
+
+default_session = CompilationSession()# of configs, that were not given a session
+class ActiveSession(threading.local):
+	"""session, that is active in the thread, or the default session. Uids come from it's counter"""
+	def __init__(self) -> None:
+		self.session = default_session
+		self.counter:Iterator[int] = default_session.ids
+active = ActiveSession()
+get_id:Callable[[], int] = lambda:next(active.counter)
+def pool_context() -> 'multiprocessing.context.BaseContext|None':
+	"""context for process pools: forked processes inherit locks, held by other threads, so fork (the default) is used only when there are no other threads"""
+	if threading.active_count() == 1:
+		return None
+	return multiprocessing.get_context('forkserver')
+
+class LineIndex:
+	"""offsets of line starts in a file, computed on first lookup"""
+	__slots__ = ('text', '_starts')
+	def __init__(self, text:str) -> None:
+		self.text = text
+		self._starts:'array[int]|None' = None
+	@property
+	def starts(self) -> 'array[int]':
+		if self._starts is None:
+			self._starts = array('q', [0])
+			self._starts.extend(match.end() for match in NEWLINES_PATTERN.finditer(self.text))
+		return self._starts
+	def position(self, idx:int) -> tuple[int, int]:
+		starts = self.starts
+		line = bisect_right(starts, idx)
+		return line, idx-starts[line-1]+1
+NEWLINES_PATTERN = re.compile(NEWLINE)
+def index_lines(file_path:str, text:str) -> LineIndex:
+	active.session.line_indexes[file_path] = line_index = LineIndex(text)
+	return line_index
+def get_line_index(file_path:str) -> LineIndex:
+	line_index = active.session.line_indexes.use(file_path)
+	if line_index is None:#file was not lexed in this session (or it's index was evicted)
+		line_index = index_lines(file_path, extract_file_text_from_file_path(file_path))
+	return line_index
+
 @dataclass(slots=True, frozen=True)
 class Loc:
 	file_path:str
 	idx:int
-	line:int = field(compare=False, repr=False)
-	cols:int = field(compare=False, repr=False)
+	@property
+	def line(self) -> int:
+		return get_line_index(self.file_path).position(self.idx)[0]
+	@property
+	def cols(self) -> int:
+		return get_line_index(self.file_path).position(self.idx)[1]
 	def __str__(self) -> str:
-		return f"{self.file_path}:{self.line}:{self.cols}"
+		line, cols = get_line_index(self.file_path).position(self.idx)
+		return f"{self.file_path}:{line}:{cols}"
 
 @dataclass(slots=True, frozen=True)
 class Place:
@@ -222,11 +388,20 @@ class ET(Enum):# Error Type
 	CIRCULAR_IMPORT     = auto()
 	CLANG               = auto()
 	CMD_FILE            = auto()
+	CMD_CACHE_DIR       = auto()
 	CMD_FLAG            = auto()
+	CMD_JOBS            = auto()
+	CMD_LEX_SIZE        = auto()
+	CMD_PARSE_MODULES   = auto()
+	CMD_CHECK_MODULES   = auto()
+	CMD_BATCH           = auto()
+	CMD_MANIFEST        = auto()
 	CMD_OUTPUT_NAME     = auto()
 	CMD_O_NAME          = auto()
 	CMD_PACK_NAME       = auto()
 	CMD_SUBFLAG         = auto()
+	CMD_TOOLCHAIN       = auto()
+	CMD_SEPARATE        = auto()
 	COLON               = auto()
 	CONST_NAME          = auto()
 	CTE_TERM            = auto()
@@ -374,11 +549,113 @@ class Error:
 		loc = f"{self.place}: " if self.place is not None else ''
 		return f"\x1b[91mERROR:\x1b[0m {loc}{self.msg} [{self.typ}]"
 
+PACKETS_PATH = os.path.join(JARARACA_PATH,'packets')
+def mtime(path:str) -> int:
+	try:
+		return os.stat(path).st_mtime_ns
+	except OSError:
+		return -1
+class PacketRegistry:
+	"""packet name -> directory, read once from the index file (and .link files of older versions).
+	'std' is always the one in JARARACA_PATH. Lookups of directories and module files are remembered,
+	until check notices, that index or a directory, they were looked up in, changed"""
+	__slots__ = ('path', 'stamp', 'directories', 'dirs', 'module_files', 'parents')
+	def __init__(self, path:str) -> None:
+		self.path = path
+		self.stamp:tuple[int, ...]|None = None
+		self.directories:dict[str, str] = {}
+		self.dirs:dict[str, bool] = {}
+		self.module_files:dict[str, str] = {}
+		self.parents:dict[str, int] = {}# directory, that lookups were made in -> its mtime then
+	@property
+	def index_path(self) -> str:
+		return os.path.join(self.path, 'index')
+	def current_stamp(self) -> tuple[int, ...]:
+		stamp:tuple[int, ...] = ()
+		for path in (self.index_path, self.path):
+			try:
+				stat = os.stat(path)
+			except OSError:
+				stamp += (-1, -1)
+			else:
+				stamp += (stat.st_mtime_ns, stat.st_size)
+		return stamp
+	def load(self) -> None:
+		self.stamp = self.current_stamp()
+		self.directories.clear()
+		self.dirs.clear()
+		self.module_files.clear()
+		self.parents.clear()
+		try:
+			names = os.listdir(self.path)
+		except OSError:
+			names = []
+		for name in sorted(names):
+			if name.endswith('.link'):
+				with open(os.path.join(self.path, name), 'r', encoding='utf-8') as file:
+					self.directories[name[:-len('.link')]] = file.read()
+		if 'index' in names:
+			with open(self.index_path, 'r', encoding='utf-8') as file:
+				for line in file:
+					name, _, directory = line.rstrip('\n').partition('\t')
+					if name != '':
+						self.directories[name] = directory
+		self.directories['std'] = os.path.join(JARARACA_PATH, 'std')
+	def check(self) -> None:
+		"""reload, if the index was changed since it was loaded, forget lookups, if a module or a directory was added to or removed from a directory"""
+		if self.stamp != self.current_stamp():
+			self.load()
+		elif any(mtime(parent) != parent_mtime for parent, parent_mtime in self.parents.items()):
+			self.dirs.clear()
+			self.module_files.clear()
+			self.parents.clear()
+	def directory(self, packet:str) -> str|None:
+		if self.stamp is None:
+			self.load()
+		return self.directories.get(packet)
+	def is_dir(self, path:str) -> bool:
+		is_dir = self.dirs.get(path)
+		if is_dir is None:
+			parent = os.path.dirname(path)
+			if parent not in self.parents:
+				self.parents[parent] = mtime(parent)
+			is_dir = self.dirs[path] = os.path.isdir(path)
+		return is_dir
+	def module_file(self, path:str) -> str:
+		"""file of a module at path (without extension), that is either file or directory"""
+		file_path = self.module_files.get(path)
+		if file_path is None:
+			file_path = self.module_files[path] = os.path.join(path,'__init__.ja') if self.is_dir(path) else path + '.ja'
+		return file_path
+	def resolve(self, module_path:str) -> str|None:
+		"""file of a module with dotted path like 'packet.module', None if it can't be found"""
+		packet, *levels = module_path.split('.')
+		file_path = self.directory(packet)
+		if file_path is None:
+			return None
+		for level in levels:
+			if not self.is_dir(file_path):
+				return None
+			file_path = os.path.join(file_path, level)
+		return self.module_file(file_path)
+	def fingerprint(self) -> str:
+		if self.stamp is None:
+			self.load()
+		return '\n'.join(f"{name}\t{directory}" for name, directory in sorted(self.directories.items()))
+	def pack(self, directory:str) -> None:
+		"""register directory as a packet with the name of the directory"""
+		self.check()
+		self.directories[os.path.basename(os.path.abspath(directory))] = os.path.abspath(directory)
+		os.makedirs(self.path, exist_ok=True)
+		with open(self.index_path+'.tmp', 'w', encoding='utf-8') as file:
+			for name, path in sorted(self.directories.items()):
+				if name != 'std':
+					file.write(f"{name}\t{path}\n")
+		os.replace(self.index_path+'.tmp', self.index_path)
+		self.load()
+packets = PacketRegistry(PACKETS_PATH)
 def pack_directory(directory:str) -> None:
-	name = os.path.basename(directory)
-	path = os.path.join(JARARACA_PATH,'packets')
-	with open(os.path.join(path,name+'.link'), 'w', encoding='utf-8') as file:
-		file.write(os.path.abspath(directory))
+	packets.pack(directory)
 
 
 def escape(string:str) -> str:
@@ -399,7 +676,18 @@ class Config:
 	optimization  : str
 	argv          : list[str]
 	assume_assert : bool
+	jobs          : int
+	parallel_lex_size:int
+	parallel_parse_modules:int
+	parallel_check_modules:int
+	use_cache     : bool
+	cache_dir     : str
+	watch         : bool
+	batch         : list[str]
+	toolchain     : str
+	separate      : bool
 	errors        : ErrorBin
+	session       : CompilationSession
 	@property
 	def silent(self) ->bool:
 		return self.errors.silent
@@ -418,6 +706,17 @@ class Config:
 		optimization  : None|str       = None,
 		argv          : None|list[str] = None,
 		assume_assert : None|bool      = None,
+		jobs          : None|int       = None,
+		parallel_lex_size:None|int     = None,
+		parallel_parse_modules:None|int= None,
+		parallel_check_modules:None|int= None,
+		use_cache     : None|bool      = None,
+		cache_dir     : None|str       = None,
+		watch         : None|bool      = None,
+		batch         : None|list[str] = None,
+		toolchain     : None|str       = None,
+		separate      : None|bool      = None,
+		session       : None|CompilationSession = None,
 	) -> 'Config':
 		if output_file   is None: output_file   = file[:file.rfind('.')]
 		if run_file      is None: run_file      = False
@@ -429,6 +728,17 @@ class Config:
 		if optimization  is None: optimization  = '-O2'
 		if argv          is None: argv          = []
 		if assume_assert is None: assume_assert = False
+		if jobs          is None: jobs          = os.cpu_count() or 1
+		if parallel_lex_size is None: parallel_lex_size = PARALLEL_LEX_SIZE
+		if parallel_parse_modules is None: parallel_parse_modules = PARALLEL_PARSE_MODULES
+		if parallel_check_modules is None: parallel_check_modules = PARALLEL_CHECK_MODULES
+		if use_cache     is None: use_cache     = True
+		if cache_dir     is None: cache_dir     = DEFAULT_CACHE_DIR
+		if watch         is None: watch         = False
+		if batch         is None: batch         = []
+		if toolchain     is None: toolchain     = SEPARATE_TOOLCHAINS[0] if separate else TOOLCHAINS[0]
+		if separate      is None: separate      = False
+		if session       is None: session       = default_session
 		return cls(
 			file,
 			output_file,
@@ -440,9 +750,31 @@ class Config:
 			optimization,
 			argv,
 			assume_assert,
-			errors
+			jobs,
+			parallel_lex_size,
+			parallel_parse_modules,
+			parallel_check_modules,
+			use_cache,
+			cache_dir,
+			watch,
+			batch,
+			toolchain,
+			separate,
+			errors,
+			session,
 		)
 
+VALUE_FLAGS:dict[str, tuple[ET, str]] = {# flags, that take the next argument -> error and what is expected after them. Client (jararaca.py) has the same flags
+	'output'                 : (ET.CMD_OUTPUT_NAME,    'file name'),
+	'pack'                   : (ET.CMD_PACK_NAME,      'directory path'),
+	'jobs'                   : (ET.CMD_JOBS,           'positive number of jobs'),
+	'parallel-lex-size'      : (ET.CMD_LEX_SIZE,       'size in bytes'),
+	'parallel-parse-modules' : (ET.CMD_PARSE_MODULES,  'number of modules'),
+	'parallel-check-modules' : (ET.CMD_CHECK_MODULES,  'number of modules'),
+	'cache-dir'              : (ET.CMD_CACHE_DIR,      'directory path'),
+	'manifest'               : (ET.CMD_MANIFEST,       'file path'),
+	'toolchain'              : (ET.CMD_TOOLCHAIN,      f"one of {', '.join(TOOLCHAINS)}"),
+}
 def process_cmd_args(eb:ErrorBin,args:list[str]) -> Config:
 	assert len(args)>0, 'Error in the function above'
 	self_name = args[0]
@@ -456,24 +788,37 @@ def process_cmd_args(eb:ErrorBin,args:list[str]) -> Config:
 	optimization  = None
 	argv          = None
 	assume_assert = None
+	jobs          = None
+	parallel_lex_size = None
+	parallel_parse_modules = None
+	parallel_check_modules = None
+	use_cache     = None
+	cache_dir     = None
+	watch         = None
+	batch         = None
+	toolchain     = None
+	separate      = None
 	args = args[1:]
+	def bad_value(flag:str) -> NoReturn:
+		typ, expected = VALUE_FLAGS[flag]
+		eb.critical_error(typ,None,f"expected {expected} after --{flag} option (-h for help)")
 	idx = 0
 	while idx<len(args):
 		arg = args[idx]
 		if arg[:2] == '--':
 			flag = arg[2:]
+			value = ''
+			if flag in VALUE_FLAGS:
+				idx+=1
+				if idx>=len(args):
+					bad_value(flag)
+				value = args[idx]
 			if flag == 'help':
 				usage(eb, self_name)
 			elif flag == 'output':
-				idx+=1
-				if idx>=len(args):
-					eb.critical_error(ET.CMD_OUTPUT_NAME,None,'expected file name after --output option (-h for help)')
-				output_file = args[idx]
+				output_file = value
 			elif flag == 'pack':
-				idx+=1
-				if idx>=len(args):
-					eb.critical_error(ET.CMD_PACK_NAME,None,'expected directory path after --pack option (-h for help)')
-				pack_directory(args[idx])
+				pack_directory(value)
 				eb.exit_properly(0)
 			elif flag == 'verbose':
 				verbose = True
@@ -483,6 +828,38 @@ def process_cmd_args(eb:ErrorBin,args:list[str]) -> Config:
 				dump = True
 			elif flag == 'assume':
 				assume_assert = True
+			elif flag == 'jobs':
+				if not value.isdigit() or int(value) == 0:
+					bad_value(flag)
+				jobs = int(value)
+			elif flag == 'parallel-lex-size':
+				if not value.isdigit():
+					bad_value(flag)
+				parallel_lex_size = int(value)
+			elif flag == 'parallel-parse-modules':
+				if not value.isdigit():
+					bad_value(flag)
+				parallel_parse_modules = int(value)
+			elif flag == 'parallel-check-modules':
+				if not value.isdigit():
+					bad_value(flag)
+				parallel_check_modules = int(value)
+			elif flag == 'no-cache':
+				use_cache = False
+			elif flag == 'cache-dir':
+				cache_dir = value
+			elif flag == 'watch':
+				watch = True
+			elif flag == 'batch':
+				batch = batch or []
+			elif flag == 'manifest':
+				batch = (batch or []) + read_manifest(eb, value)
+			elif flag == 'toolchain':
+				if value not in TOOLCHAINS:
+					bad_value(flag)
+				toolchain = value
+			elif flag == 'separate':
+				separate = True
 			else:
 				eb.add_error(ET.CMD_FLAG,None,f"flag '--{flag}' is not supported yet")
 		elif arg[:2] =='-o':
@@ -512,8 +889,22 @@ def process_cmd_args(eb:ErrorBin,args:list[str]) -> Config:
 			break
 		idx+=1
 	argv = args[idx:]
+	if batch is not None:
+		batch += ([] if file is None else [file]) + argv
+		argv = []
+		if len(batch) == 0:
+			eb.critical_error(ET.CMD_FILE,None,'files were not provided')
+		if output_file is not None or run_file or interpret or dump or watch or separate:
+			eb.critical_error(ET.CMD_BATCH,None,'options -o, -r, -i, --dump, --watch and --separate can not be used with --batch or --manifest')
+		file = batch[0]
 	if file is None:
 		eb.critical_error(ET.CMD_FILE,None,'file was not provided')
+	if interpret and toolchain == 'clang':
+		eb.critical_error(ET.CMD_TOOLCHAIN,None,"option -i can not be used with '--toolchain clang', it does not make bitcode")
+	if separate and (interpret or emit_llvm):
+		eb.critical_error(ET.CMD_SEPARATE,None,'options -i and -l can not be used with --separate, modules are compiled by clang')
+	if separate and toolchain is not None and toolchain not in SEPARATE_TOOLCHAINS:
+		eb.critical_error(ET.CMD_SEPARATE,None,f"'--toolchain {toolchain}' can not be used with --separate, {' and '.join(other for other in TOOLCHAINS if other not in SEPARATE_TOOLCHAINS)} do not compile modules into object files, {', '.join(SEPARATE_TOOLCHAINS)} does")
 	return Config.use_defaults(
 		eb,
 		file          = file,
@@ -526,12 +917,32 @@ def process_cmd_args(eb:ErrorBin,args:list[str]) -> Config:
 		optimization  = optimization,
 		argv          = argv,
 		assume_assert = assume_assert,
+		jobs          = jobs,
+		parallel_lex_size = parallel_lex_size,
+		parallel_parse_modules = parallel_parse_modules,
+		parallel_check_modules = parallel_check_modules,
+		use_cache     = use_cache,
+		cache_dir     = cache_dir,
+		watch         = watch,
+		batch         = batch,
+		toolchain     = toolchain,
+		separate      = separate,
 	)
+def read_manifest(eb:ErrorBin, manifest:str) -> list[str]:
+	"""files, listed one per line (relative to the manifest), empty lines and lines starting with '#' are skipped"""
+	try:
+		with open(manifest, 'r', encoding='utf-8') as file:
+			lines = file.read().splitlines()
+	except OSError as error:
+		eb.critical_error(ET.CMD_MANIFEST,None,f"could not read manifest '{manifest}': {error.strerror}")
+	directory = os.path.dirname(manifest)
+	return [os.path.join(directory, line) for line in map(str.strip, lines) if line != '' and not line.startswith('#')]
 def usage(eb:ErrorBin,self_name:str|None) -> NoReturn:
 	eb.show_errors()
 	print(
 f"""Usage:
 	{self_name or '<program>'} file [flags]
+	{self_name or '<program>'} [flags] --batch files
 Notes:
 	short versions of flags can be combined for example `-r -v` can be shorten to `-rv`
 Flags:
@@ -545,12 +956,26 @@ Flags:
 	-O0 -O1        : optimization levels (last overrides)
 	-O2 -O3        : default is -O2
 	   --pack      : specify a directory to pack into a discoverable packet (ignore any other flags)
+	   --serve     : start compile server, while it runs, compilation is done by it (must be the only flag)
+	   --batch     : compile every given file (as a separate program), diagnostics and exit codes are reported for each
+	   --manifest  : compile files, listed in a file (one per line) `--manifest path`, like --batch does
+	   --watch     : keep running, compile again every time the file or any module it imports changes
+	   --toolchain : how llvm ir becomes the program `--toolchain clang` (default is {TOOLCHAINS[0]}):
+	                 opt   - opt optimizes ir into bitcode, clang compiles it
+	                 clang - one clang compiles ir (faster for small programs, -l emits ir before optimization)
+	                 lli   - no compilation, ir is emitted, lli interprets it with -r or -i
+	   --separate  : compile each module into it's own object file and link them (--toolchain can only be {' or '.join(SEPARATE_TOOLCHAINS)}). Objects are cached, unchanged modules are not compiled again
 	   --assume    : removes assertion checking and assumes that all assertions are true, uses it for optimization
+	   --jobs      : number of processes to use `--jobs 4` (default is number of cores)
+	   --no-cache  : do not read or write cached modules, objects and builds (program is always compiled)
+	   --cache-dir : directory for cached modules, objects and builds `--cache-dir path` (default is {DEFAULT_CACHE_DIR})
+	   --parallel-lex-size : files of at least that many bytes are lexed in parallel `--parallel-lex-size 262144` (default is {PARALLEL_LEX_SIZE})
+	   --parallel-parse-modules : programs that have at least that many modules to parse (not cached) have them parsed in parallel `--parallel-parse-modules 32` (default is {PARALLEL_PARSE_MODULES})
+	   --parallel-check-modules : programs that import at least that many modules have them type checked in parallel, a module at a time `--parallel-check-modules 32` (default is {PARALLEL_CHECK_MODULES})
 """
 	)
 	eb.exit_properly(0)
 def extract_file_text_from_file_path(file_name:str) -> str:
 	with open(file_name, encoding='utf-8') as file:
-		text = file.read()
-	return text+'\n'
+		return file.read()
 
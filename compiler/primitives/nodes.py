@@ -1,6 +1,6 @@
 from abc import ABC
 from dataclasses import dataclass, field
-from typing import Callable, Iterable
+from typing import Any, Callable, Generic, Iterable, NoReturn, TypeVar
 from .type import Type
 from . import type as types
 from .core import NEWLINE, Config, Place, escape, get_id, ET
@@ -11,6 +11,7 @@ class Module:
 	tops:'tuple[Node, ...]'
 	path:str
 	builtin_module:'Module|None'
+	constants:'dict[str, int|None]' = field(default_factory=dict, compare=False, repr=False)# name -> value of consts, visible in module (None if name is imported, but is not a const)
 	uid:int = field(default_factory=get_id, compare=False, repr=False)
 	def __str__(self) -> str:
 		return f"{NEWLINE.join(str(i) for i in self.tops)}"
@@ -19,6 +20,12 @@ class Module:
 		return f"@.setup_module.{self.uid}"
 	def module_couple_llvmid(self,uid:str) -> str:
 		return f"@module.{self.uid}.{uid}"
+	@property
+	def imports(self) -> 'tuple[Module, ...]':
+		"""modules, that this module imports, built-ins first, each once"""
+		imported = [] if self.builtin_module is None else [self.builtin_module]
+		imported += [top.module for top in self.tops if isinstance(top, Import|FromImport)]
+		return tuple({module.path:module for module in imported}.values())
 class Node(ABC):
 	place:Place
 	uid:int
@@ -365,8 +372,8 @@ class Struct(Node):
 		return f"struct {self.name} {block([str(i) for i in self.variables]+[str(i) for i in self.static_variables]+[str(i) for i in self.funs])}"
 	def to_struct(self,unwrapper:Callable[[Node], Type]) -> types.Struct:
 		return types.Struct(self.name.operand,tuple((arg.name.operand,unwrapper(arg.typ)) for arg in self.variables),self.uid, tuple((fun.name.operand,fun.typ(unwrapper,1),fun.llvmid) for fun in self.funs))
-	def to_struct_kind(self,unwrapper:Callable[[Node], Type]) -> types.StructKind:
-		return types.StructKind(tuple((static.var.name.operand, unwrapper(static.var.typ)) for static in self.static_variables), self.to_struct(unwrapper))
+	def to_struct_kind(self,unwrapper:Callable[[Node], Type], struct:types.Struct) -> types.StructKind:
+		return types.StructKind(tuple((static.var.name.operand, unwrapper(static.var.typ)) for static in self.static_variables), struct)
 @dataclass(slots=True, frozen=True)
 class Cast(Node):
 	typ:'Node'
@@ -493,8 +500,8 @@ class Enum(Node):
 		return f"enum {self.name} {block(f'{item}' for item in self.typed_items+self.items+self.funs)}"
 	def to_enum(self, unwrapper:Callable[[Node], Type]) -> types.Enum:
 		return types.Enum(self.name.operand, tuple(item.operand for item in self.items), tuple((item.name.operand,unwrapper(item.typ)) for item in self.typed_items), tuple((fun.name.operand,fun.typ(unwrapper,1),fun.llvmid) for fun in self.funs), self.uid)
-	def to_enum_kind(self, unwrapper:Callable[[Node], Type]) -> types.EnumKind:
-		return types.EnumKind(self.to_enum(unwrapper))
+	def to_enum_kind(self, enum:types.Enum) -> types.EnumKind:
+		return types.EnumKind(enum)
 
 
 @dataclass(slots=True, frozen=True)
@@ -533,3 +540,15 @@ class Assert(Node):
 	uid:int = field(default_factory=get_id, compare=False, repr=False)
 	def __str__(self) -> str:
 		return f"assert {self.value} {self.explanation}"
+
+Pass = TypeVar('Pass')
+Result = TypeVar('Result')
+class Dispatch(dict[type[Node], Callable[[Pass, Any], Result]], Generic[Pass, Result]):
+	"""node type -> handler of that node in a pass. Pass dispatches with `TABLE[type(node)](self, node)`,
+	which is a single lookup for any node type"""
+	__slots__ = ('name',)
+	def __init__(self, name:str, handlers:dict[type[Node], Callable[[Pass, Any], Result]]) -> None:
+		super().__init__(handlers)
+		self.name = name
+	def __missing__(self, node_type:type) -> NoReturn:
+		assert False, f"Unreachable, unknown {node_type} in {self.name}"
@@ -1,39 +1,171 @@
+import hashlib
 import subprocess
 import os
-from typing import NoReturn
+import shutil
+import stat
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, NoReturn, TextIO
 from .core import Config, ET
 __all__ = [
 	"run_command",
 	"replace_self",
-	"run_assembler"
+	"run_assembler",
+	"run_toolchain",
+	"run_separately",
+	"tool_stamp",
+	"ToolchainInput",
 ]
+OBJECT_FORMAT = 1
 
 def run_command(command:list[str], config:Config, put:None|str=None) -> int:
 	config.errors.show_errors()
 	if config.verbose:
 		print(f"CMD: {' '.join(command)}" )
-	return subprocess.run(command, input=put, text=True, check=False).returncode
+	start = time.perf_counter()
+	ret_code = subprocess.run(command, input=put, text=True, check=False).returncode
+	report_time(config, f"'{command[0]}'", start)
+	return ret_code
 def replace_self(args:'list[str]',config:Config) -> NoReturn:
 	config.errors.show_errors()
 	if config.verbose:
 		print(f"INFO: handing execution to '{' '.join(args)}' (execvp)" )
 	os.execvp(args[0], args)
-def run_assembler(config:Config, text:str) -> None:
-	args = ['opt',  config.optimization, '-o', f'{config.output_file}.bc', '-']
-	ret_code = run_command(args,config=config,put=text)
-	if ret_code != 0:
+def report_time(config:Config, stage:str, start:float) -> None:
+	if config.verbose:
+		print(f"INFO: {stage} took {time.perf_counter()-start:.3f}s")
+class ToolchainInput:
+	"""llvm ir is written to it, while it's generated: to stdin of the first tool of the toolchain (if there is one),
+	and to .ll file (with --emit-llvm, or if toolchain is lli), so it is there, if the tool fails"""
+	__slots__ = ('tool', 'll', 'broken')
+	def __init__(self, tool:'subprocess.Popen[str]|None', ll:TextIO|None) -> None:
+		self.tool   = tool
+		self.ll     = ll
+		self.broken = False
+	def write(self, text:str) -> None:
+		if self.tool is not None and not self.broken:
+			assert self.tool.stdin is not None
+			try:
+				self.tool.stdin.write(text)
+			except BrokenPipeError:
+				self.broken = True# tool exited early, it's exit code is reported
+		if self.ll is not None:
+			self.ll.write(text)
+def first_tool(config:Config) -> list[str]|None:
+	"""command, that reads llvm ir from stdin"""
+	if config.toolchain == 'opt':
+		return ['opt',  config.optimization, '-o', f'{config.output_file}.bc', '-']
+	if config.toolchain == 'clang':
+		return ['clang', '-x', 'ir', '-', config.optimization, '-Wno-override-module', '-lgc', '-o', config.output_file+'.out']
+	if config.toolchain == 'lli':
+		return None
+	assert False, "Unreachable"
+@contextmanager
+def run_toolchain(config:Config) -> Iterator[ToolchainInput]:
+	"""make the program from llvm ir, written to the input, while it's generated. If generation fails, toolchain is stopped.
+	opt: opt optimizes ir into .bc file, then clang compiles it into executable
+	clang: one clang compiles ir into executable
+	lli: ir is written to .ll file, lli runs it"""
+	command = first_tool(config)
+	tool = None
+	start = time.perf_counter()
+	if command is not None:
+		config.errors.show_errors()
+		if config.verbose:
+			print(f"CMD: {' '.join(command)}" )
+		tool = subprocess.Popen(command, stdin=subprocess.PIPE, text=True)
+	ll = open(f'{config.output_file}.ll', 'w') if config.emit_llvm or config.toolchain == 'lli' else None
+	try:
+		yield ToolchainInput(tool, ll)
+	except BaseException:
+		if tool is not None:
+			tool.kill()
+			tool.wait()
+		if ll is not None:
+			ll.close()
+			os.remove(ll.name)
+		raise
+	if ll is not None:
+		ll.close()
+	if tool is not None:
+		assert tool.stdin is not None and command is not None
+		try:
+			tool.stdin.close()
+		except BrokenPipeError:
+			pass
+		ret_code = tool.wait()
+		report_time(config, f"'{command[0]}'", start)
+		if ret_code != 0:
+			if config.toolchain == 'opt':
+				config.errors.critical_error(ET.OPT, None, f"llvm optimizer 'opt' exited abnormally with exit code {ret_code} (use -v to see invocation)")
+			config.errors.critical_error(ET.CLANG,None,f"clang exited abnormally with exit code {ret_code} (use -v to see invocation)")
+	if config.toolchain == 'opt':
 		if config.emit_llvm:
-			with open(f'{config.output_file}.ll', 'w') as f:
-				f.write(text)
-		config.errors.critical_error(ET.OPT, None, f"llvm optimizer 'opt' exited abnormally with exit code {ret_code} (use -v to see invocation)")
-	if config.emit_llvm:
-		args = ['llvm-dis', f'{config.output_file}.bc',  '-o', f'{config.output_file}.ll']
-		ret_code = run_command(args,config=config)
+			args = ['llvm-dis', f'{config.output_file}.bc',  '-o', f'{config.output_file}.ll']
+			ret_code = run_command(args,config=config)
+			if ret_code != 0:
+				config.errors.add_error(ET.LLVM_DIS, None, f"llvm disassembler 'llvm-dis' exited abnormally with exit code {ret_code} (use -v to see invocation)")
+		ret_code = run_command(['clang',config.output_file+'.bc', config.optimization, '-Wno-override-module', '-lgc', '-o', config.output_file+'.out'],config=config)
+		if ret_code != 0:
+			config.errors.critical_error(ET.CLANG,None,f"clang exited abnormally with exit code {ret_code} (use -v to see invocation)")
+	if config.toolchain != 'lli':
+		make_executable(config)
+def make_executable(config:Config) -> None:
+	executable = config.output_file+'.out'
+	try:
+		os.chmod(executable, os.stat(executable).st_mode|stat.S_IXUSR|stat.S_IXGRP|stat.S_IXOTH)
+	except OSError as error:
+		config.errors.critical_error(ET.CHMOD, None, f"could not make '{executable}' executable: {error.strerror}")
+def run_assembler(config:Config, text:str) -> None:
+	with run_toolchain(config) as ir_input:
+		ir_input.write(text)
+
+def tool_stamp(tool:str) -> str:
+	"""path, modification time and size of the tool, objects, made by other version of it, are not reused"""
+	path = shutil.which(tool)
+	if path is None:
+		return tool
+	stat_result = os.stat(path)
+	return f"{path} {stat_result.st_mtime_ns} {stat_result.st_size}"
+def object_path(directory:str, flags:str, text:str) -> str:
+	key = hashlib.sha256(f"{flags}\0{text}".encode()).hexdigest()
+	return os.path.join(directory, key[:2], key[2:]+'.o')
+def compile_object(config:Config, module_path:str, text:str, path:str) -> int:
+	start = time.perf_counter()
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+	tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+	ret_code = subprocess.run(['clang', '-c', '-x', 'ir', '-', config.optimization, '-Wno-override-module', '-o', tmp_path], input=text, text=True, check=False).returncode
+	if ret_code == 0:
+		os.replace(tmp_path, path)
+	elif os.path.exists(tmp_path):
+		os.remove(tmp_path)
+	report_time(config, f"compilation of module '{module_path}'", start)
+	return ret_code
+def run_separately(config:Config, modules:list[tuple[str, str]]) -> None:
+	"""compile each module (path and llvm ir of it) into an object file, and link them into executable.
+	Objects are cached by hash of the ir (it has interfaces of imported modules), flags and clang, so unchanged modules are not compiled again"""
+	config.errors.show_errors()
+	with tempfile.TemporaryDirectory(prefix='jararaca-') as temporary:
+		directory = os.path.join(config.cache_dir, 'objects') if config.use_cache else temporary
+		flags = f"{OBJECT_FORMAT}\0{config.optimization}\0{tool_stamp('clang')}"
+		paths = [object_path(directory, flags, text) for _, text in modules]
+		compiling:dict[str, tuple[str, str]] = {}
+		for (module_path, text), path in zip(modules, paths):
+			if os.path.exists(path):
+				os.utime(path)# recently used
+				if config.verbose:
+					print(f"INFO: Object of module '{module_path}' is reused")
+			else:
+				compiling[path] = module_path, text
+		with ThreadPoolExecutor(max_workers=config.jobs) as pool:
+			ret_codes = pool.map(lambda path:compile_object(config, *compiling[path], path), compiling)
+			for path, ret_code in zip(compiling, ret_codes):
+				if ret_code != 0:
+					config.errors.critical_error(ET.CLANG,None,f"clang exited abnormally with exit code {ret_code}, when compiling module '{compiling[path][0]}'")
+		ret_code = run_command(['clang', *paths, config.optimization, '-lgc', '-o', config.output_file+'.out'],config=config)
 		if ret_code != 0:
-			config.errors.add_error(ET.LLVM_DIS, None, f"llvm disassembler 'llvm-dis' exited abnormally with exit code {ret_code} (use -v to see invocation)")
-	ret_code = run_command(['clang',config.output_file+'.bc', config.optimization, '-Wno-override-module', '-lgc', '-o', config.output_file+'.out'],config=config)
-	if ret_code != 0:
-		config.errors.critical_error(ET.CLANG,None,f"clang exited abnormally with exit code {ret_code} (use -v to see invocation)")
-	ret_code = run_command(['chmod', '+x', config.output_file+'.out'],config=config)
-	if ret_code != 0:
-		config.errors.critical_error(ET.CHMOD, None, f"chmod exited abnormally with exit code {ret_code} (use -v to see invocation)")
+			config.errors.critical_error(ET.CLANG,None,f"clang exited abnormally with exit code {ret_code} (use -v to see invocation)")
+	make_executable(config)
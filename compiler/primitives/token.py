@@ -1,46 +1,15 @@
+from array import array
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from .core import Config, Place, escape, Loc, ET
+import sys
+from typing import Callable, Iterator
+from .core import Place, escape, Loc
 __all__ = [
 	'Token',
+	'TokenStore',
 	'TT',
+	'TT_BY_CODE',
 ]
-@dataclass(slots=True, frozen=True, order=True)
-class draft_loc:
-	file_path:str
-	file_text:str = field(compare=False, repr=False)
-	config:Config
-	idx:int       = 0
-	rows:int      = field(default=1, compare=False, repr=False)
-	cols:int      = field(default=1, compare=False, repr=False)
-	def __add__(self, number:int) -> 'draft_loc':
-		idx, cols, rows = self.idx, self.cols, self.rows
-		if idx+number>=len(self.file_text):
-			self.config.errors.add_error(ET.EOF, Place(self.to_loc(),self.to_loc()), "unexpected end of file while lexing")
-			number = len(self.file_text)-idx-1
-		for _ in range(number):
-			idx+=1
-			cols+=1
-			if self.file_text[idx-1] =='\n':
-				cols = 1
-				rows+= 1
-		return self.__class__(self.file_path, self.file_text, self.config, idx, rows, cols)
-	def __str__(self) -> str:
-		return f"{self.file_path}:{self.rows}:{self.cols}"
-
-	@property
-	def char(self) -> str:
-		return self.file_text[self.idx]
-	def __bool__(self) -> bool:
-		return self.idx < len(self.file_text)-1
-
-	def to_loc(self) -> Loc:
-		return Loc(
-			file_path= self.file_path,
-			idx      = self.idx,
-			line     = self.rows,
-			cols     = self.cols,
-		)
 class TT(Enum):
 	ARROW                 = auto()
 	ASTERISK              = auto()
@@ -119,15 +88,15 @@ class Token:
 			return escape(self.operand)
 		return escape(str(self.typ))
 	def equals(self, typ_or_token:'TT|Token', operand:str|None = None) -> bool:
+		if type(typ_or_token) is TT:
+			return self.typ is typ_or_token and (operand is None or self.operand == operand)
 		if isinstance(typ_or_token, Token):
-			operand = typ_or_token.operand
-			typ_or_token = typ_or_token.typ
-			return self.typ == typ_or_token and self.operand == operand
-		if operand is None:
-			return self.typ == typ_or_token
-		return self.typ == typ_or_token and self.operand == operand
+			return self.typ is typ_or_token.typ and self.operand == typ_or_token.operand
+		return self.typ == typ_or_token and (operand is None or self.operand == operand)
 
 	def __eq__(self, other: object) -> bool:
+		if type(other) is TT:
+			return self.typ is other
 		if isinstance(other,str):
 			return self.operand == other
 		if not isinstance(other, (TT, Token)):
@@ -136,3 +105,60 @@ class Token:
 
 	def __hash__(self) -> int:
 		return hash((self.typ, self.operand))
+
+TT_BY_CODE:tuple[TT|None, ...] = (None, *sorted(TT, key=lambda typ:typ.value))
+assert all(typ.value == code for code, typ in enumerate(TT_BY_CODE) if typ is not None), "TT codes should be consecutive"
+class TokenStore:
+	"""tokens of a file, stored as parallel arrays of kind codes, start and end offsets and operand ids.
+	Operands are interned in the symbol table of the store, id 0 is the empty operand.
+	While the file is still being lexed, lex_more lexes next tokens into the store, it is None after EOF is stored.
+	Then tokens, that were read, are dropped from the front, so the store is a window of the file"""
+	__slots__ = ('file_path', 'kinds', 'starts', 'ends', 'operands', 'symbols', 'symbol_ids', 'lex_more')
+	def __init__(self, file_path:str) -> None:
+		self.file_path  :str            = file_path
+		self.kinds      :'array[int]'   = array('B')
+		self.starts     :'array[int]'   = array('q')
+		self.ends       :'array[int]'   = array('q')
+		self.operands   :'array[int]'   = array('I')
+		self.symbols    :list[str]      = ['']
+		self.symbol_ids :dict[str, int] = {'':0}
+		self.lex_more   :Callable[[], None]|None = None
+	def intern(self, operand:str) -> int:
+		symbol_id = self.symbol_ids.get(operand)
+		if symbol_id is None:
+			symbol_id = self.symbol_ids[operand] = len(self.symbols)
+			self.symbols.append(sys.intern(operand))
+		return symbol_id
+	def append(self, typ:TT, start:int, end:int, operand:str = '') -> None:
+		self.kinds.append(typ.value)
+		self.starts.append(start)
+		self.ends.append(end)
+		self.operands.append(self.intern(operand) if operand else 0)
+	def extend(self, other:'TokenStore', offset:int = 0) -> None:
+		"""append tokens of other store, with offsets shifted by offset"""
+		remap = [self.intern(symbol) for symbol in other.symbols]
+		self.kinds.extend(other.kinds)
+		self.starts.extend(start+offset for start in other.starts)
+		self.ends.extend(end+offset for end in other.ends)
+		self.operands.extend(remap[operand] for operand in other.operands)
+	def drop(self, count:int) -> None:
+		"""forget first count tokens, indexes of the rest shift by count"""
+		del self.kinds[:count], self.starts[:count], self.ends[:count], self.operands[:count]
+	def truncate(self, length:int) -> None:
+		del self.kinds[length:], self.starts[length:], self.ends[length:], self.operands[length:]
+	def typ(self, idx:int) -> TT:
+		typ = TT_BY_CODE[self.kinds[idx]]
+		assert typ is not None, "Unreachable"
+		return typ
+	def operand(self, idx:int) -> str:
+		return self.symbols[self.operands[idx]]
+	def place(self, idx:int) -> Place:
+		return Place(Loc(self.file_path, self.starts[idx]), Loc(self.file_path, self.ends[idx]))
+	def token(self, idx:int) -> Token:
+		return Token(self.place(idx), self.typ(idx), self.symbols[self.operands[idx]])
+	def __len__(self) -> int:
+		return len(self.kinds)
+	def __iter__(self) -> Iterator[Token]:
+		file_path, symbols = self.file_path, self.symbols
+		for kind, start, end, operand in zip(self.kinds, self.starts, self.ends, self.operands):
+			yield Token(Place(Loc(file_path, start), Loc(file_path, end)), TT_BY_CODE[kind], symbols[operand])# type: ignore[arg-type]
@@ -1,7 +1,12 @@
+import threading
+import weakref
 from enum import Enum as pythons_enum, auto
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any, Iterable, TypeVar
 __all__ = [
 	'Type',
+	'TypeNames',
+	'TypeTable',
 ]
 class Type:
 	def __str__(self) -> str:
@@ -25,18 +30,10 @@ class Primitive(Type,pythons_enum):
 		return self.name.lower()
 	@property
 	def llvm(self) -> str:
-		table:dict[Type, str] = {
-			Primitive.VOID : 'void',
-			Primitive.INT  : 'i64',
-			Primitive.SHORT: 'i32',
-			Primitive.CHAR : 'i8',
-			Primitive.BOOL : 'i1',
-			Primitive.STR  : '%str.type',
-		}
-		return table[self]
+		return PRIMITIVES_LLVM[self]
 	@property
 	def sized(self) -> bool:
-		return self != VOID
+		return self is not VOID
 
 INT   = Primitive.INT
 BOOL  = Primitive.BOOL
@@ -44,24 +41,65 @@ STR   = Primitive.STR
 VOID  = Primitive.VOID
 CHAR  = Primitive.CHAR
 SHORT = Primitive.SHORT
-@dataclass(slots=True, frozen=True)
-class Ptr(Type):
+PRIMITIVES_LLVM:dict[Type, str] = {
+	VOID : 'void',
+	INT  : 'i64',
+	SHORT: 'i32',
+	CHAR : 'i8',
+	BOOL : 'i1',
+	STR  : '%str.type',
+}
+
+interned:'weakref.WeakValueDictionary[tuple[Any, ...], Type]' = weakref.WeakValueDictionary()
+interning = threading.Lock()
+class Interned(type):
+	"""types of this metaclass are hash-consed: constructing a type equal to an existing one returns the existing one.
+	So equal types are the same object, and they are compared by identity. Types, that nothing uses anymore, are forgotten"""
+	def __call__(cls, *args:Any) -> Any:
+		typ = interned.get((cls, *args))
+		if typ is None:
+			with interning:# compilations in other threads must get the same object
+				typ = super().__call__(*args)
+				typ = interned.setdefault((cls, *(getattr(typ, name) for name in cls.__match_args__)), typ)# defaulted arguments
+				interned[(cls, *args)] = typ
+		return typ
+class InternedType(Type, metaclass=Interned):
+	__slots__ = ()
+	__match_args__:tuple[str, ...]
+	def __reduce__(self) -> tuple[Any, ...]:
+		return type(self), tuple(getattr(self, name) for name in self.__match_args__)
+
+@dataclass(slots=True, frozen=True, eq=False)
+class Ptr(InternedType):
 	pointed:Type
+	_llvm:str|None = field(default=None, init=False, repr=False)
 	def __str__(self) -> str:
 		return f"*{self.pointed}"
 	@property
 	def llvm(self) -> str:
+		if self._llvm is not None:
+			return self._llvm
 		p = self.pointed.llvm
 		if p == 'ptr':
-			return "ptr"
-		if p == 'void':
-			return 'i8*'
-		return f"{p}*"
+			llvm = "ptr"
+		elif p == 'void':
+			llvm = 'i8*'
+		else:
+			llvm = f"{p}*"
+		object.__setattr__(self, '_llvm', llvm)
+		return llvm
 	@property
 	def sized(self) -> bool:
 		return True
 PTR = Ptr(VOID)
-@dataclass()#no slots or frozen to simulate a pointer
+nominal:'weakref.WeakValueDictionary[int, Type]' = weakref.WeakValueDictionary()# uid of definition -> it's struct or enum, type checker puts every one it defines there
+def nominal_type(cls:type, uid:int) -> Type:
+	"""struct or enum of that definition, that was defined or unpickled in this process before, so it stays the same object"""
+	typ = nominal.get(uid)
+	if typ is None:
+		typ = nominal[uid] = cls.__new__(cls)
+	return typ
+@dataclass(eq=False)#no slots or frozen to simulate a pointer, compared by identity
 class Struct(Type):#modifying is allowed only to create recursive data
 	name:str
 	variables:tuple[tuple[str,Type],...]
@@ -74,30 +112,23 @@ class Struct(Type):#modifying is allowed only to create recursive data
 			if name == f'__{magic}__':
 				return fun,llvmid
 		return None
+	def __reduce__(self) -> tuple[Any, ...]:
+		return nominal_type, (Struct, self.struct_uid), self.__dict__
 	@property
 	def llvm(self) -> str:
 		return f"%\"struct.{self.struct_uid}.{self.name}\""
-	def is_sized(self) -> bool:
-		return all(var.sized for _,var in self.variables)
-	_is_sizing:bool = False
+	def is_sized(self, visiting:set[int]) -> bool:
+		return all(sized_in(var, visiting) for _,var in self.variables)
 	@property
 	def sized(self) -> bool:
-		if self._is_sizing:
-			return False
-		self._is_sizing = True
-		ret = self.is_sized()
-		self._is_sizing = False
-		return ret
-	def __hash__(self) -> int:
-		return hash((
-			self.name,
-			self.struct_uid
-		))
-@dataclass(slots=True, frozen=True)
-class Fun(Type):
+		return sized_in(self, set())
+@dataclass(slots=True, frozen=True, eq=False)
+class Fun(InternedType):
 	all_arg_types:tuple[Type, ...]
 	bound_args:int
 	return_type:Type
+	_llvm:str|None = field(default=None, init=False, repr=False)
+	_fun_llvm:str|None = field(default=None, init=False, repr=False)
 	@property
 	def arg_types(self) -> tuple[Type, ...]:
 		return self.all_arg_types[self.bound_args:]
@@ -105,10 +136,18 @@ class Fun(Type):
 		return f"({', '.join(f'{arg}' for arg in self.arg_types)}) -> {self.return_type}"
 	@property
 	def llvm(self) -> str:
-		return f"{{ {self.fun_llvm}, {PTR.llvm} }}"
+		if self._llvm is not None:
+			return self._llvm
+		llvm = f"{{ {self.fun_llvm}, {PTR.llvm} }}"
+		object.__setattr__(self, '_llvm', llvm)
+		return llvm
 	@property
 	def fun_llvm(self) -> str:
-		return f"{self.return_type.llvm} ({', '.join((PTR.llvm,*(arg.llvm for arg in self.arg_types)))})*"
+		if self._fun_llvm is not None:
+			return self._fun_llvm
+		llvm = f"{self.return_type.llvm} ({', '.join((PTR.llvm,*(arg.llvm for arg in self.arg_types)))})*"
+		object.__setattr__(self, '_fun_llvm', llvm)
+		return llvm
 	@property
 	def sized(self) -> bool:
 		return True
@@ -139,30 +178,27 @@ class Mix(Type):
 	def sized(self) -> bool:
 		return True
 
-@dataclass(slots=True, unsafe_hash=True)
-class Array(Type):
+@dataclass(slots=True, eq=False)
+class Array(InternedType):
 	typ:Type
 	size:int = 0
+	_llvm:str|None = field(default=None, init=False, repr=False)
 	def __str__(self) -> str:
 		if self.size == 0:
 			return f"[]{self.typ}"
 		return f"[{self.size}]{self.typ}"
 	@property
 	def llvm(self) -> str:
-		return f"[{self.size} x {self.typ.llvm}]"
-	def is_sized(self) -> bool:
+		if self._llvm is None:
+			self._llvm = f"[{self.size} x {self.typ.llvm}]"
+		return self._llvm
+	def is_sized(self, visiting:set[int]) -> bool:
 		if self.size == 0:
 			return False
-		return self.typ.sized
-	_is_sizing:bool = False
+		return sized_in(self.typ, visiting)
 	@property
 	def sized(self) -> bool:
-		if self._is_sizing:
-			return False
-		self._is_sizing = True
-		ret = self.is_sized()
-		self._is_sizing = False
-		return ret
+		return sized_in(self, set())
 @dataclass(slots=True, unsafe_hash=True)
 class StructKind(Type):
 	statics:tuple[tuple[str,Type], ...]
@@ -181,20 +217,14 @@ class StructKind(Type):
 	@property
 	def llvmid(self) -> str:
 		return f"@__structkind.{self.struct_uid}.{self.name}"
-	def is_sized(self) -> bool:
-		return all(var.sized for _,var in self.statics)
-	_is_sizing:bool = False
+	def is_sized(self, visiting:set[int]) -> bool:
+		return all(sized_in(var, visiting) for _,var in self.statics)
 	@property
 	def sized(self) -> bool:
-		if self._is_sizing:
-			return False
-		self._is_sizing = True
-		ret = self.is_sized()
-		self._is_sizing = False
-		return ret
+		return sized_in(self, set())
 
 
-@dataclass()#no slots or frozen to simulate a pointer
+@dataclass(eq=False)#no slots or frozen to simulate a pointer, compared by identity
 class Enum(Type):#modifying is allowed only to create recursive data
 	name:str
 	items:tuple[str,...]
@@ -206,6 +236,8 @@ class Enum(Type):#modifying is allowed only to create recursive data
 			if name == f'__{magic}__':
 				return fun,llvmid
 		return None
+	def __reduce__(self) -> tuple[Any, ...]:
+		return nominal_type, (Enum, self.enum_uid), self.__dict__
 	@property
 	def llvm(self) -> str:
 		return f"%\"enum.{self.enum_uid}.{self.name}\""
@@ -217,23 +249,11 @@ class Enum(Type):#modifying is allowed only to create recursive data
 		return f"%\"enum.item_id.{self.enum_uid}.{self.name}\""
 	def __str__(self) -> str:
 		return self.name
-	def is_sized(self) -> bool:
-		return all(var.sized for _,var in self.typed_items)
-	_is_sizing:bool = False
+	def is_sized(self, visiting:set[int]) -> bool:
+		return all(sized_in(var, visiting) for _,var in self.typed_items)
 	@property
 	def sized(self) -> bool:
-		if self._is_sizing:
-			return False
-		self._is_sizing = True
-		ret = self.is_sized()
-		self._is_sizing = False
-		return ret
-	def __hash__(self) -> int:
-		return hash((
-			self.enum_uid,
-			self.name,
-			self.items,
-		))
+		return sized_in(self, set())
 
 @dataclass(slots=True, frozen=True)
 class EnumKind(Type):
@@ -254,3 +274,47 @@ class EnumKind(Type):
 	@property
 	def sized(self) -> bool:
 		return False
+
+def sized_in(typ:Type, visiting:set[int]) -> bool:
+	"""if type is sized, types that are being sized (ids in visiting) are not: they would contain themselves.
+	What is visited is passed along, not kept on types, because interned types are shared by every session and thread"""
+	if not isinstance(typ, Struct|Array|StructKind|Enum):
+		return typ.sized
+	if id(typ) in visiting:
+		return False
+	visiting.add(id(typ))
+	sized = typ.is_sized(visiting)
+	visiting.remove(id(typ))
+	return sized
+
+V = TypeVar('V')
+class TypeNames(dict[str, V]):
+	"""type names of a pass, with types of type-expression nodes (by uid), that were resolved with them.
+	Type-expression resolves only through type names, so resolved types stay right until some type name is (re)defined"""
+	__slots__ = ('resolved', 'hits', 'misses')
+	def __init__(self) -> None:
+		super().__init__()
+		self.resolved:dict[int, Type] = {}
+		self.hits = 0
+		self.misses = 0
+	def __setitem__(self, name:str, value:V) -> None:
+		self.resolved.clear()
+		super().__setitem__(name, value)
+def resolution_stats(type_names:'Iterable[TypeNames[V]]') -> str:
+	hits = misses = 0
+	for names in type_names:
+		hits += names.hits
+		misses += names.misses
+	return f"{hits} type resolutions reused, {misses} computed ({hits*100//max(hits+misses, 1)}% hit rate)"
+
+Member = tuple[int, Type]|tuple[Fun, str]# index and type of an item, or bound function and it's llvmid
+@dataclass(slots=True)
+class TypeTable:
+	"""what type checker found out about nodes (by uid), so llvm generator does not find it out again"""
+	types:dict[int, Type] = field(default_factory=dict)# type expressions, struct and enum kinds, results of operations
+	members:dict[int, Member] = field(default_factory=dict)# dots and match cases -> looked up member
+	overloads:dict[int, tuple[int, ...]] = field(default_factory=dict)# calls -> index of chosen function in every (nested) mix
+	def update(self, other:'TypeTable') -> None:
+		self.types.update(other.types)
+		self.members.update(other.members)
+		self.overloads.update(other.overloads)
@@ -0,0 +1,145 @@
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import traceback
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Any, Iterator, NoReturn
+
+from .primitives import CompilationSession, ErrorBin, JARARACA_PATH, SERVER_SOCKET_PATH, process_cmd_args
+from . import build
+__all__ = [
+	"serve",
+]
+REQUEST_HEADER = struct.Struct('!I')# length of json request, that follows. Client's stdout and stderr are sent with it
+CLIENT_ENVIRONMENT = ('JARARACA_PATH', 'PATH')# variables of client's environment, that are sent with the request, compilation depends only on them
+
+def sources_stamp() -> tuple[tuple[str, int], ...]:
+	"""modification times of the compiler sources, server should not compile with code, that was changed since it started"""
+	compiler_dir = os.path.dirname(os.path.abspath(__file__))
+	stamp:list[tuple[str, int]] = []
+	for directory in (compiler_dir, os.path.join(compiler_dir, 'primitives')):
+		for name in sorted(os.listdir(directory)):
+			if name.endswith('.py'):
+				stamp.append((name, os.stat(os.path.join(directory, name)).st_mtime_ns))
+	return tuple(stamp)
+
+def receive_request(connection:socket.socket) -> tuple[dict[str, Any], list[int]]:
+	header, fds, _, _ = socket.recv_fds(connection, REQUEST_HEADER.size, 2)
+	if len(header) != REQUEST_HEADER.size or len(fds) != 2:
+		for fd in fds:
+			os.close(fd)
+		raise ConnectionError("malformed request")
+	size, = REQUEST_HEADER.unpack(header)
+	data = b''
+	try:
+		while len(data) < size:
+			chunk = connection.recv(size-len(data))
+			if chunk == b'':
+				raise ConnectionError("client disconnected")
+			data += chunk
+		return json.loads(data), fds
+	except (ConnectionError, ValueError):
+		for fd in fds:
+			os.close(fd)
+		raise
+
+@contextmanager
+def as_client(request:dict[str, Any], fds:list[int]) -> Iterator[None]:
+	"""run in client's directory, with client's PATH, stdout and stderr. The rest of the environment is server's"""
+	sys.stdout.flush()
+	sys.stderr.flush()
+	saved = os.dup(1), os.dup(2)
+	cwd = os.getcwd()
+	environ = dict(os.environ)
+	try:
+		os.dup2(fds[0], 1)
+		os.dup2(fds[1], 2)
+		os.chdir(request['cwd'])
+		for name in CLIENT_ENVIRONMENT:
+			if name in request['env']:
+				os.environ[name] = request['env'][name]
+			else:
+				os.environ.pop(name, None)
+		os.environ['JARARACA_PATH'] = JARARACA_PATH
+		yield
+	finally:
+		sys.stdout.flush()
+		sys.stderr.flush()
+		os.dup2(saved[0], 1)
+		os.dup2(saved[1], 2)
+		for fd in (*saved, *fds):
+			os.close(fd)
+		os.chdir(cwd)
+		os.environ.clear()
+		os.environ.update(environ)
+
+def compile_request(args:list[str], session:CompilationSession) -> dict[str, Any]:
+	"""compile, as `jararaca.py` with these arguments would. Client hands execution to the command in the reply, or exits with the code"""
+	eb = ErrorBin()
+	try:
+		config = replace(process_cmd_args(eb, args), session=session)
+		eb.show_errors()
+		command = build(config)
+		if command is not None:
+			eb.show_errors()
+			if config.verbose:
+				print(f"INFO: handing execution to '{' '.join(command)}' (execvp)")
+			return {'exec':command}
+		eb.exit_properly(0)
+	except SystemExit as stop:
+		if stop.code is None or isinstance(stop.code, int):
+			return {'exit':stop.code or 0}
+		print(stop.code, file=sys.stderr)
+		return {'exit':1}
+	except Exception:
+		traceback.print_exc()
+		return {'exit':1}
+
+def serve(socket_path:str = SERVER_SOCKET_PATH) -> NoReturn:
+	"""compile for clients, connected to the socket, one at a time.
+	Modules, checkers and generated text of modules, that did not change, stay in server's session between compilations.
+	When compiler sources change, server asks client to compile by itself, and exits"""
+	stamp = sources_stamp()
+	session = CompilationSession()
+	os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+	try:
+		os.unlink(socket_path)
+	except FileNotFoundError:
+		pass
+	listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+	listener.bind(socket_path)
+	listener.listen()
+	signal.signal(signal.SIGTERM, signal.default_int_handler)# stop like on ^C, removing the socket
+	print(f"INFO: Compile server is listening on '{socket_path}'", flush=True)
+	try:
+		while True:
+			connection, _ = listener.accept()
+			with connection:
+				try:
+					request, fds = receive_request(connection)
+				except (ConnectionError, ValueError):
+					continue
+				if sources_stamp() != stamp:
+					for fd in fds:
+						os.close(fd)
+					connection.sendall(json.dumps({'restart':True}).encode())
+					break
+				with as_client(request, fds):
+					reply = compile_request(request['argv'], session)
+				try:
+					connection.sendall(json.dumps(reply).encode())
+				except OSError:
+					pass# client is gone
+	except KeyboardInterrupt:
+		pass
+	finally:
+		listener.close()
+		try:
+			os.unlink(socket_path)
+		except FileNotFoundError:
+			pass
+	sys.exit(0)
@@ -1,13 +1,16 @@
-from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, replace
 from enum import Enum, auto
 from typing import Callable
 
-from .primitives import nodes, Node, ET, Config, Type, types, DEFAULT_TEMPLATE_STRING_FORMATTER, BUILTIN_WORDS, Place
+from .primitives import nodes, Node, ET, Config, ErrorBin, ErrorExit, Type, types, DEFAULT_TEMPLATE_STRING_FORMATTER, BUILTIN_WORDS, MAIN_MODULE_PATH, Place, Scope, pool_context
 __all__ = (
 	'SemanticTokenType',
 	'SemanticTokenModifier',
 	'SemanticToken',
 	'TypeChecker',
+	'ModuleInterface',
+	'check_imported_modules',
 )
 class SemanticTokenType(Enum):
 	MODULE           = auto()
@@ -47,21 +50,31 @@ expand:Callable[
 [tuple[Type,Place]|None],
 tuple[Type,Place]|tuple[None,None]] = lambda x:(None,None) if x is None else (x[0],x[1])
 
-imported_modules:'dict[str,TypeChecker]' = {}
+@dataclass(slots=True)
+class ModuleInterface:
+	"""names, type names and type table of a module, that was checked by another process. It stands in for the TypeChecker of that module"""
+	names:dict[str, tuple[Type,Place]]
+	type_names:types.TypeNames[tuple[Type,Place]]
+	table:types.TypeTable
+
+Checked = tuple[nodes.Module, 'TypeChecker|ModuleInterface', tuple[tuple[nodes.Module, 'TypeChecker|ModuleInterface'], ...]]# module, it's checker and checkers of modules it imports. Session retains modules, that were checked without errors, by path
 
 class TypeChecker:
-	__slots__ = ('config', 'module', 'modules', 'names', 'type_names', 'expected_return_type', 'semantic', 'semantic_tokens')
+	__slots__ = ('config', 'module', 'modules', 'names', 'type_names', 'table', 'expected_return_type', 'semantic', 'semantic_tokens')
 	def __init__(self, module:nodes.Module, config:Config, semantic:bool = False) -> None:
 		self.module = module
 		self.config = config
-		self.names:dict[str, tuple[Type,Place]] = {}#regular definitions like `var x int`
-		self.type_names:dict[str, tuple[Type,Place]] = {}#type definitions like `struct X {}`
-		self.modules:dict[int, TypeChecker] = {}
+		self.table = types.TypeTable()#of this module only, tables of imported modules are added to the table of main module
+		self.names:Scope[str, tuple[Type,Place]] = Scope()#regular definitions like `var x int`
+		self.type_names:types.TypeNames[tuple[Type,Place]] = types.TypeNames()#type definitions like `struct X {}`
+		self.modules:dict[int, TypeChecker|ModuleInterface] = {}
 		self.expected_return_type:Type = types.VOID
 		self.semantic:bool = semantic
 		if self.semantic:
 			self.semantic_tokens:set[SemanticToken] = set()
-	def go_check(self) -> None:
+	def go_check(self) -> types.TypeTable:
+		if self.config.jobs > 1 and self.module.path == MAIN_MODULE_PATH:
+			check_imported_modules(self.module, self.config)
 		if self.module.builtin_module is not None:
 			tc = self.import_module(self.module.builtin_module)
 			for name in BUILTIN_WORDS:
@@ -74,14 +87,23 @@ class TypeChecker:
 					self.type_names[name] = type_definition
 		for top in self.module.tops:
 			self.check(top)
+		if self.module.path == MAIN_MODULE_PATH:
+			for tc in self.config.session.checkers.values():
+				self.table.update(tc.table)
+		return self.table
 
-	def import_module(self,module:nodes.Module) -> 'TypeChecker':
-		if module.path in imported_modules:
-			tc = imported_modules[module.path]
-		else:
+	def import_module(self,module:nodes.Module) -> 'TypeChecker|ModuleInterface':
+		checkers = self.config.session.checkers
+		tc = checkers.get(module.path)
+		if tc is None:
+			tc = reuse_checked_module(module, self.config)
+		if tc is None:
+			errors_before = len(self.config.errors.errors)
 			tc = TypeChecker(module, self.config)
 			tc.go_check()
-			imported_modules[module.path] = tc
+			checkers[module.path] = tc
+			if len(self.config.errors.errors) == errors_before:
+				retain_checked_module(module, self.config)
 		self.modules[module.uid] = tc
 		return tc
 
@@ -107,16 +129,17 @@ class TypeChecker:
 		if self.semantic:self.semantic_tokens.add(SemanticToken(node.path_place, SemanticTokenType.MODULE, (SemanticTokenModifier.DECLARATION,)))
 		return types.VOID
 	def check_enum(self, node:nodes.Enum) -> Type:
-		enum_type = types.Enum('',(),(),(),0)
+		enum_type = types.nominal[node.uid] = types.Enum(node.name.operand,(),(),(),node.uid)
 		self.type_names[node.name.operand] = enum_type,node.name.place
 		actual_enum_type = node.to_enum(self.check)
 		enum_type.__dict__ = actual_enum_type.__dict__#FIXME
 		del actual_enum_type
-		self.names[node.name.operand] = node.to_enum_kind(self.check),node.name.place
+		enum_kind = self.table.types[node.uid] = node.to_enum_kind(enum_type)
+		self.names[node.name.operand] = enum_kind,node.name.place
 		if self.semantic:self.semantic_tokens.add(SemanticToken(node.name.place, SemanticTokenType.ENUM, (SemanticTokenModifier.DEFINITION,)))
 		for fun in node.funs:
 			rt = self.check(fun.return_type) if fun.return_type is not None else types.VOID
-			self.check_bound_fun_helper(types.Ptr(node.to_enum(self.check)),fun,rt)
+			self.check_bound_fun_helper(types.Ptr(enum_type),fun,rt)
 		if self.semantic:
 			for item in node.items:
 				self.semantic_tokens.add(SemanticToken(item.place, SemanticTokenType.ENUM_ITEM, (SemanticTokenModifier.DEFINITION,)))
@@ -132,15 +155,16 @@ class TypeChecker:
 					self.config.errors.add_error(ET.MAIN_RETURN, node.return_type_place, f"entry point (function 'main') has to return {types.VOID}, found '{node.return_type}'")
 			if len(node.arg_types) != 0:
 				self.config.errors.add_error(ET.MAIN_ARGS, node.args_place, f"entry point (function 'main') has to take no arguments, found '({', '.join(map(str,node.arg_types))})'")
-		vars_before = self.names.copy()
-		self.names.update({arg.name.operand:(self.check(arg.typ),arg.name.place) for arg in node.arg_types})
+		self.names.push()
+		for arg in node.arg_types:
+			self.names[arg.name.operand] = self.check(arg.typ),arg.name.place
 		ert_before = self.expected_return_type
 		self.expected_return_type = self.check(node.return_type) if node.return_type is not None else types.VOID
 		actual_ret_typ = self.check(node.code)
 		specified_ret_typ = self.check(node.return_type) if node.return_type is not None else types.VOID
 		if specified_ret_typ != actual_ret_typ:
 			self.config.errors.add_error(ET.FUN_RETURN, node.return_type_place, f"specified return type is '{specified_ret_typ}' but function did not return")
-		self.names = vars_before
+		self.names.pop()
 		self.expected_return_type = ert_before
 		if self.semantic:
 			self.semantic_tokens.add(SemanticToken(node.name.place,semantic_type,(SemanticTokenModifier.DEFINITION,), node.typ(self.check,bound_args)))
@@ -148,7 +172,7 @@ class TypeChecker:
 				self.semantic_tokens.add(SemanticToken(arg.name.place,SemanticTokenType.ARGUMENT,(SemanticTokenModifier.DECLARATION,)))
 		return types.VOID
 	def check_code(self, node:nodes.Code) -> Type:
-		vars_before = self.names.copy()
+		self.names.push()
 		ret:Type = types.VOID
 		for statement in node.statements:
 			#every statement's check should return types.VOID if (and only if) there is a way, that `return` can be not executed in it
@@ -158,14 +182,17 @@ class TypeChecker:
 				ret = r
 				assert r == self.expected_return_type, f"{type(statement)} statement did not follow return rules"
 				#other things are not allowed
-		self.names = vars_before #this is scoping
+		self.names.pop() #this is scoping
 		return ret
 	def check_call(self, node:nodes.Call) -> Type:
-		return self.call_helper(self.check(node.func), [self.check(arg) for arg in node.args], node.place)
-	def call_helper(self, function:Type, args:list[Type], place:Place) -> Type:
-		def get_fun_out_of_called(called:Type) -> types.Fun:
+		fun, overload = self.call_helper(self.check(node.func), [self.check(arg) for arg in node.args], node.place)
+		if len(overload) != 0:
+			self.table.overloads[node.uid] = overload
+		return fun.return_type
+	def call_helper(self, function:Type, args:list[Type], place:Place) -> tuple[types.Fun, tuple[int, ...]]:
+		def get_fun_out_of_called(called:Type) -> tuple[types.Fun, tuple[int, ...]]:
 			if isinstance(called, types.Fun):
-				return called
+				return called, ()
 			if isinstance(called, types.StructKind):
 				m = called.struct.get_magic('init')
 				if m is None:
@@ -175,32 +202,32 @@ class TypeChecker:
 					magic.all_arg_types,
 					1,
 					types.Ptr(called.struct)
-				)
+				), ()
 			if isinstance(called, types.Mix):
-				for ref in called.funs:
-					fun = get_fun_out_of_called(ref)
+				for idx,ref in enumerate(called.funs):
+					fun,overload = get_fun_out_of_called(ref)
 					if len(args) != len(fun.arg_types):
 						continue#continue searching
 					for actual_arg,arg in zip(args,fun.arg_types,strict=True):
 						if actual_arg != arg:
 							break#break to continue
 					else:
-						return fun#found fun
+						return fun,(idx,*overload)#found fun
 					continue
 				self.config.errors.critical_error(ET.CALL_MIX, place, f"did not find function to match '{','.join(map(str,args))}' contract in mix '{called.name}'")
 			self.config.errors.critical_error(ET.CALLABLE, place, f"'{called}' object is not callable")
-		fun = get_fun_out_of_called(function)
+		fun,overload = get_fun_out_of_called(function)
 		if len(fun.arg_types) != len(args):
 			self.config.errors.critical_error(ET.CALL_ARGS, place, f"function '{fun}' accepts {len(fun.arg_types)} arguments, provided {len(args)} arguments")
 		for idx, typ in enumerate(args):
 			needed = fun.arg_types[idx]
 			if typ != needed:
 				self.config.errors.add_error(ET.CALL_ARG, place, f"function '{fun}' argument {idx} takes '{needed}', got '{typ}'")
-		return fun.return_type
+		return fun,overload
 	def check_bin_exp(self, node:nodes.BinaryOperation) -> Type:
 		left = self.check(node.left)
 		right = self.check(node.right)
-		result = node.typ(left,right, self.config)
+		result = self.table.types[node.uid] = node.typ(left,right, self.config)
 		if self.semantic:
 			self.semantic_tokens.add(SemanticToken(node.operation.place,SemanticTokenType.OPERATOR,value_type=result))
 		return result
@@ -311,7 +338,7 @@ class TypeChecker:
 		self.names[node.name.operand] = value,node.name.place
 		return types.VOID
 	def check_unary_exp(self, node:nodes.UnaryExpression) -> Type:
-		result = node.typ(self.check(node.left), self.config)
+		result = self.table.types[node.uid] = node.typ(self.check(node.left), self.config)
 		if self.semantic:
 			self.semantic_tokens.add(SemanticToken(node.operation.place,SemanticTokenType.OPERATOR,value_type=result))
 		return result
@@ -328,19 +355,20 @@ class TypeChecker:
 			self.semantic_tokens.add(SemanticToken(node.name.place,SemanticTokenType.VARIABLE, (SemanticTokenModifier.DEFINITION,),types.INT))
 		return types.VOID
 	def check_struct(self, node:nodes.Struct) -> Type:
-		struct_type = types.Struct('',(),0,())
+		struct_type = types.nominal[node.uid] = types.Struct(node.name.operand,(),node.uid,())
 		self.type_names[node.name.operand] = struct_type,node.name.place
 		actual_struct_type = node.to_struct(self.check)
 		struct_type.__dict__ = actual_struct_type.__dict__#FIXME
 		del actual_struct_type
-		self.names[node.name.operand] = node.to_struct_kind(self.check),node.name.place
+		struct_kind = self.table.types[node.uid] = node.to_struct_kind(self.check, struct_type)
+		self.names[node.name.operand] = struct_kind,node.name.place
 		if self.semantic:
-			self.semantic_tokens.add(SemanticToken(node.name.place,SemanticTokenType.STRUCT, (SemanticTokenModifier.DEFINITION,),node.to_struct(self.check)))
+			self.semantic_tokens.add(SemanticToken(node.name.place,SemanticTokenType.STRUCT, (SemanticTokenModifier.DEFINITION,),struct_type))
 			for var in node.variables:
 				self.semantic_tokens.add(SemanticToken(var.name.place,SemanticTokenType.PROPERTY, (SemanticTokenModifier.DEFINITION,),self.check(var.typ)))
 		for fun in node.funs:
 			rt = self.check(fun.return_type) if fun.return_type is not None else types.VOID
-			self.check_bound_fun_helper(types.Ptr(node.to_struct(self.check)),fun,rt)
+			self.check_bound_fun_helper(types.Ptr(struct_type),fun,rt)
 			if fun.name.operand == '__init__':
 				if rt != types.VOID:
 					self.config.errors.critical_error(ET.INIT_MAGIC_RET, fun.return_type_place, f"'__init__' magic method should return '{types.VOID}', not '{fun.return_type}'")
@@ -397,25 +425,25 @@ class TypeChecker:
 				self.config.errors.critical_error(ET.DOT_MODULE, node.access.place, f"name '{node.access}' was not found in module '{origin.path}'")
 			return typ
 		if isinstance(origin, types.StructKind):
-			_, ty = node.lookup_struct_kind(origin, self.config)
+			_, ty = self.table.members[node.uid] = node.lookup_struct_kind(origin, self.config)
 			if self.semantic:
 				self.semantic_tokens.add(SemanticToken(node.access.place,SemanticTokenType.PROPERTY, value_type=ty))
 			return ty
 		if isinstance(origin, types.EnumKind):
-			_,typ = node.lookup_enum_kind(origin, self.config)
+			_,typ = self.table.members[node.uid] = node.lookup_enum_kind(origin, self.config)
 			if self.semantic:
 				self.semantic_tokens.add(SemanticToken(node.access.place,SemanticTokenType.ENUM_ITEM, value_type=typ))
 			return typ
 		if isinstance(origin,types.Ptr):
 			pointed = origin.pointed
 			if isinstance(pointed, types.Struct):
-				k = node.lookup_struct(pointed, self.config)
+				k = self.table.members[node.uid] = node.lookup_struct(pointed, self.config)
 				if isinstance(k[0],int):
 					typ = types.Ptr(k[1])
 				else:
 					typ = k[0]
 			elif isinstance(pointed, types.Enum):
-				fun,_ = node.lookup_enum(pointed, self.config)
+				fun,_ = self.table.members[node.uid] = node.lookup_enum(pointed, self.config)
 				typ = fun
 			else:
 				self.config.errors.critical_error(ET.DOT, node.access.place, f"'{origin}' object doesn't have any attributes")#same
@@ -552,12 +580,12 @@ class TypeChecker:
 			if self.semantic:
 				self.semantic_tokens.add(SemanticToken(node.match_as.place, SemanticTokenType.VARIABLE, (SemanticTokenModifier.DECLARATION,)))
 			for case in node.cases:
-				names_before = self.names.copy()
-				_, typ = node.lookup_enum(value, case, self.config)
+				self.names.push()
+				_, typ = self.table.members[case.uid] = node.lookup_enum(value, case, self.config)
 				self.semantic_tokens.add(SemanticToken(case.name.place, SemanticTokenType.ENUM_ITEM, value_type=typ))
 				self.names[node.match_as.operand] = typ,case.name.place
 				returns.append((self.check(case.body),case.place))
-				self.names = names_before
+				self.names.pop()
 			if node.default is not None:
 				returns.append((self.check(node.default),node.default.place))
 		else:
@@ -572,45 +600,180 @@ class TypeChecker:
 			return types.VOID
 		return right_ret
 	def check(self, node:Node) -> Type:
-		if type(node) == nodes.Assignment       : return self.check_assignment     (node)
-		if type(node) == nodes.BinaryOperation  : return self.check_bin_exp        (node)
-		if type(node) == nodes.Call             : return self.check_call           (node)
-		if type(node) == nodes.Cast             : return self.check_cast           (node)
-		if type(node) == nodes.CharNum          : return self.check_char_num       (node)
-		if type(node) == nodes.CharStr          : return self.check_char_str       (node)
-		if type(node) == nodes.Code             : return self.check_code           (node)
-		if type(node) == nodes.Const            : return self.check_const          (node)
-		if type(node) == nodes.Constant         : return self.check_constant       (node)
-		if type(node) == nodes.Declaration      : return self.check_declaration    (node)
-		if type(node) == nodes.Dot              : return self.check_dot            (node)
-		if type(node) == nodes.Enum             : return self.check_enum           (node)
-		if type(node) == nodes.ExprStatement    : return self.check_expr_state     (node)
-		if type(node) == nodes.FromImport       : return self.check_from_import    (node)
-		if type(node) == nodes.Fun              : return self.check_fun            (node)
-		if type(node) == nodes.If               : return self.check_if             (node)
-		if type(node) == nodes.Import           : return self.check_import         (node)
-		if type(node) == nodes.Int              : return self.check_int            (node)
-		if type(node) == nodes.Match            : return self.check_match          (node)
-		if type(node) == nodes.Mix              : return self.check_mix            (node)
-		if type(node) == nodes.ReferTo          : return self.check_refer          (node)
-		if type(node) == nodes.Return           : return self.check_return         (node)
-		if type(node) == nodes.Save             : return self.check_save           (node)
-		if type(node) == nodes.Set              : return self.check_set            (node)
-		if type(node) == nodes.Short            : return self.check_short          (node)
-		if type(node) == nodes.Str              : return self.check_str            (node)
-		if type(node) == nodes.StrCast          : return self.check_string_cast    (node)
-		if type(node) == nodes.Struct           : return self.check_struct         (node)
-		if type(node) == nodes.Subscript        : return self.check_get_item       (node)
-		if type(node) == nodes.Template         : return self.check_template       (node)
-		if type(node) == nodes.TypeArray        : return self.check_type_array     (node)
-		if type(node) == nodes.TypeDefinition   : return self.check_type_definition(node)
-		if type(node) == nodes.TypeFun          : return self.check_type_fun       (node)
-		if type(node) == nodes.TypePointer      : return self.check_type_pointer   (node)
-		if type(node) == nodes.TypeReference    : return self.check_type_reference (node)
-		if type(node) == nodes.UnaryExpression  : return self.check_unary_exp      (node)
-		if type(node) == nodes.Use              : return self.check_use            (node)
-		if type(node) == nodes.Var              : return self.check_var            (node)
-		if type(node) == nodes.VariableSave     : return self.check_variable_save  (node)
-		if type(node) == nodes.While            : return self.check_while          (node)
-		if type(node) == nodes.Assert           : return self.check_assert         (node)
-		assert False, f"Unreachable, unknown {type(node)=}"
+		return CHECK[type(node)](self, node)
+	def resolve_type(self, node:Node) -> Type:
+		typ = self.type_names.resolved.get(node.uid)
+		if typ is not None:
+			self.type_names.hits += 1
+			return typ
+		self.type_names.misses += 1
+		typ = self.type_names.resolved[node.uid] = self.table.types[node.uid] = RESOLVE_TYPE[type(node)](self, node)
+		return typ
+def module_graph(module:nodes.Module) -> dict[str, tuple[nodes.Module, tuple[str, ...]]]:
+	"""module path -> (module, paths of modules it imports) of every module, reachable from this one"""
+	graph:dict[str, tuple[nodes.Module, tuple[str, ...]]] = {}
+	queue = [module]
+	while len(queue) != 0:
+		module = queue.pop()
+		if module.path in graph:
+			continue
+		imports = module.imports
+		graph[module.path] = module, tuple(imported.path for imported in imports)
+		queue.extend(imports)
+	return graph
+
+def retain_checked_module(module:nodes.Module, config:Config) -> None:
+	checkers = config.session.checkers
+	config.session.checked_modules[module.path] = module, checkers[module.path], tuple((imported, checkers[imported.path]) for imported in module.imports)
+def reuse_checked_module(module:nodes.Module, config:Config) -> 'TypeChecker|ModuleInterface|None':
+	"""checker of the same module from an earlier compilation, if checkers of modules it imports are reused too"""
+	retained:Checked|None = config.session.checked_modules.use(module.path)
+	if retained is None or retained[0] is not module:
+		return None
+	_, tc, imports = retained
+	checkers = config.session.checkers
+	for imported, imported_tc in imports:
+		current = checkers.get(imported.path)
+		if current is None:
+			current = reuse_checked_module(imported, config)
+		if current is not imported_tc:
+			return None
+	checkers[module.path] = tc
+	return tc
+
+Interface = tuple[dict[str, tuple[Type,Place]], dict[str, tuple[Type,Place]], int, int]# names, type names, resolutions reused and computed
+def get_interface(tc:'TypeChecker|ModuleInterface') -> Interface:
+	return dict(tc.names), dict(tc.type_names), tc.type_names.hits, tc.type_names.misses
+def make_interface(interface:Interface, table:types.TypeTable) -> ModuleInterface:
+	names, type_names, hits, misses = interface
+	module_type_names:types.TypeNames[tuple[Type,Place]] = types.TypeNames()
+	module_type_names.update(type_names)
+	module_type_names.hits = hits
+	module_type_names.misses = misses
+	return ModuleInterface(names, module_type_names, table)
+
+worker_config:Config|None = None
+worker_modules:dict[str, nodes.Module] = {}
+def init_check_worker(config:Config, modules:dict[str, nodes.Module]) -> None:
+	global worker_config
+	worker_config = replace(config, verbose=False, jobs=1)
+	worker_modules.update(modules)
+def check_module(module_path:str, interfaces:dict[str, Interface]) -> tuple[Interface, types.TypeTable]|None:
+	"""check module in a worker, with interfaces of every module it depends on. None if there are any errors"""
+	assert worker_config is not None, "worker was not initialized"
+	config = replace(worker_config, errors=ErrorBin(silent=True))
+	checkers = config.session.checkers
+	for path, interface in interfaces.items():
+		if path not in checkers:
+			checkers[path] = make_interface(interface, types.TypeTable())
+	tc = TypeChecker(worker_modules[module_path], config)
+	try:
+		tc.go_check()
+	except ErrorExit:
+		return None
+	if len(config.errors.errors) != 0:
+		return None
+	return get_interface(tc), tc.table
+
+def check_imported_modules(module:nodes.Module, config:Config) -> None:
+	"""check modules, imported by the main module, on a process pool, each as soon as all of it's imports are checked.
+	Workers return names and type names, that the module exports, and it's type table, they are put into checkers of the session.
+	Modules with errors (and modules that import them) are left to the main process, to report errors in the same order, as without the pool.
+	Only whole modules are checked in parallel: tops are checked in one pass, body of a function sees only names, defined above it,
+	so bodies of a module are checked one after another (main module is checked in the main process)"""
+	checkers = config.session.checkers
+	graph = module_graph(module)
+	del graph[module.path]
+	for imported, _ in graph.values():
+		if imported.path not in checkers:
+			reuse_checked_module(imported, config)
+	unchecked = [path for path in graph if path not in checkers]
+	if len(unchecked) < config.parallel_check_modules:
+		return
+	pending = {path:{imported for imported in imports if imported in graph} for path, (_, imports) in graph.items()}
+	dependents:dict[str, list[str]] = {path:[] for path in graph}
+	for path, imports in pending.items():
+		for imported in imports:
+			dependents[imported].append(path)
+	depends_on:dict[str, set[str]] = {}# path -> every module it depends on, directly or not
+	def dependencies(path:str) -> set[str]:
+		if path not in depends_on:
+			depends_on[path] = set(pending[path])
+			for imported in pending[path]:
+				depends_on[path] |= dependencies(imported)
+		return depends_on[path]
+	if config.verbose:
+		print(f"INFO: Type checking {len(unchecked)} modules on {config.jobs} processes")
+	interfaces = {path:get_interface(checkers[path]) for path in graph if path in checkers}
+	tables:dict[str, types.TypeTable] = {}
+	waiting = {path:pending[path]-interfaces.keys() for path in unchecked}
+	running:dict[Future[tuple[Interface, types.TypeTable]|None], str] = {}
+	with ProcessPoolExecutor(max_workers=config.jobs, mp_context=pool_context(), initializer=init_check_worker, initargs=(config, {path:graph[path][0] for path in graph})) as pool:
+		while len(waiting) != 0 or len(running) != 0:
+			for path in [path for path, imports in waiting.items() if len(imports) == 0]:
+				del waiting[path]
+				if all(imported in interfaces for imported in pending[path]):
+					running[pool.submit(check_module, path, {imported:interfaces[imported] for imported in dependencies(path)})] = path
+			if len(running) == 0:
+				break# what is left imports modules with errors
+			done, _ = wait(running, return_when=FIRST_COMPLETED)
+			for future in done:
+				path = running.pop(future)
+				result = future.result() if future.exception() is None else None
+				if result is not None:
+					interfaces[path], tables[path] = result
+				for dependent in dependents[path]:
+					waiting.get(dependent, set()).discard(path)
+	for path, module_table in tables.items():
+		checkers[path] = make_interface(interfaces[path], module_table)
+	for path in tables:
+		retain_checked_module(graph[path][0], config)
+CHECK:'nodes.Dispatch[TypeChecker, Type]' = nodes.Dispatch('TypeChecker.check', {
+	nodes.Assignment      : TypeChecker.check_assignment,
+	nodes.BinaryOperation : TypeChecker.check_bin_exp,
+	nodes.Call            : TypeChecker.check_call,
+	nodes.Cast            : TypeChecker.check_cast,
+	nodes.CharNum         : TypeChecker.check_char_num,
+	nodes.CharStr         : TypeChecker.check_char_str,
+	nodes.Code            : TypeChecker.check_code,
+	nodes.Const           : TypeChecker.check_const,
+	nodes.Constant        : TypeChecker.check_constant,
+	nodes.Declaration     : TypeChecker.check_declaration,
+	nodes.Dot             : TypeChecker.check_dot,
+	nodes.Enum            : TypeChecker.check_enum,
+	nodes.ExprStatement   : TypeChecker.check_expr_state,
+	nodes.FromImport      : TypeChecker.check_from_import,
+	nodes.Fun             : TypeChecker.check_fun,
+	nodes.If              : TypeChecker.check_if,
+	nodes.Import          : TypeChecker.check_import,
+	nodes.Int             : TypeChecker.check_int,
+	nodes.Match           : TypeChecker.check_match,
+	nodes.Mix             : TypeChecker.check_mix,
+	nodes.ReferTo         : TypeChecker.check_refer,
+	nodes.Return          : TypeChecker.check_return,
+	nodes.Save            : TypeChecker.check_save,
+	nodes.Set             : TypeChecker.check_set,
+	nodes.Short           : TypeChecker.check_short,
+	nodes.Str             : TypeChecker.check_str,
+	nodes.StrCast         : TypeChecker.check_string_cast,
+	nodes.Struct          : TypeChecker.check_struct,
+	nodes.Subscript       : TypeChecker.check_get_item,
+	nodes.Template        : TypeChecker.check_template,
+	nodes.TypeArray       : TypeChecker.resolve_type,
+	nodes.TypeDefinition  : TypeChecker.check_type_definition,
+	nodes.TypeFun         : TypeChecker.resolve_type,
+	nodes.TypePointer     : TypeChecker.resolve_type,
+	nodes.TypeReference   : TypeChecker.resolve_type,
+	nodes.UnaryExpression : TypeChecker.check_unary_exp,
+	nodes.Use             : TypeChecker.check_use,
+	nodes.Var             : TypeChecker.check_var,
+	nodes.VariableSave    : TypeChecker.check_variable_save,
+	nodes.While           : TypeChecker.check_while,
+	nodes.Assert          : TypeChecker.check_assert,
+})
+RESOLVE_TYPE:'nodes.Dispatch[TypeChecker, Type]' = nodes.Dispatch('TypeChecker.resolve_type', {
+	nodes.TypeArray     : TypeChecker.check_type_array,
+	nodes.TypeFun       : TypeChecker.check_type_fun,
+	nodes.TypePointer   : TypeChecker.check_type_pointer,
+	nodes.TypeReference : TypeChecker.check_type_reference,
+})
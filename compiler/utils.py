@@ -1,12 +1,21 @@
+import gc
 import os
-from .primitives import nodes, Config, extract_file_text_from_file_path, Place, MAIN_MODULE_PATH, ET
+import re
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import replace
+from .primitives import nodes, Config, ErrorBin, ErrorExit, extract_file_text_from_file_path, index_lines, Place, MAIN_MODULE_PATH, ET, WORD_FIRST_CHAR_ALPHABET, WORD_ALPHABET, packets, pool_context
 from . import lexer
 from . import parser
+from . import cache
 __all__ = [
 	"dump_tokens",
 	"dump_module",
 	"extract_module_from_file_path",
 	"generate_assembly",
+	"import_graph",
+	"program_graph",
+	"prefetch_modules",
 ]
 def dump_module(module:nodes.Module, config:Config) -> None:
 	if not config.dump:
@@ -16,15 +25,28 @@ def dump_module(module:nodes.Module, config:Config) -> None:
 	config.errors.exit_properly(0)
 
 
-parsed_modules:dict[str, nodes.Module] = {}
-import_stack:list[str] = []
 def extract_module_from_file_path(file_path:str, config:Config, module_path:str|None = None, place:'Place|None' = None) -> 'nodes.Module|None':
+	if module_path is None:
+		packets.check()
+		with config.session:
+			if config.jobs > 1:
+				graph = dict(program_graph(config)) if file_path == config.file else import_graph(file_path)
+				del graph[MAIN_MODULE_PATH]
+				if len(graph) >= config.parallel_parse_modules:# fewer modules are parsed faster, than the pool starts
+					if config.use_cache:
+						prefetch_modules(graph, config)
+					else:
+						with tempfile.TemporaryDirectory(prefix='jararaca-') as cache_dir:# modules get from workers only through cache
+							scratch_config = replace(config, use_cache=True, cache_dir=cache_dir)
+							prefetch_modules(graph, scratch_config)
+							return extract_module_from_file_path(file_path, scratch_config, MAIN_MODULE_PATH, place)
+			return extract_module_from_file_path(file_path, config, MAIN_MODULE_PATH, place)
+	parsed_modules, import_stack = config.session.parsed_modules, config.session.import_stack
 	if module_path in parsed_modules:
 		return parsed_modules[module_path]
 	if module_path in import_stack:
 		config.errors.add_error(ET.CIRCULAR_IMPORT, place, f"""Detected circular import: {' -> '.join(f"'{path}'" for path in import_stack[import_stack.index(module_path):])} -> '{module_path}'""")
 		return None
-	module_path = MAIN_MODULE_PATH if module_path is None else module_path
 	if not os.path.exists(file_path):
 		config.errors.add_error(ET.MODULE, place, f"module '{module_path}' was not found at '{file_path}'")
 		return None
@@ -33,8 +55,18 @@ def extract_module_from_file_path(file_path:str, config:Config, module_path:str|
 		config.errors.show_errors()
 		print(f"INFO: Extracting module '{module_path}' from file '{file_path}'")
 	text = extract_file_text_from_file_path(file_path)
-	tokens = lexer.lex(text, config, file_path)
-	module:nodes.Module = parser.Parser(tokens, config, module_path).parse()
+	cached = cache.load_module(config, file_path, module_path, text)
+	if cached is not None:
+		module = cached
+		index_lines(file_path, text)# not lexed, but errors can be reported in it
+		if config.verbose:
+			print(f"INFO: Module '{module_path}' is loaded from cache")
+	else:
+		errors_before = len(config.errors.errors)
+		tokens = lexer.stream(text, config, file_path)
+		module = parser.Parser(tokens, config, module_path).parse()
+		if len(config.errors.errors) == errors_before:
+			cache.store_module(module, config, file_path, text)
 	parsed_modules[module_path] = module
 	m = import_stack.pop()
 	assert m is module_path, "something gone wrong"
@@ -46,3 +78,102 @@ def extract_module_from_file_path(file_path:str, config:Config, module_path:str|
 		assert len(import_stack) == 0, "import stack was not decreased"
 	return module
 
+IMPORT_PATTERN = re.compile(f"^[ \\t]*(?:import|from)[ \\t]+([{re.escape(WORD_FIRST_CHAR_ALPHABET)}][{re.escape(WORD_ALPHABET+'.')}]*)", re.MULTILINE)
+def import_graph(file_path:str) -> dict[str, tuple[str, tuple[str, ...]]]:
+	"""module path -> (file path, imported module paths) of every module, reachable from the main module.
+	It is a scan of the text, not a parse: anything that looks like an import is included, unresolvable modules are left out"""
+	graph:dict[str, tuple[str, tuple[str, ...]]] = {}
+	queue = [(MAIN_MODULE_PATH, file_path)]
+	files = {MAIN_MODULE_PATH:file_path}
+	while len(queue) != 0:
+		module_path, module_file = queue.pop()
+		text = extract_file_text_from_file_path(module_file)
+		imports:list[str] = []
+		for imported in ('std.builtin', *(match.group(1).strip('.') for match in IMPORT_PATTERN.finditer(text))):
+			if imported in imports or imported == module_path:
+				continue
+			imported_file = files.get(imported) or packets.resolve(imported)
+			if imported_file is None or not os.path.isfile(imported_file):
+				continue
+			imports.append(imported)
+			if imported not in files:
+				files[imported] = imported_file
+				queue.append((imported, imported_file))
+		graph[module_path] = module_file, tuple(imports)
+	return graph
+
+def program_graph(config:Config) -> dict[str, tuple[str, tuple[str, ...]]]:
+	"""import graph of the main file of the config. It is scanned once per compilation: session keeps it, until the compilation ends,
+	so the build cache, watch and prefetching of modules share it"""
+	graph = config.session.graph
+	if graph is None or graph[0] != config.file:
+		graph = config.session.graph = config.file, import_graph(config.file)
+	return graph[1]
+
+worker_config:Config|None = None
+def init_module_worker(config:Config) -> None:
+	global worker_config
+	gc.disable()# worker lives only while modules are prefetched, and parsing makes no garbage cycles
+	worker_config = replace(config, verbose=False, jobs=1)
+def parse_module(module_path:str, file_path:str) -> bool:
+	"""parse module in a worker, it is passed to the main process through the cache"""
+	assert worker_config is not None, "worker was not initialized"
+	config = replace(worker_config, errors=ErrorBin(silent=True))
+	try:
+		with config.session:
+			module = extract_module_from_file_path(file_path, config, module_path)
+	except ErrorExit:
+		return False
+	finally:
+		config.session.import_stack.clear()
+	return module is not None and len(config.errors.errors) == 0
+
+def prefetch_modules(graph:dict[str, tuple[str, tuple[str, ...]]], config:Config) -> None:
+	"""parse modules of the import graph (without the main module), on a process pool, each as soon as all of it's imports are parsed.
+	Pool is not started, if fewer than `parallel_parse_modules` modules are stale.
+	Parsed modules are put into the cache, from where the main process takes them in it's usual order, so uids are the same.
+	Modules in import cycles (and modules that import them) are left to the main process, to report the error.
+	Modules that fail to parse are not cached, and are parsed again in the main process, to report the errors"""
+	pending = {module_path:{imported for imported in imports if imported in graph} for module_path, (_, imports) in graph.items()}
+	dependents:dict[str, list[str]] = {module_path:[] for module_path in graph}
+	for module_path, imports in pending.items():
+		for imported in imports:
+			dependents[imported].append(module_path)
+	stale:set[str] = set()# module is stale, if it is not in cache, or anything it imports is stale
+	order:list[str] = []
+	ready = [module_path for module_path, imports in pending.items() if len(imports) == 0]
+	remaining = {module_path:len(imports) for module_path, imports in pending.items()}
+	while len(ready) != 0:
+		module_path = ready.pop()
+		order.append(module_path)
+		module_file = graph[module_path][0]
+		if any(imported in stale for imported in pending[module_path]) or not cache.has_entry(config, module_file, module_path, extract_file_text_from_file_path(module_file)):
+			stale.add(module_path)
+		for dependent in dependents[module_path]:
+			remaining[dependent] -= 1
+			if remaining[dependent] == 0:
+				ready.append(dependent)
+	if len(stale) < config.parallel_parse_modules or len(stale) == 0:
+		return
+	if config.verbose:
+		print(f"INFO: Parsing {len(stale)} modules on {config.jobs} processes")
+	running:dict[Future[bool], str] = {}
+	failed:set[str] = set()# modules, that import failed modules, would fail too
+	waiting = {module_path:{imported for imported in pending[module_path] if imported in stale} for module_path in order if module_path in stale}
+	with ProcessPoolExecutor(max_workers=config.jobs, mp_context=pool_context(), initializer=init_module_worker, initargs=(config,)) as pool:
+		while len(waiting) != 0 or len(running) != 0:
+			for module_path in [module_path for module_path, imports in waiting.items() if len(imports) == 0]:
+				del waiting[module_path]
+				if pending[module_path] & failed:
+					failed.add(module_path)
+				else:
+					running[pool.submit(parse_module, module_path, graph[module_path][0])] = module_path
+			if len(running) == 0:
+				continue
+			done, _ = wait(running, return_when=FIRST_COMPLETED)
+			for future in done:
+				module_path = running.pop(future)
+				if future.exception() is not None or not future.result():
+					failed.add(module_path)
+				for dependent in dependents[module_path]:
+					waiting.get(dependent, set()).discard(module_path)
@@ -0,0 +1,75 @@
+import os
+import subprocess
+import sys
+import time
+from dataclasses import replace
+from typing import NoReturn
+
+from .primitives import Config, ErrorBin, packets
+from .utils import program_graph
+from . import build
+__all__ = [
+	"watch",
+]
+WATCH_INTERVAL = 0.1# seconds between checks of watched files
+
+Stamp = tuple[int, int]|None# modification time and size, None if file is missing
+def stamp(file_path:str) -> Stamp:
+	try:
+		stat = os.stat(file_path)
+	except OSError:
+		return None
+	return stat.st_mtime_ns, stat.st_size
+
+def watched_files(config:Config) -> dict[str, Stamp]:
+	"""main file, files of every module it imports (directly or not) and packet index, with their stamps.
+	Compilation, that follows, takes the import graph from the session"""
+	files = [config.file, packets.index_path]
+	try:
+		files.extend(file_path for file_path, _ in program_graph(config).values())
+	except OSError:
+		pass# main file is missing, it is reported by compilation
+	return {file_path:stamp(file_path) for file_path in files}
+
+def compile_once(config:Config) -> list[str]|None:
+	"""compile with fresh errors. Errors are shown, but do not stop watching"""
+	config = replace(config, errors=ErrorBin(config.silent))
+	start = time.perf_counter()
+	try:
+		command = build(config)
+	except SystemExit:
+		return None
+	print(f"INFO: Compiled '{config.file}' in {time.perf_counter()-start:.3f}s", flush=True)
+	return command
+
+def stop(program:'subprocess.Popen[bytes]|None') -> None:
+	if program is not None and program.poll() is None:
+		program.terminate()
+		program.wait()
+
+def watch(config:Config) -> NoReturn:
+	"""compile every time the main file or any module it imports changes. Modules, that did not change, are reused from the session of the config.
+	Program is run (if it should be) after every compilation, and stopped, when anything changes"""
+	program:subprocess.Popen[bytes]|None = None
+	try:
+		while True:
+			files = watched_files(config)# before compilation, so changes made during it are noticed
+			command = compile_once(config)
+			if command is not None:
+				if config.verbose:
+					print(f"INFO: running '{' '.join(command)}'")
+				try:
+					program = subprocess.Popen(command)
+				except OSError as error:
+					print(f"ERROR: could not run '{command[0]}': {error.strerror}", file=sys.stderr, flush=True)
+			print(f"INFO: Watching {len(files)} files for changes (^C to stop)", flush=True)
+			while all(stamp(file_path) == file_stamp for file_path, file_stamp in files.items()):
+				if program is not None and program.poll() is not None:
+					print(f"INFO: Program exited with code {program.returncode}", flush=True)
+					program = None
+				time.sleep(WATCH_INTERVAL)
+			stop(program)
+			program = None
+	except KeyboardInterrupt:
+		stop(program)
+	sys.exit(0)
@@ -1,7 +1,48 @@
 #!/bin/env python3.10
 import os
+import sys
+VALUE_FLAGS = {'--output', '--pack', '--jobs', '--parallel-lex-size', '--parallel-parse-modules', '--parallel-check-modules', '--cache-dir', '--manifest', '--toolchain'}# flags, that take the next argument, same as VALUE_FLAGS of the compiler (it is not imported, so the client starts fast)
+SERVER_ENVIRONMENT = ('JARARACA_PATH', 'PATH')# same as CLIENT_ENVIRONMENT of the compiler
+def compiler_flags(args:list[str]) -> set[str]:
+	"""flags for the compiler, that are before the source file, arguments after it are for the program"""
+	flags:set[str] = set()
+	idx = 0
+	while idx < len(args) and args[idx][:1] == '-':
+		flags.add(args[idx])
+		if args[idx] in VALUE_FLAGS or args[idx][:2] == '-o':
+			idx += 1
+		idx += 1
+	return flags
+def compile_with_server(socket_path:str) -> None:
+	"""compile with the compile server (`jararaca.py --serve`), if it runs. Returns, if it does not"""
+	import json
+	import socket
+	import struct
+	try:
+		connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		connection.connect(socket_path)
+	except OSError:
+		return
+	with connection:
+		request = json.dumps({'argv':sys.argv, 'cwd':os.getcwd(), 'env':{name:os.environ[name] for name in SERVER_ENVIRONMENT if name in os.environ}}).encode()
+		socket.send_fds(connection, [struct.pack('!I', len(request))], [1, 2])
+		connection.sendall(request)
+		reply = b''
+		while chunk := connection.recv(4096):
+			reply += chunk
+	if reply == b'':
+		print("ERROR: compile server closed the connection", file=sys.stderr)
+		sys.exit(1)
+	result = json.loads(reply)
+	if 'exec' in result:
+		os.execvp(result['exec'][0], result['exec'])
+	if 'exit' in result:
+		sys.exit(result['exit'])
+	# server was restarted, compile without it
 if __name__ == '__main__':
 	os.environ['JARARACA_PATH'] = os.path.dirname(os.path.realpath(__file__))
+	if sys.argv[1:] != ['--serve'] and not {'--watch', '--batch', '--manifest'} & compiler_flags(sys.argv[1:]) and os.path.exists(socket_path := os.path.join(os.environ['JARARACA_PATH'], 'cache', 'server.sock')):# same as SERVER_SOCKET_PATH of the compiler
+		compile_with_server(socket_path)
 	try:
 		from jararaca.compiler import main
 		main()
@@ -12,4 +53,4 @@ from compiler import main
 main()\
 """) #'type: ignore' does not help
 # mypy thinks that since this folder has __init__.py, it will always be a module (jararaca)
-# but when running this script (__name__ == '__main__') that is not what actually happening
\ No newline at end of file
+# but when running this script (__name__ == '__main__') that is not what actually happening
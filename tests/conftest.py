@@ -0,0 +1,5 @@
+import os
+import sys
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ['JARARACA_PATH'] = ROOT
+sys.path.insert(0, ROOT)
@@ -0,0 +1,122 @@
+"""fixed outputs of the compiler: sha256 of tokens, ast and llvm ir of examples, std and test programs, stored in outputs.json.
+Every output is made by a separate process, so uids are the same, as in a compilation from the command line.
+	python3 tests/outputs.py          : check every output
+	python3 tests/outputs.py --update : store outputs of the current compiler as fixed (only after an intended change)"""
+import dataclasses
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Any, Callable
+__all__ = [
+	"FILES",
+	"output",
+	"check",
+]
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXED_PATH = os.path.join(ROOT, 'tests', 'outputs.json')
+def files(*patterns:str) -> list[str]:
+	return [file for pattern in patterns for file in sorted(glob.glob(pattern, root_dir=ROOT))]
+FILES:dict[str, list[str]] = {# kind of output -> files (relative to the root), it is fixed for
+	'tokens':files('examples/*.ja', 'foo.ja', 'std/*.ja', 'tests/lexer/*.ja'),
+	'ast':files('examples/*.ja', 'foo.ja', 'tests/parser/*.ja'),
+	'ir':files('examples/*.ja', 'foo.ja', 'tests/parser/consts.ja', 'tests/type_checker/*.ja'),
+}
+
+def dump_tokens(file:str) -> str:
+	from compiler.lexer import lex
+	from compiler.primitives import Config, ErrorBin, extract_file_text_from_file_path
+	errors = ErrorBin(silent=True)
+	lines = []
+	for token in lex(extract_file_text_from_file_path(file), Config.use_defaults(errors, file, jobs=1, use_cache=False), file):
+		start, end = token.place.start, token.place.end
+		lines.append(f"{(token.typ.name, token.operand, start.idx, start.line, start.cols, end.idx, end.line, end.cols)!r}\n")
+	lines.extend(f"ERR {error}\n" for error in errors.errors)
+	return ''.join(lines)
+def dump_ast(file:str) -> str:
+	"""the module as text, then type, uid and place of every node of it, in order"""
+	from compiler.primitives import Config, ErrorBin, ErrorExit, Node
+	from compiler.utils import extract_module_from_file_path
+	errors = ErrorBin(silent=True)
+	try:
+		module = extract_module_from_file_path(file, Config.use_defaults(errors, file, jobs=1, use_cache=False))
+	except ErrorExit:
+		module = None
+	lines = [] if module is None else [f"{module}\n"]
+	def walk(value:Any) -> None:
+		if isinstance(value, tuple|list):
+			for item in value:
+				walk(item)
+		elif isinstance(value, Node):
+			lines.append(f"{type(value).__name__} {value.uid} {value.place.start.idx}-{value.place.end.idx}\n")
+			for node_field in dataclasses.fields(value):
+				walk(getattr(value, node_field.name))# imported modules are not nodes, they are not walked
+	if module is not None:
+		walk(module.tops)
+	lines.extend(f"ERR {error}\n" for error in errors.errors)
+	return ''.join(lines)
+def dump_ir(file:str) -> str:
+	"""llvm ir of the program, or diagnostics of the type checker, if it has errors"""
+	from compiler import generate
+	from compiler.primitives import Config, ErrorBin, ErrorExit
+	errors = ErrorBin(silent=True)
+	try:
+		text = generate(Config.use_defaults(errors, file, jobs=1, use_cache=False))
+	except ErrorExit:
+		text = ''
+	return text+''.join(f"ERR {error}\n" for error in errors.errors)
+DUMPS:dict[str, Callable[[str], str]] = {
+	'tokens':dump_tokens,
+	'ast':dump_ast,
+	'ir':dump_ir,
+}
+
+def output(kind:str, file:str) -> str:
+	"""output of that kind for the file, made by a new process"""
+	process = subprocess.run([sys.executable, __file__, '--dump', kind, file], cwd=ROOT, env={**os.environ, 'JARARACA_PATH':ROOT}, capture_output=True, check=False)
+	if process.returncode != 0:
+		raise AssertionError(f"dumping {kind} of '{file}' failed:\n{process.stderr.decode()}")
+	return process.stdout.decode()
+def digest(text:str) -> str:
+	return hashlib.sha256(text.encode()).hexdigest()
+def load_fixed() -> dict[str, dict[str, str]]:
+	with open(FIXED_PATH, encoding='utf-8') as file:
+		fixed:dict[str, dict[str, str]] = json.load(file)
+	return fixed
+
+def check(kind:str, file:str) -> None:
+	"""fail, if output differs from the fixed one. It is written to a temporary file then, to compare"""
+	text = output(kind, file)
+	if digest(text) != load_fixed().get(kind, {}).get(file):
+		path = os.path.join(tempfile.gettempdir(), f"jararaca-{kind}-{file.replace('/', '_')}")
+		with open(path, 'w', encoding='utf-8') as changed:
+			changed.write(text)
+		raise AssertionError(f"{kind} of '{file}' is not the fixed one (it is written to '{path}'), if the change is intended, run `python3 tests/outputs.py --update`")
+
+def main() -> None:
+	if sys.argv[1:2] == ['--dump']:
+		kind, file = sys.argv[2:4]
+		sys.path.insert(0, ROOT)
+		os.chdir(ROOT)
+		sys.stdout.buffer.write(DUMPS[kind](file).encode())
+		return
+	if sys.argv[1:] == ['--update']:
+		with open(FIXED_PATH, 'w', encoding='utf-8') as fixed:
+			json.dump({kind:{file:digest(output(kind, file)) for file in kind_files} for kind, kind_files in FILES.items()}, fixed, indent='\t')
+			fixed.write('\n')
+		return
+	failed = 0
+	for kind, kind_files in FILES.items():
+		for file in kind_files:
+			try:
+				check(kind, file)
+			except AssertionError as error:
+				print(error, file=sys.stderr)
+				failed += 1
+	print(f"{failed} of {sum(len(kind_files) for kind_files in FILES.values())} outputs changed")
+	sys.exit(failed != 0)
+if __name__ == '__main__':
+	main()
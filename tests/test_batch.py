@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+from compiler import batch
+from compiler.primitives import CompilationSession, Config, ErrorBin
+
+EXAMPLES = os.path.join(os.environ['JARARACA_PATH'], 'examples')
+
+@pytest.mark.parametrize('jobs', (1, 2))
+def test_crash_fails_only_its_program(jobs:int, monkeypatch:pytest.MonkeyPatch, capsys:pytest.CaptureFixture[str]) -> None:
+	"""internal error of the compiler on one program is reported for it, other programs of the batch are compiled"""
+	files = [os.path.join(EXAMPLES, name) for name in ('add.ja', 'fibonacci.ja', 'rule110.ja', 'HelloWorld.ja')]
+	generate = batch.generate
+	def crashing_generate(config:Config) -> str:
+		if config.file == files[1]:
+			raise RecursionError('maximum recursion depth exceeded')
+		return generate(config)
+	assembled:list[str] = []
+	monkeypatch.setattr(batch, 'generate', crashing_generate)
+	monkeypatch.setattr(batch, 'run_assembler', lambda config, text: assembled.append(config.file))
+	config = Config.use_defaults(ErrorBin(silent=True), files[0], jobs=jobs, batch=files, use_cache=False, session=CompilationSession())
+	with pytest.raises(SystemExit) as stop:
+		batch.compile_batch(config)
+	assert stop.value.code == 1
+	assert sorted(assembled) == sorted(files[:1]+files[2:])
+	err = capsys.readouterr().err
+	assert f"ERROR: compilation of '{files[1]}' crashed: RecursionError" in err and 'Traceback' in err
+	assert f"'{files[1]}' failed with exit code 1" in err and "1 of 4 programs failed" in err
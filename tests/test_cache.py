@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+from compiler import cache
+from compiler.primitives import CompilationSession, Config, ErrorBin, packets
+
+def session_config(session:CompilationSession, tmp_path:str) -> Config:
+	return Config.use_defaults(ErrorBin(silent=True), os.path.join(tmp_path, 'main.ja'), session=session)
+
+def test_fingerprint_follows_packets(tmp_path:str, monkeypatch:pytest.MonkeyPatch) -> None:
+	"""fingerprint, remembered by a long-lived session, changes, when a packet is registered"""
+	config = session_config(CompilationSession(), tmp_path)
+	monkeypatch.setattr(packets, 'path', os.path.join(tmp_path, 'packets'))
+	packets.load()
+	before = cache.compiler_fingerprint(config)
+	assert cache.compiler_fingerprint(config) == before
+	os.mkdir(os.path.join(tmp_path, 'lib'))
+	packets.pack(os.path.join(tmp_path, 'lib'))
+	assert cache.compiler_fingerprint(config) != before
+	monkeypatch.undo()
+	packets.load()
+
+def test_file_hashes_are_retained_by_session(tmp_path:str) -> None:
+	session = CompilationSession(retained_modules=2)
+	config = session_config(session, tmp_path)
+	files = [os.path.join(tmp_path, f"{idx}.ja") for idx in range(3)]
+	for idx, file_path in enumerate(files):
+		with open(file_path, 'w', encoding='utf-8') as file:
+			file.write(f"const A {idx}\n")
+	hashes = [cache.file_hash(config, file_path) for file_path in files]
+	assert list(session.file_hashes) == files[1:]
+	assert cache.file_hash(config, files[0]) == hashes[0]
+	with open(files[0], 'a', encoding='utf-8') as file:
+		file.write('\n')
+	assert cache.file_hash(config, files[0]) != hashes[0]
+	assert len(CompilationSession().file_hashes) == 0# sessions share nothing
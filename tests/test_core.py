@@ -0,0 +1,34 @@
+import os
+
+import pytest
+
+from compiler.primitives import ET, ErrorBin, ErrorExit, PacketRegistry, process_cmd_args
+
+def test_packet_lookups_follow_directories(tmp_path:str) -> None:
+	"""module, that became a directory, and a new directory of modules are found by the same registry (as in --watch and --serve)"""
+	lib = os.path.join(tmp_path, 'lib')
+	os.mkdir(lib)
+	with open(os.path.join(lib, 'shapes.ja'), 'w', encoding='utf-8') as file:
+		file.write('\n')
+	registry = PacketRegistry(os.path.join(tmp_path, 'packets'))
+	registry.pack(lib)
+	assert registry.resolve('lib.shapes') == os.path.join(lib, 'shapes.ja')
+	assert registry.resolve('lib.extra.more') is None
+	registry.check()
+	assert registry.resolve('lib.shapes') == os.path.join(lib, 'shapes.ja')
+	os.remove(os.path.join(lib, 'shapes.ja'))
+	os.mkdir(os.path.join(lib, 'shapes'))
+	os.mkdir(os.path.join(lib, 'extra'))
+	registry.check()
+	assert registry.resolve('lib.shapes') == os.path.join(lib, 'shapes', '__init__.ja')
+	assert registry.resolve('lib.extra.more') == os.path.join(lib, 'extra', 'more.ja')
+
+def test_separate_toolchains() -> None:
+	"""modules are compiled separately by clang, toolchains that can not do it are named in the error"""
+	assert process_cmd_args(ErrorBin(silent=True), ['jararaca.py', '--toolchain', 'clang', '--separate', 'prog.ja']).toolchain == 'clang'
+	assert process_cmd_args(ErrorBin(silent=True), ['jararaca.py', '--separate', 'prog.ja']).toolchain == 'clang'
+	for toolchain in ('opt', 'lli'):
+		eb = ErrorBin(silent=True)
+		with pytest.raises(ErrorExit):
+			process_cmd_args(eb, ['jararaca.py', '--separate', '--toolchain', toolchain, 'prog.ja'])
+		assert [error.typ for error in eb.errors] == [ET.CMD_SEPARATE] and 'opt and lli' in eb.errors[0].msg
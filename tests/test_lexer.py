@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+import outputs
+from compiler.lexer import lex
+from compiler.primitives import CompilationSession, Config, ErrorBin, ET, TT
+
+@pytest.mark.parametrize('file', outputs.FILES['tokens'])
+def test_tokens(file:str) -> None:
+	"""kind, operand, start and end (index, line and column) of every token, and lexer errors"""
+	outputs.check('tokens', file)
+
+def test_unterminated_block_comment() -> None:
+	errors = ErrorBin(silent=True)
+	tokens = lex('x /* comment', Config.use_defaults(errors, 'comment.ja', jobs=1, use_cache=False), 'comment.ja')
+	assert [token.typ for token in tokens] == [TT.WORD, TT.EOF]
+	assert [error.typ for error in errors.errors] == [ET.EOF]
+
+def test_line_indexes_are_retained_by_session(tmp_path:str) -> None:
+	"""session keeps indexes of the latest files, location in a file, which index was evicted, is found from the file"""
+	session = CompilationSession(retained_modules=2)
+	files = [os.path.join(tmp_path, f"{idx}.ja") for idx in range(3)]
+	with session:
+		tokens = []
+		for idx, file_path in enumerate(files):
+			text = '\n'*idx+'x\n'
+			with open(file_path, 'w', encoding='utf-8') as file:
+				file.write(text)
+			tokens.extend(token for token in lex(text, Config.use_defaults(ErrorBin(silent=True), file_path, jobs=1, use_cache=False, session=session), file_path) if token.typ is TT.WORD)
+		assert list(session.line_indexes) == files[1:]
+		assert [(token.place.start.line, token.place.start.cols) for token in tokens] == [(1, 1), (2, 1), (3, 1)]
+	assert len(CompilationSession().line_indexes) == 0
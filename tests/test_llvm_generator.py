@@ -0,0 +1,51 @@
+import pytest
+
+import outputs
+from compiler.llvm_generator import IR
+from compiler.primitives import nodes
+
+@pytest.mark.parametrize('file', outputs.FILES['ir'])
+def test_ir(file:str) -> None:
+	"""llvm ir of programs (both passes visit every node of them), and diagnostics of programs with type errors"""
+	outputs.check('ir', file)
+
+def test_dispatch_of_unknown_node() -> None:
+	table:'nodes.Dispatch[object, int]' = nodes.Dispatch('test', {nodes.Int:lambda _, node:1})
+	assert table[nodes.Int](None, None) == 1
+	with pytest.raises(AssertionError, match="Unreachable, unknown .*Str.* in test"):
+		table[nodes.Str]
+
+def test_ir_chunks() -> None:
+	"""appended ir is kept, not copied, so text appended to it later is still in order"""
+	text = IR()
+	text += 'a'
+	function = IR()
+	text += function
+	text += 'd'
+	function += 'b'
+	function += 'c'
+	assert text.chunks[1] is function
+	assert list(text) == ['a', 'b', 'c', 'd']
+	assert str(text) == 'abcd'
+
+def test_deeply_nested_ir() -> None:
+	text = inner = IR()
+	for _ in range(100_000):
+		nested = IR()
+		inner += nested
+		inner = nested
+	inner += 'x'
+	assert str(text) == 'x'
+
+def test_ir_write() -> None:
+	"""ir with write passes chunks through, nested ir is written in order"""
+	written:list[str] = []
+	text = IR(written.append)
+	function = IR()
+	function += 'b'
+	function += 'c'
+	text += 'a'
+	text += function
+	text += 'd'
+	assert written == ['a', 'b', 'c', 'd']
+	assert text.chunks == []
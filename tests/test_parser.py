@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+import outputs
+from compiler.lexer import Lexer, STREAM_BATCH, lex_store
+from compiler.parser import Parser
+from compiler.primitives import Config, ErrorBin, ET, TT, extract_file_text_from_file_path
+from compiler.utils import extract_module_from_file_path
+
+@pytest.mark.parametrize('file', outputs.FILES['ast'])
+def test_ast(file:str) -> None:
+	"""printed module, and type, uid and place of every node, so precedence, associativity and order of node creation are fixed"""
+	outputs.check('ast', file)
+
+def test_builtin_word_in_cte() -> None:
+	"""builtin word, that is not a const, is a bad term (it used to recurse without end)"""
+	errors = ErrorBin(silent=True)
+	file = os.path.join(os.environ['JARARACA_PATH'], 'tests', 'parser', 'const_errors.ja')
+	module = extract_module_from_file_path(file, Config.use_defaults(errors, file, jobs=1, use_cache=False))
+	assert module is not None
+	assert module.constants['A'] == 10
+	assert 'B' not in module.constants
+	assert [(error.typ, error.place.start.line if error.place is not None else None) for error in errors.errors][0] == (ET.CTE_TERM, 3)
+
+def test_parse_while_lexing() -> None:
+	"""parser reads the store, as the lexer fills it by batches, the module is the same, as from the whole store"""
+	file = os.path.join(os.environ['JARARACA_PATH'], 'examples', 'snake.ja')
+	text = extract_file_text_from_file_path(file)
+	config = Config.use_defaults(ErrorBin(silent=True), file, jobs=1, use_cache=False)
+	whole = lex_store(text, config, file)
+	assert len(whole) > 2*STREAM_BATCH
+	store = Lexer(text, config, file).stream()
+	assert len(store) == STREAM_BATCH and store.lex_more is not None
+	assert str(Parser(store, config).parse()) == str(Parser(whole, config).parse())
+	assert store.lex_more is None and store.typ(len(store)-1) is TT.EOF
+	assert config.errors.errors == []
+
+def test_store_is_a_window() -> None:
+	"""tokens, that the parser read, are dropped, so the store of a large module stays about a batch long"""
+	text = ''.join(f"fun f{idx}(x: int) -> int {{\n\treturn x*{idx}+(x-{idx})//2\n}}\n" for idx in range(2000))
+	config = Config.use_defaults(ErrorBin(silent=True), 'big.ja', jobs=1, use_cache=False)
+	whole = lex_store(text, config, 'big.ja')
+	store = Lexer(text, config, 'big.ja').stream()
+	lengths:list[int] = []
+	lex_batch = store.lex_more
+	assert lex_batch is not None
+	def lex_more() -> None:
+		lex_batch()
+		lengths.append(len(store))
+	store.lex_more = lex_more
+	assert str(Parser(store, config).parse()) == str(Parser(whole, config).parse())
+	assert len(whole) > 100*STREAM_BATCH and len(lengths) > 100
+	assert max(lengths) <= STREAM_BATCH+2
+	assert config.errors.errors == []
@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+from compiler import primitives
+from compiler.server import as_client
+from jararaca import VALUE_FLAGS, compiler_flags
+
+def test_flags_before_source_file() -> None:
+	"""flags after the source file are arguments of the program, values of options are not flags"""
+	assert compiler_flags(['-r', 'prog.ja', '--watch']) == {'-r'}
+	assert compiler_flags(['--jobs', '2', '-o', 'out', '--watch', 'prog.ja', '--batch']) == {'--jobs', '-o', '--watch'}
+	assert compiler_flags(['--cache-dir', '--watch', 'prog.ja']) == {'--cache-dir'}
+
+def test_client_value_flags_are_the_compilers() -> None:
+	"""client does not import the compiler (so it starts fast), it's copy of the flags has to follow the compiler"""
+	assert VALUE_FLAGS == {f"--{flag}" for flag in primitives.VALUE_FLAGS}
+	for flag, (typ, _) in primitives.VALUE_FLAGS.items():
+		with pytest.raises(primitives.ErrorExit):
+			primitives.process_cmd_args(eb := primitives.ErrorBin(silent=True), ['jararaca.py', f"--{flag}"])
+		assert [error.typ for error in eb.errors] == [typ]
+
+def test_client_environment(tmp_path:str, monkeypatch:pytest.MonkeyPatch) -> None:
+	"""only PATH of the client is used, the rest of the environment stays server's, and is restored after"""
+	monkeypatch.setenv('PATH', '/server/bin')
+	monkeypatch.setenv('HOME', '/server')
+	cwd = os.getcwd()
+	with as_client({'cwd':str(tmp_path), 'env':{'PATH':'/client/bin', 'HOME':'/client', 'JARARACA_PATH':'/client'}}, [os.dup(1), os.dup(2)]):
+		assert (os.environ['PATH'], os.environ['HOME'], os.environ['JARARACA_PATH'], os.getcwd()) == ('/client/bin', '/server', os.path.dirname(os.path.dirname(os.path.abspath(__file__))), str(tmp_path))
+	assert (os.environ['PATH'], os.environ['HOME'], os.getcwd()) == ('/server/bin', '/server', cwd)
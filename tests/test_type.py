@@ -0,0 +1,24 @@
+from compiler.primitives import types
+
+def test_recursive_struct_is_not_sized() -> None:
+	struct = types.Struct('R', (), -1, ())
+	struct.variables = (('x', types.INT), ('rs', types.Array(struct, 2)))
+	assert not struct.sized
+	assert not types.Array(struct, 2).sized
+	assert types.Ptr(struct).sized
+	assert types.Array(types.Ptr(struct), 2).sized
+
+def test_sizing_of_interned_type_is_not_shared() -> None:
+	"""interned array, that is sized while another sizing of it is in progress (as in another thread), is sized"""
+	inner:list[bool] = []
+	class Interleaved(types.Type):
+		interleaving = False
+		@property
+		def sized(self) -> bool:
+			if not Interleaved.interleaving:
+				Interleaved.interleaving = True
+				inner.append(array.sized)
+			return True
+	array = types.Array(types.Struct('S', (('x', Interleaved()),), -2, ()), 2)
+	assert array.sized
+	assert inner == [True]
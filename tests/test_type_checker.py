@@ -0,0 +1,66 @@
+import os
+from typing import Iterator
+
+import pytest
+
+from compiler import generate
+from compiler.primitives import CompilationSession, Config, ErrorBin, ErrorExit, packets
+
+SHAPES = """\
+struct S {
+	x: int
+	fun __init__(self: *S, x: int) {
+		self.x = x
+	}
+}
+enum E {
+	A
+	B
+}
+"""
+ACCESS = """\
+from lib.shapes import S, E
+fun get(s: *S) -> int {
+	return @s.x
+}
+fun is_b(e: E) -> bool {
+	return e == E.B
+}
+"""
+MAIN = """\
+from lib.shapes import S, E
+from lib.access import get, is_b
+fun main() {
+	set s = S(3)
+	assert get(s) == 3, "get"
+	assert is_b(E.B), "is_b"
+}
+"""
+@pytest.fixture
+def program(tmp_path:str, monkeypatch:pytest.MonkeyPatch) -> Iterator[str]:
+	"""main file of a program, that imports packet 'lib' with modules 'shapes' and 'access' (which imports 'shapes')"""
+	lib = os.path.join(tmp_path, 'lib')
+	os.mkdir(lib)
+	for name, text in (('lib/shapes.ja', SHAPES), ('lib/access.ja', ACCESS), ('main.ja', MAIN)):
+		with open(os.path.join(tmp_path, name), 'w', encoding='utf-8') as file:
+			file.write(text)
+	monkeypatch.setattr(packets, 'path', os.path.join(tmp_path, 'packets'))
+	packets.pack(lib)
+	yield os.path.join(tmp_path, 'main.ja')
+	monkeypatch.undo()
+	packets.load()
+
+def test_pooled_dependent_of_reused_module(program:str, tmp_path:str) -> None:
+	"""struct and enum, defined by a module, checked in this process, are the same objects, when a module that imports it is checked by a worker"""
+	session = CompilationSession()
+	def build(**options:int) -> list[str]:
+		errors = ErrorBin(silent=True)
+		try:
+			generate(Config.use_defaults(errors, program, use_cache=True, cache_dir=os.path.join(tmp_path, 'cache'), session=session, **options))
+		except ErrorExit:
+			pass
+		return [str(error) for error in errors.errors]
+	assert build(jobs=1, parallel_check_modules=1000) == []
+	with open(os.path.join(tmp_path, 'lib', 'access.ja'), 'a', encoding='utf-8') as file:
+		file.write('\n')# only 'access' is checked again, on the pool
+	assert build(jobs=2, parallel_check_modules=1) == []
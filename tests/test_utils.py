@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+from compiler import cache, generate, utils, watch
+from compiler.primitives import CompilationSession, Config, ErrorBin
+
+SNAKE = os.path.join(os.environ['JARARACA_PATH'], 'examples', 'snake.ja')
+class PoolStarted(Exception):
+	pass
+def no_pool(*_:object, **__:object) -> None:
+	raise PoolStarted()
+
+@pytest.mark.parametrize('use_cache', (True, False))
+def test_few_modules_are_parsed_without_pool(use_cache:bool, tmp_path:str, monkeypatch:pytest.MonkeyPatch) -> None:
+	monkeypatch.setattr(utils, 'ProcessPoolExecutor', no_pool)
+	config = Config.use_defaults(ErrorBin(silent=True), SNAKE, jobs=4, use_cache=use_cache, cache_dir=str(tmp_path), session=CompilationSession())
+	assert utils.extract_module_from_file_path(config.file, config) is not None
+	config = Config.use_defaults(ErrorBin(silent=True), SNAKE, jobs=4, use_cache=use_cache, cache_dir=str(tmp_path/'other'), session=CompilationSession(), parallel_parse_modules=1)
+	with pytest.raises(PoolStarted):
+		utils.extract_module_from_file_path(config.file, config)
+
+def test_import_graph_is_scanned_once_per_compilation(tmp_path:str, monkeypatch:pytest.MonkeyPatch) -> None:
+	"""watch, build cache and prefetching of modules share the graph of the compilation, next compilation scans files again"""
+	scans:list[str] = []
+	scan = utils.import_graph
+	def import_graph(file_path:str) -> dict[str, tuple[str, tuple[str, ...]]]:
+		scans.append(file_path)
+		return scan(file_path)
+	monkeypatch.setattr(utils, 'import_graph', import_graph)
+	config = Config.use_defaults(ErrorBin(silent=True), SNAKE, jobs=4, cache_dir=str(tmp_path), session=CompilationSession())
+	files = watch.watched_files(config)
+	key = cache.build_key(config)
+	generate(config)
+	assert scans == [SNAKE]
+	assert cache.build_key(config) == key and watch.watched_files(config) == files
+	assert scans == [SNAKE]*2